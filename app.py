@@ -3,10 +3,10 @@
 import os
 from datetime import datetime, timedelta
 from typing import Dict
-from flask import Flask
+from flask import Flask, session
 from flask_wtf import CSRFProtect
 from config import SECRET_KEY, HOST, PORT, DATABASE_URL
-from model.database import initialize_database
+from model.database import initialize_database, get_nb_notifs_non_lues
 from controller.main_routes import main_bp
 from controller.admin_routes import admin_bp
 from controller.chatbot_routes import chatbot_bp
@@ -46,6 +46,14 @@ def inject_current_year() -> Dict[str, int]:
     """Injecte l'année courante dans tous les templates."""
     return {'current_year': datetime.utcnow().year}
 
+
+@app.context_processor
+def inject_notifs_non_lues() -> Dict[str, int]:
+    """Injecte le nombre de décisions non vues de l'utilisateur connecté (badge
+    de la navbar) ; lu dans un cache par worker, sans requête la plupart du temps."""
+    user_id = session.get('user_id')
+    return {'nb_notifs_non_lues': get_nb_notifs_non_lues(user_id) if user_id else 0}
+
 # ----------------------------------------------------
 # 3. BLUEPRINT REGISTRATION (CONTROLLERS)
 # ----------------------------------------------------
@@ -0,0 +1,44 @@
+# archiver_propositions.py - Déplace les propositions traitées anciennes vers l'archive
+#
+# PROPOSITION ne garde que la file en attente et les décisions récentes ; les
+# propositions traitées depuis plus de ARCHIVE_AGE_JOURS jours passent, par
+# lots de ARCHIVE_TAILLE_LOT, dans PROPOSITION_ARCHIVE (partitionnée par année
+# de traitement). Elles restent consultables avec l'historique complet
+# (« Tout l'historique » dans Mon espace, case « Archives » côté admin).
+#
+#   python archiver_propositions.py                 # à lancer chaque nuit (cron)
+#   python archiver_propositions.py --age-jours 365
+
+import argparse
+
+from config import ARCHIVE_AGE_JOURS, ARCHIVE_TAILLE_LOT
+from model.database import archiver_propositions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archivage des propositions traitées.")
+    parser.add_argument(
+        "--age-jours",
+        type=int,
+        default=ARCHIVE_AGE_JOURS,
+        help="Âge minimal (jours depuis le traitement) d'une proposition archivée.",
+    )
+    parser.add_argument(
+        "--taille-lot",
+        type=int,
+        default=ARCHIVE_TAILLE_LOT,
+        help="Propositions déplacées par transaction.",
+    )
+    args = parser.parse_args()
+
+    total = 0
+    while True:
+        archivees = archiver_propositions(args.age_jours, args.taille_lot)
+        total += archivees
+        if archivees < args.taille_lot:
+            break
+    print(f"📦 {total} propositions archivées.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# bench_arbre_commentaires.py - Banc des algorithmes d'arbre de commentaires
+#
+# Compare, sur des fils synthétiques profonds (une chaîne de réponses) et
+# larges (une racine et toutes ses réponses directes), les fonctions de
+# model/arbre_commentaires.py aux versions récursives :
+#   - construction de l'arbre depuis les commentaires à plat ;
+#   - parcours complet dans l'ordre d'affichage (pile explicite).
+#
+#   python bench_arbre_commentaires.py --tailles 100,10000,100000 --repetitions 5
+#
+# Purement en mémoire : ni MongoDB ni PostgreSQL.
+
+import argparse
+import copy
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from model.arbre_commentaires import construire_racines, parcourir
+
+Noeud = Dict[str, Any]
+
+
+def generer_profond(taille: int) -> List[Noeud]:
+    """Chaîne de `taille` réponses, chacune répondant à la précédente."""
+    return [
+        {
+            "commentaire_id": f"c{i}",
+            "parent_id": f"c{i - 1}" if i else None,
+            "date": f"2026-01-01T00:00:{i:08d}",
+        }
+        for i in range(taille)
+    ]
+
+
+def generer_large(taille: int) -> List[Noeud]:
+    """Une racine et `taille - 1` réponses directes."""
+    return [
+        {
+            "commentaire_id": f"c{i}",
+            "parent_id": "c0" if i else None,
+            "date": f"2026-01-01T00:00:{i:08d}",
+        }
+        for i in range(taille)
+    ]
+
+
+# --- Référence : parcours récursif ---
+
+
+def _aplatir_recursif(noeuds: List[Noeud], sortie: List[Noeud]) -> List[Noeud]:
+    for noeud in noeuds:
+        sortie.append(noeud)
+        _aplatir_recursif(noeud["reponses"], sortie)
+    return sortie
+
+
+def chronometrer(fn: Callable[[], Any], repetitions: int) -> Optional[float]:
+    """Médiane en millisecondes, ou None si `fn` dépasse la limite de récursion."""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        try:
+            fn()
+        except RecursionError:
+            return None
+        durees.append((time.perf_counter() - debut) * 1000)
+    return statistics.median(durees)
+
+
+def mesurer(commentaires: List[Noeud], repetitions: int) -> Dict[str, Any]:
+    racines = construire_racines(copy.deepcopy(commentaires))
+    return {
+        "construction": (
+            chronometrer(
+                lambda: construire_racines(copy.copy(c) for c in commentaires),
+                repetitions,
+            ),
+            None,
+        ),
+        "parcours": (
+            chronometrer(lambda: list(parcourir(racines)), repetitions),
+            chronometrer(lambda: _aplatir_recursif(racines, []), repetitions),
+        ),
+    }
+
+
+def _ms(valeur: Optional[float]) -> str:
+    return f"{valeur:12.3f}" if valeur is not None else f"{'—':>12}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Banc des arbres de commentaires.")
+    parser.add_argument("--tailles", default="100,10000,100000")
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'forme':>7} {'taille':>8} {'opération':>12} "
+        f"{'itératif ms':>12} {'récursif ms':>12}"
+    )
+    for taille in (int(t) for t in args.tailles.split(",")):
+        for forme, generer in (("profond", generer_profond), ("large", generer_large)):
+            for operation, (iteratif, recursif) in mesurer(
+                generer(taille), args.repetitions
+            ).items():
+                note = ""
+                if recursif is None and operation != "construction":
+                    note = " RecursionError"
+                print(
+                    f"{forme:>7} {taille:>8} {operation:>12} "
+                    f"{_ms(iteratif)} {_ms(recursif)}{note}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# bench_commentaires.py - Banc de mesure des deux stockages de commentaires
+#
+# Compare, pour des fils de 10, 1 000 et 100 000 commentaires sur un même
+# objet, le coût d'une lecture du fil complet et d'une réponse :
+#   - ancien : un document par objet contenant tout l'arbre ($push ciblé) ;
+#   - nouveau : un document par commentaire (CommentaireService).
+#
+#   python bench_commentaires.py --tailles 10,1000,100000 --repetitions 20
+#
+# Travaille dans une base jetable (<MONGO_DB_NAME>_bench), supprimée à la fin.
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import bson
+from pymongo.errors import DocumentTooLarge, OperationFailure
+
+from config import MONGO_DB_NAME
+from model.comment_service import CommentaireService
+from model.mongo_schema import INDEX_COMMENTAIRES, synchroniser_index
+from model.mongo_utils import get_mongo_client
+
+PROFONDEUR_MAX = 20  # garde l'ancien document sous la limite d'imbrication BSON
+
+
+def generer_fil(taille: int, graine: int = 42) -> List[Dict[str, Any]]:
+    """Commentaires à plat d'un fil aléatoire (réponses à des commentaires au hasard)."""
+    aleatoire = random.Random(graine)
+    commentaires: List[Dict[str, Any]] = []
+    for i in range(taille):
+        parent: Optional[Dict[str, Any]] = None
+        if commentaires and aleatoire.random() < 0.7:
+            parent = aleatoire.choice(commentaires)
+            if parent["profondeur"] >= PROFONDEUR_MAX:
+                parent = None
+        ancetres = parent["ancetres"] + [parent["commentaire_id"]] if parent else []
+        commentaires.append(
+            {
+                "commentaire_id": str(uuid.uuid4()),
+                "objet_id": 1,
+                "parent_id": ancetres[-1] if ancetres else None,
+                "ancetres": ancetres,
+                "profondeur": len(ancetres),
+                "utilisateur_id": 1,
+                "pseudo": "bench",
+                "texte": f"Commentaire de test numéro {i}, texte de longueur moyenne.",
+                "date": f"2026-01-01T00:00:{i:08d}",
+                "est_admin": False,
+            }
+        )
+    return commentaires
+
+
+def vers_ancien_document(commentaires: List[Dict[str, Any]]) -> Dict[str, Any]:
+    par_id = {}
+    racines = []
+    for c in commentaires:
+        noeud = {
+            k: v
+            for k, v in c.items()
+            if k not in ("objet_id", "parent_id", "ancetres", "profondeur")
+        }
+        noeud["reponses"] = []
+        par_id[c["commentaire_id"]] = noeud
+        if c["parent_id"]:
+            par_id[c["parent_id"]]["reponses"].append(noeud)
+        else:
+            racines.append(noeud)
+    return {"objet_id": 1, "commentaires": racines}
+
+
+def chronometrer(fn: Callable[[], Any], repetitions: int) -> float:
+    """Médiane, en millisecondes, de `repetitions` appels à `fn`."""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fn()
+        durees.append((time.perf_counter() - debut) * 1000)
+    return statistics.median(durees)
+
+
+def mesurer_ancien(db: Any, commentaires: List[Dict[str, Any]], repetitions: int):
+    collection = db["bench_ancien"]
+    collection.drop()
+    collection.create_index("objet_id", unique=True)
+    doc = vers_ancien_document(commentaires)
+    taille_doc = len(bson.encode(doc))
+    try:
+        collection.insert_one(doc)
+    except (DocumentTooLarge, OperationFailure) as e:
+        return taille_doc, None, None, f"refusé par MongoDB ({type(e).__name__})"
+
+    cible = max(commentaires, key=lambda c: c["profondeur"])
+    chemin = cible["ancetres"] + [cible["commentaire_id"]]
+    champ = "commentaires" + "".join(f".$[n{i}].reponses" for i in range(len(chemin)))
+    filtres = [{f"n{i}.commentaire_id": cid} for i, cid in enumerate(chemin)]
+
+    def lire() -> None:
+        collection.find_one({"objet_id": 1})
+
+    def repondre() -> None:
+        reponse = {
+            "commentaire_id": str(uuid.uuid4()),
+            "texte": "bench",
+            "reponses": [],
+        }
+        collection.update_one(
+            {"objet_id": 1}, {"$push": {champ: reponse}}, array_filters=filtres
+        )
+
+    return (
+        taille_doc,
+        chronometrer(lire, repetitions),
+        chronometrer(repondre, repetitions),
+        "",
+    )
+
+
+def mesurer_nouveau(db: Any, commentaires: List[Dict[str, Any]], repetitions: int):
+    collection = db["bench_nouveau"]
+    collection.drop()
+    service = CommentaireService(collection, db["bench_compteurs"])
+    synchroniser_index(collection, INDEX_COMMENTAIRES)
+    collection.insert_many([dict(c) for c in commentaires])
+    taille_doc = max(len(bson.encode(c)) for c in commentaires)
+    cible = max(commentaires, key=lambda c: c["profondeur"])
+
+    def lire() -> None:
+        service.get_commentaires(1)
+
+    def repondre() -> None:
+        service.ajouter_commentaire(
+            1, 1, "bench", "bench", parent_id=cible["commentaire_id"]
+        )
+
+    return (
+        taille_doc,
+        chronometrer(lire, repetitions),
+        chronometrer(repondre, repetitions),
+        "",
+    )
+
+
+def _ms(valeur: Optional[float]) -> str:
+    return f"{valeur:10.2f}" if valeur is not None else f"{'—':>10}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Banc des stockages de commentaires.")
+    parser.add_argument("--tailles", default="10,1000,100000")
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    client = get_mongo_client()
+    nom_base = f"{MONGO_DB_NAME}_bench"
+    db = client[nom_base]
+    print(
+        f"{'commentaires':>12} {'stockage':>9} {'doc max (Ko)':>13} "
+        f"{'lecture ms':>10} {'réponse ms':>10}"
+    )
+    try:
+        for taille in (int(t) for t in args.tailles.split(",")):
+            commentaires = generer_fil(taille)
+            for nom, mesurer in (
+                ("ancien", mesurer_ancien),
+                ("nouveau", mesurer_nouveau),
+            ):
+                octets, lecture, ecriture, note = mesurer(
+                    db, commentaires, args.repetitions
+                )
+                print(
+                    f"{taille:>12} {nom:>9} {octets / 1024:>13.1f} "
+                    f"{_ms(lecture)} {_ms(ecriture)} {note}"
+                )
+    finally:
+        client.drop_database(nom_base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# charge_chatbot.py - Banc de charge de /api/chatbot
+#
+# Rejoue un corpus de questions contre l'application Flask en cours
+# d'exécution et affiche les percentiles de latence (p50/p95/p99), le débit
+# et la répartition des erreurs. À combiner avec faux_serveur_gemini.py
+# pour mesurer chaque changement de performance du chatbot hors ligne :
+#
+#   python faux_serveur_gemini.py --latence-ms 800 &
+#   GEMINI_API_URL=http://127.0.0.1:8089/v1beta/models/gemini-2.5-flash:generateContent \
+#   GEMINI_API_KEY=factice gunicorn --workers 3 --bind 127.0.0.1:5000 app:app &
+#   python charge_chatbot.py --url http://127.0.0.1:5000 --requetes 200 --concurrence 10
+
+import argparse
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+CORPUS_PAR_DEFAUT: List[str] = [
+    "C'est quoi une naine blanche ?",
+    "Pourquoi Mars est-elle rouge ?",
+    "Combien de lunes a Jupiter ?",
+    "Qu'est-ce qu'un trou noir ?",
+    "Comment se forme une étoile ?",
+    "Quelle est la différence entre une comète et un astéroïde ?",
+    "Pourquoi Pluton n'est plus une planète ?",
+    "C'est quoi une année-lumière ?",
+    "Comment fonctionnent les anneaux de Saturne ?",
+    "Qu'est-ce que la Voie lactée ?",
+]
+
+# Réponses "200" qui sont en réalité des échecs côté Gemini (voir call_gemini_api).
+REPONSES_DEGRADEES: Dict[str, str] = {
+    "Quota dépassé": "quota_429",
+    "Clé API manquante": "cle_api_manquante",
+    "réponse vide": "reponse_vide",
+}
+
+
+@dataclass
+class Resultat:
+    latence_s: float
+    categorie: str  # "ok" ou une catégorie d'erreur
+
+
+@dataclass
+class Rapport:
+    resultats: List[Resultat] = field(default_factory=list)
+    duree_s: float = 0.0
+
+    @property
+    def latences_ok(self) -> List[float]:
+        return sorted(r.latence_s for r in self.resultats if r.categorie == "ok")
+
+    @property
+    def erreurs(self) -> Counter:
+        return Counter(r.categorie for r in self.resultats if r.categorie != "ok")
+
+
+def percentile(valeurs_triees: List[float], p: float) -> Optional[float]:
+    """Percentile par rang le plus proche (valeurs déjà triées)."""
+    if not valeurs_triees:
+        return None
+    rang = max(1, -(-len(valeurs_triees) * p // 100))
+    return valeurs_triees[int(rang) - 1]
+
+
+def classer_reponse(statut: int, corps: Dict) -> str:
+    """Catégorie d'une réponse de /api/chatbot ("ok" si exploitable)."""
+    if statut != 200:
+        return f"http_{statut}"
+    texte = corps.get("response") or ""
+    for motif, categorie in REPONSES_DEGRADEES.items():
+        if motif in texte:
+            return categorie
+    return "ok"
+
+
+def ouvrir_session(url: str) -> Tuple[requests.Session, str, str]:
+    """Récupère un jeton CSRF et le cookie de session associé.
+
+    Le cookie de session est marqué `Secure` : `requests` refuse de le
+    renvoyer en HTTP simple, on le repasse donc à la main dans l'en-tête
+    `Cookie` (voir PLAN_DE_TESTS.md, section 7).
+    """
+    session = requests.Session()
+    reponse = session.get(f"{url}/connexion", timeout=10)
+    match = re.search(r'name="csrf-token" content="([^"]+)"', reponse.text)
+    if not match:
+        raise RuntimeError("Jeton CSRF introuvable sur /connexion")
+    cookie = reponse.headers.get("Set-Cookie", "").split(";", 1)[0]
+    return session, match.group(1), cookie
+
+
+def executer(
+    url: str,
+    corpus: List[str],
+    nb_requetes: int,
+    concurrence: int,
+    timeout: float,
+) -> Rapport:
+    local = threading.local()
+
+    def une_requete(i: int) -> Resultat:
+        if not hasattr(local, "session"):
+            local.session, local.jeton, local.cookie = ouvrir_session(url)
+        debut = time.perf_counter()
+        try:
+            reponse = local.session.post(
+                f"{url}/api/chatbot",
+                json={"message": corpus[i % len(corpus)], "history": []},
+                headers={"X-CSRFToken": local.jeton, "Cookie": local.cookie},
+                timeout=timeout,
+            )
+            try:
+                corps = reponse.json()
+            except ValueError:
+                corps = {}
+            categorie = classer_reponse(reponse.status_code, corps)
+        except requests.Timeout:
+            categorie = "timeout"
+        except requests.ConnectionError:
+            categorie = "connexion"
+        return Resultat(time.perf_counter() - debut, categorie)
+
+    rapport = Rapport()
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrence) as pool:
+        rapport.resultats = list(pool.map(une_requete, range(nb_requetes)))
+    rapport.duree_s = time.perf_counter() - debut
+    return rapport
+
+
+def afficher(rapport: Rapport) -> None:
+    total = len(rapport.resultats)
+    latences = rapport.latences_ok
+    print("\n📊 RÉSULTATS /api/chatbot")
+    print("=" * 40)
+    print(f" Requêtes        : {total} en {rapport.duree_s:.2f} s")
+    print(f" Débit           : {total / rapport.duree_s:.2f} req/s")
+    print(f" Succès          : {len(latences)} ({len(latences) / total:.1%})")
+    for p in (50, 95, 99):
+        valeur = percentile(latences, p)
+        affichage = f"{valeur * 1000:.0f} ms" if valeur is not None else "—"
+        print(f" p{p:<14}: {affichage}")
+    if rapport.erreurs:
+        print("\n Erreurs :")
+        for categorie, nombre in rapport.erreurs.most_common():
+            print(f"   {categorie:20} : {nombre}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Banc de charge de /api/chatbot.")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--requetes", type=int, default=100)
+    parser.add_argument("--concurrence", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--corpus", help="Fichier texte, une question par ligne (défaut : intégré)"
+    )
+    args = parser.parse_args()
+
+    corpus = CORPUS_PAR_DEFAUT
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [ligne.strip() for ligne in f if ligne.strip()]
+
+    print(
+        f"🚀 {args.requetes} requêtes, concurrence {args.concurrence}, "
+        f"{len(corpus)} questions dans le corpus"
+    )
+    afficher(executer(args.url, corpus, args.requetes, args.concurrence, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 import os
 from dotenv import load_dotenv
-from typing import Optional
+from typing import List, Optional
 
 # Charge les variables du fichier .env
 load_dotenv()
@@ -19,6 +19,41 @@ DATABASE_URL: str = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{
 # ==================== MONGODB CONFIGURATION (commentaires) ====================
 MONGO_URI: str = os.environ.get('MONGO_URI', 'mongodb://localhost:27017')
 MONGO_DB_NAME: str = os.environ.get('MONGO_DB_NAME', 'astrolearn_nosql')
+# Requêtes sur les commentaires plus lentes que ce seuil journalisées (ms, 0 = désactivé)
+MONGO_SLOW_QUERY_MS: int = int(os.environ.get('MONGO_SLOW_QUERY_MS', '0'))
+# Si vrai, le plan d'exécution (explain) de chaque requête lente est aussi journalisé
+MONGO_EXPLAIN_SLOW_QUERIES: bool = os.environ.get('MONGO_EXPLAIN_SLOW_QUERIES', '') == '1'
+# Fils de commentaires pré-rendus gardés en mémoire par worker, et répertoire
+# optionnel partagé entre les workers ('' = mémoire seule)
+COMMENT_FRAGMENT_LRU_SIZE: int = int(os.environ.get('COMMENT_FRAGMENT_LRU_SIZE', '256'))
+COMMENT_FRAGMENT_CACHE_DIR: str = os.environ.get('COMMENT_FRAGMENT_CACHE_DIR', '')
+# Pool de connexions par worker : un thread n'emprunte qu'une connexion à la fois,
+# inutile de dépasser de beaucoup GUNICORN_THREADS. Délais en millisecondes.
+MONGO_MAX_POOL_SIZE: int = int(os.environ.get('MONGO_MAX_POOL_SIZE', '16'))
+MONGO_MIN_POOL_SIZE: int = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_CONNECT_TIMEOUT_MS: int = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS: int = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '10000'))
+# Attente maximale d'une connexion libre quand le pool est plein
+MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+# Si vrai, chaque worker gunicorn ouvre son pool dès son démarrage (gunicorn.conf.py)
+MONGO_WARMUP: bool = os.environ.get('MONGO_WARMUP', '') == '1'
+
+# ==================== NETTOYAGE INTER-STOCKAGES (outbox) ====================
+# Tâches NETTOYAGE_OUTBOX traitées par lot par nettoyer_outbox.py, intervalle
+# entre deux passes (secondes), échecs avant abandon, durée de réservation
+# d'un lot (secondes) et délai de base du nouvel essai, doublé à chaque échec.
+OUTBOX_TAILLE_LOT: int = int(os.environ.get('OUTBOX_TAILLE_LOT', '100'))
+OUTBOX_INTERVALLE: int = int(os.environ.get('OUTBOX_INTERVALLE', '30'))
+OUTBOX_MAX_TENTATIVES: int = int(os.environ.get('OUTBOX_MAX_TENTATIVES', '8'))
+OUTBOX_BAIL: int = int(os.environ.get('OUTBOX_BAIL', '300'))
+OUTBOX_DELAI_ESSAI: int = int(os.environ.get('OUTBOX_DELAI_ESSAI', '60'))
+
+# ==================== ARCHIVE DES PROPOSITIONS ====================
+# Propositions traitées depuis plus de ARCHIVE_AGE_JOURS jours déplacées vers
+# PROPOSITION_ARCHIVE par archiver_propositions.py, ARCHIVE_TAILLE_LOT à la fois.
+ARCHIVE_AGE_JOURS: int = int(os.environ.get('ARCHIVE_AGE_JOURS', '180'))
+ARCHIVE_TAILLE_LOT: int = int(os.environ.get('ARCHIVE_TAILLE_LOT', '1000'))
 
 # ==================== FLASK SERVER ====================
 SECRET_KEY: Optional[str] = os.environ.get('SECRET_KEY')
@@ -43,10 +78,71 @@ ADMIN_EMAIL: Optional[str] = os.environ.get('ADMIN_EMAIL')
 ADMIN_NOM: str = os.environ.get('ADMIN_NOM', 'Admin')
 ADMIN_PRENOM: str = os.environ.get('ADMIN_PRENOM', 'Super')
 
+# ==================== TABLEAU DE BORD ADMIN ====================
+# Durée (secondes) pendant laquelle les compteurs de l'en-tête sont réutilisés
+ADMIN_RESUME_TTL: float = float(os.environ.get('ADMIN_RESUME_TTL', '5'))
+# File de modération : durée (secondes) d'une réservation de propositions par
+# un admin, et nombre de propositions réservées à la fois par défaut
+MODERATION_BAIL: int = int(os.environ.get('MODERATION_BAIL', '900'))
+MODERATION_TAILLE_LOT: int = int(os.environ.get('MODERATION_TAILLE_LOT', '10'))
+# Similarité (0 à 1, trigrammes sur les noms sans accents) à partir de laquelle
+# une proposition est signalée comme doublon probable d'un objet du catalogue
+DOUBLON_SEUIL: float = float(os.environ.get('DOUBLON_SEUIL', '0.5'))
+
+# ==================== NOTIFICATIONS ====================
+# Décisions non vues par utilisateur (badge de la navbar) : comptes gardés
+# en mémoire par worker, et durée (secondes) après laquelle ils sont relus
+NOTIFS_CACHE_TAILLE: int = int(os.environ.get('NOTIFS_CACHE_TAILLE', '10000'))
+NOTIFS_CACHE_TTL: float = float(os.environ.get('NOTIFS_CACHE_TTL', '60'))
+# Notifications en direct (SSE, model/evenements.py). Chaque flux ouvert
+# occupe un thread gunicorn : au plus SSE_MAX_FLUX par worker, fermés après
+# SSE_DUREE_MAX secondes (le navigateur se reconnecte seul), un commentaire
+# de maintien toutes les SSE_HEARTBEAT secondes, et les SSE_HISTORIQUE
+# derniers événements gardés pour les rejouer à la reconnexion.
+SSE_MAX_FLUX: int = int(os.environ.get('SSE_MAX_FLUX', '4'))
+SSE_DUREE_MAX: float = float(os.environ.get('SSE_DUREE_MAX', '300'))
+SSE_HEARTBEAT: float = float(os.environ.get('SSE_HEARTBEAT', '20'))
+SSE_HISTORIQUE: int = int(os.environ.get('SSE_HISTORIQUE', '500'))
+
 # ==================== API CONFIGURATION ====================
 # Ici, on ne met PLUS JAMAIS la clé en texte brut. 
 # Si os.environ.get ne trouve rien, l'app ne pourra pas appeler l'API, ce qui est normal.
 API_KEY: Optional[str] = os.environ.get('GEMINI_API_KEY')
 
-GEMINI_API_URL: str = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
-NASA_IMAGES_URL: str = "https://images-api.nasa.gov/search"
\ No newline at end of file
+# Surchargeable pour pointer vers le faux serveur local (faux_serveur_gemini.py)
+# et mesurer le chatbot hors ligne, sans consommer de quota.
+GEMINI_API_URL: str = os.environ.get(
+    'GEMINI_API_URL',
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent",
+)
+NASA_IMAGES_URL: str = "https://images-api.nasa.gov/search"
+
+# ==================== APPELS EXTERNES (pools bornés) ====================
+# Gemini et Google Translate sont appelés depuis des pools de threads dédiés
+# (model/upstream_pool.py). workers + file d'attente de chaque pool doivent
+# rester sous GUNICORN_THREADS pour que des threads restent libres pour les pages.
+CHATBOT_POOL_WORKERS: int = int(os.environ.get('CHATBOT_POOL_WORKERS', '3'))
+CHATBOT_POOL_QUEUE: int = int(os.environ.get('CHATBOT_POOL_QUEUE', '3'))
+TRANSLATE_POOL_WORKERS: int = int(os.environ.get('TRANSLATE_POOL_WORKERS', '2'))
+TRANSLATE_POOL_QUEUE: int = int(os.environ.get('TRANSLATE_POOL_QUEUE', '2'))
+# Attente maximale dans la file avant démarrage, puis durée maximale de l'appel (secondes)
+UPSTREAM_QUEUE_TIMEOUT: float = float(os.environ.get('UPSTREAM_QUEUE_TIMEOUT', '5'))
+UPSTREAM_CALL_TIMEOUT: float = float(os.environ.get('UPSTREAM_CALL_TIMEOUT', '35'))
+
+# ==================== TRADUCTION ====================
+# Entrées gardées en mémoire par worker devant la table TRADUCTION
+TRANSLATION_LRU_SIZE: int = int(os.environ.get('TRANSLATION_LRU_SIZE', '2048'))
+# Langues pré-traduites en arrière-plan après une ingestion NASA (séparées par des virgules)
+PRETRADUCTION_LANGUES: List[str] = [
+    langue.strip()
+    for langue in os.environ.get('PRETRADUCTION_LANGUES', 'fr').split(',')
+    if langue.strip()
+]
+# Langues cibles acceptées par /api/translate (séparées par des virgules)
+TRADUCTION_LANGUES: List[str] = [
+    langue.strip()
+    for langue in os.environ.get('TRADUCTION_LANGUES', 'fr,en').split(',')
+    if langue.strip()
+]
+# Longueur maximale (caractères) d'un texte soumis à /api/translate
+TRADUCTION_MAX_CARACTERES: int = int(os.environ.get('TRADUCTION_MAX_CARACTERES', '5000'))
@@ -1,8 +1,9 @@
 import os
 import datetime
 import functools
+import time
 import bcrypt as _bcrypt
-from typing import Callable, Any, Union
+from typing import Callable, Any, List, Optional, Set, Union
 from flask import (
     Blueprint,
     render_template,
@@ -14,25 +15,57 @@ from flask import (
     Response,
     jsonify,
 )
+from config import ADMIN_RESUME_TTL, MODERATION_BAIL, MODERATION_TAILLE_LOT
 from model.database import (
     get_admin_by_pseudo,
     check_password,
     get_db_connection,
-    get_all_propositions,
+    get_resume_admin,
+    get_objets_admin_page,
+    get_admins_page,
+    get_propositions_page,
+    get_doublons_propositions,
     traiter_proposition,
-    get_all_utilisateurs,
+    traiter_propositions_lot,
+    reserver_propositions,
+    liberer_propositions,
+    get_utilisateurs_page,
+    basculer_utilisateur,
     delete_utilisateur,
+    delete_celestial_object as delete_object,
     enregistrer_saisie,
+    get_noms_objets,
+    get_textes_catalogue,
 )
 from model.api_utils import ingest_solar_system_data_paged
-from model.comment_service import CommentaireService
+from model.comment_service import commentaire_service, TAILLE_PAGE_MODERATION
+from model.upstream_pool import get_pools_stats, PoolSaturatedError
+from model.mongo_utils import get_stats_pool
+from model.pagination import couper_page, decoder_curseur
+from model.cache_utils import LRUCache
+from model.translation_service import (
+    translation_memory,
+    valider_demande,
+    MAX_BATCH_SIZE,
+)
 from controller.user_bp import allowed_file
 from werkzeug.utils import secure_filename
 from datetime import date
-from deep_translator import GoogleTranslator
 
 admin_bp = Blueprint("admin_bp", __name__)
 
+# Panneaux du tableau de bord : lignes par page, par défaut et au plus.
+TAILLE_PAGE_ADMIN = 25
+MAX_PAGE_ADMIN = 100
+
+# Décisions acceptées par appel de /admin/api/propositions/lot.
+MAX_LOT_MODERATION = 500
+
+# En-tête du tableau de bord (get_resume_admin), partagé par les admins du
+# worker pendant ADMIN_RESUME_TTL secondes ; vidé par les actions qui
+# changent ses compteurs.
+_resume_admin = LRUCache(1, ttl=ADMIN_RESUME_TTL)
+
 
 def admin_required(view_func: Callable) -> Callable:
     @functools.wraps(view_func)
@@ -82,83 +115,151 @@ def admin_logout() -> Response:
 @admin_bp.route("/admin_dashboard")
 @admin_required
 def admin_dashboard():
-    conn = get_db_connection()
-    if not conn:
-        flash("Erreur de connexion à la base de données.", "error")
-        return redirect(url_for("main_bp.index"))
-    cur = conn.cursor()
+    # Seul l'en-tête est rendu ici, depuis une requête de synthèse gardée
+    # quelques secondes ; chaque onglet charge ensuite sa liste page par
+    # page depuis son API JSON (/admin/api/...), à l'ouverture.
+    resume = _resume_admin.get("resume")
+    if resume is None:
+        resume = get_resume_admin()
+        if not resume:
+            flash("Erreur de connexion à la base de données.", "error")
+            return redirect(url_for("main_bp.index"))
+        _resume_admin.set("resume", resume)
+
+    # « Nouveau » = posté après la dernière visite de cet admin ; la marque
+    # de lecture n'avance (une seule petite écriture) que s'il y a du nouveau.
+    admin_id = session.get("admin_id")
+    derniere_lecture = commentaire_service.get_derniere_lecture(admin_id)
+    nb_commentaires_non_lus = commentaire_service.count_non_lus(admin_id)
+    if nb_commentaires_non_lus:
+        plus_recent, _ = commentaire_service.get_fil_moderation(limite=1)
+        if plus_recent:
+            commentaire_service.marquer_lus_jusqu_a(admin_id, plus_recent[0]["date"])
 
-    cur.execute("SELECT COUNT(*) FROM objet_celeste")
-    count_objects = cur.fetchone()[0]
-
-    cur.execute("""
-        SELECT o.id_objet, o.nom_fr, o.date_publication, c.nom_categorie,
-               STRING_AGG(DISTINCT a.pseudo, ', ') AS saisi_par
-        FROM objet_celeste o
-        JOIN categorie c ON o.fk_id_categorie = c.id_categorie
-        LEFT JOIN SAISIR s ON s.fk_id_objet = o.id_objet
-        LEFT JOIN ADMINISTRATEUR a ON a.id_admin = s.fk_id_admin
-        GROUP BY o.id_objet, o.nom_fr, o.date_publication, c.nom_categorie
-        ORDER BY o.date_publication DESC
-    """)
-    rows = cur.fetchall()
-    objects = [
-        {
-            "id_objet": r[0],
-            "nom_fr": r[1],
-            "date_publication": r[2],
-            "nom_categorie": r[3],
-            "saisi_par": r[4],
-        }
-        for r in rows
-    ]
+    return render_template(
+        "admin_dashboard.html",
+        compteurs=resume,
+        categories=resume["categories"],
+        derniere_lecture_commentaires=derniere_lecture or "",
+        nb_commentaires_non_lus=nb_commentaires_non_lus,
+    )
 
-    cur.execute(
-        "SELECT id_admin, pseudo, nom, prenom, email FROM ADMINISTRATEUR ORDER BY id_admin ASC"
+
+# --- PANNEAUX DU TABLEAU DE BORD (JSON paginé) ---
+
+
+def _limite_page() -> int:
+    """Taille de page demandée (`limite`), bornée ; lève ValueError si invalide."""
+    return max(
+        1, min(int(request.args.get("limite", TAILLE_PAGE_ADMIN)), MAX_PAGE_ADMIN)
     )
-    admin_rows = cur.fetchall()
-    admins = [
-        {
-            "id_admin": r[0],
-            "pseudo": r[1],
-            "nom": r[2] or "",
-            "prenom": r[3] or "",
-            "email": r[4] or "",
-        }
-        for r in admin_rows
-    ]
 
-    cur.close()
-    conn.close()
 
-    # Propositions en attente
-    propositions = get_all_propositions()
-    nb_en_attente = sum(1 for p in propositions if p["statut"] == "en_attente")
+def _dates_iso(lignes: list) -> list:
+    """Convertit en place les dates des lignes au format ISO (pour jsonify)."""
+    for ligne in lignes:
+        for champ, valeur in ligne.items():
+            if isinstance(valeur, (datetime.date, datetime.datetime)):
+                ligne[champ] = valeur.isoformat()
+    return lignes
 
-    # Liste des utilisateurs
-    utilisateurs = get_all_utilisateurs()
 
-    # Commentaires (modération) — on réutilise `objects` déjà chargé pour éviter
-    # une requête supplémentaire juste pour retrouver le nom de chaque objet.
-    noms_objets = {o["id_objet"]: o["nom_fr"] for o in objects}
-    comment_service = CommentaireService()
-    commentaires = comment_service.get_tous_commentaires()
-    for c in commentaires:
-        c["nom_objet"] = noms_objets.get(c["objet_id"], f"Objet #{c['objet_id']}")
-    nb_commentaires_non_lus = sum(1 for c in commentaires if not c.get("vu"))
-    comment_service.marquer_tous_lus()
+def _annoter_doublons(propositions: list) -> list:
+    """Ajoute à chaque proposition `doublon` : l'objet du catalogue qui lui
+    ressemble le plus (avec son score) si elle est en attente, sinon None."""
+    doublons = get_doublons_propositions(
+        [p["id_proposition"] for p in propositions if p["statut"] == "en_attente"]
+    )
+    for proposition in propositions:
+        proposition["doublon"] = doublons.get(proposition["id_proposition"])
+    return propositions
 
-    return render_template(
-        "admin_dashboard.html",
-        objects=objects,
-        count_objects=count_objects,
-        admins=admins,
-        propositions=propositions,
-        nb_en_attente=nb_en_attente,
-        utilisateurs=utilisateurs,
-        commentaires=commentaires,
-        nb_commentaires_non_lus=nb_commentaires_non_lus,
+
+def _page_json(nom: str, lignes: list, limite: int, cle: Callable) -> Response:
+    """Réponse {nom: page, "curseur_suivant": ...}, dates au format ISO."""
+    page, curseur = couper_page(lignes, limite, cle)
+    return jsonify({nom: _dates_iso(page), "curseur_suivant": curseur})
+
+
+@admin_bp.route("/admin/api/objets")
+@admin_required
+def api_objets():
+    """Catalogue paginé (JSON) : `curseur`, `limite`, `q` (nom) et `categorie_id`."""
+    try:
+        limite = _limite_page()
+        apres = decoder_curseur(request.args.get("curseur"), 2)
+        categorie_id = request.args.get("categorie_id", type=int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    lignes = get_objets_admin_page(
+        limite, apres, request.args.get("q", "").strip() or None, categorie_id
+    )
+    return _page_json(
+        "objets", lignes, limite, lambda o: (o["date_publication"], o["id_objet"])
+    )
+
+
+@admin_bp.route("/admin/api/propositions")
+@admin_required
+def api_propositions():
+    """Propositions paginées (JSON) : `curseur`, `limite`, `statut`
+    ('en_attente', 'traitees' ou vide pour toutes) et `historique=1` pour
+    inclure les propositions archivées."""
+    statut = request.args.get("statut") or None
+    if statut not in (None, "en_attente", "traitees"):
+        return jsonify({"error": "Statut invalide"}), 400
+    try:
+        limite = _limite_page()
+        apres = decoder_curseur(request.args.get("curseur"), 2)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    historique = request.args.get("historique") == "1"
+    lignes = _annoter_doublons(get_propositions_page(limite, apres, statut, historique))
+    return _page_json(
+        "propositions",
+        lignes,
+        limite,
+        lambda p: (p["date_proposition"], p["id_proposition"]),
+    )
+
+
+@admin_bp.route("/admin/api/utilisateurs")
+@admin_required
+def api_utilisateurs():
+    """Comptes utilisateurs paginés (JSON) : `curseur`, `limite`, `q`
+    (pseudo, email, prénom ou nom) et `ordre` d'inscription ('desc', les
+    plus récents d'abord, ou 'asc')."""
+    ordre = request.args.get("ordre") or "desc"
+    if ordre not in ("asc", "desc"):
+        return jsonify({"error": "Ordre invalide"}), 400
+    try:
+        limite = _limite_page()
+        apres = decoder_curseur(request.args.get("curseur"), 2)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    lignes = get_utilisateurs_page(
+        limite, apres, request.args.get("q", "").strip() or None, ordre
     )
+    return _page_json(
+        "utilisateurs",
+        lignes,
+        limite,
+        lambda u: (u["date_inscription"], u["id_utilisateur"]),
+    )
+
+
+@admin_bp.route("/admin/api/admins")
+@admin_required
+def api_admins():
+    """Administrateurs paginés (JSON), par identifiant croissant."""
+    try:
+        limite = _limite_page()
+        apres = decoder_curseur(request.args.get("curseur"), 1)
+        apres_id = int(apres[0]) if apres else None
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    lignes = get_admins_page(limite, apres_id)
+    return _page_json("admins", lignes, limite, lambda a: (a["id_admin"],))
 
 
 # --- CRUD OBJETS CÉLESTES ---
@@ -200,6 +301,7 @@ def add_celestial_object():
             nouvel_id = cur.fetchone()[0]
             conn.commit()
             enregistrer_saisie(session["admin_id"], nouvel_id)
+            _resume_admin.clear()
             flash(f"'{name}' ajouté avec succès !", "success")
             return redirect(url_for("admin_bp.admin_dashboard"))
         except Exception as e:
@@ -258,20 +360,13 @@ def edit_celestial_object(object_id):
 @admin_bp.route("/admin/delete-object/<int:object_id>", methods=["POST"])
 @admin_required
 def delete_celestial_object(object_id):
-    conn = get_db_connection()
-    if not conn:
-        flash("Erreur de connexion à la base de données.", "error")
-        return redirect(url_for("admin_bp.admin_dashboard"))
-    cur = conn.cursor()
-    try:
-        cur.execute("DELETE FROM objet_celeste WHERE id_objet = %s", (object_id,))
-        conn.commit()
+    # Commentaires MongoDB et image orpheline : nettoyés ensuite par
+    # nettoyer_outbox.py, planifiés dans la transaction de la suppression.
+    if delete_object(object_id):
+        _resume_admin.clear()
         flash("Objet supprimé.", "success")
-    except Exception as e:
-        conn.rollback()
-        flash(f"Erreur : {e}", "error")
-    finally:
-        conn.close()
+    else:
+        flash("Erreur lors de la suppression de l'objet.", "error")
     return redirect(url_for("admin_bp.admin_dashboard"))
 
 
@@ -327,6 +422,7 @@ def add_admin():
             (pseudo, password_hash, nom, prenom, email),
         )
         conn.commit()
+        _resume_admin.clear()
         flash(f"Administrateur '{prenom} {nom}' créé !", "success")
     except Exception as e:
         conn.rollback()
@@ -412,6 +508,7 @@ def delete_admin(admin_id):
     try:
         cur.execute("DELETE FROM ADMINISTRATEUR WHERE id_admin = %s", (admin_id,))
         conn.commit()
+        _resume_admin.clear()
         flash("Administrateur supprimé.", "success")
     except Exception as e:
         conn.rollback()
@@ -441,7 +538,7 @@ def traiter_proposition_route(prop_id):
         flash("Statut invalide.", "error")
         return redirect(url_for("admin_bp.admin_dashboard") + "#section-propositions")
 
-    if traiter_proposition(
+    resultat = traiter_proposition(
         prop_id,
         statut,
         commentaire,
@@ -450,52 +547,164 @@ def traiter_proposition_route(prop_id):
         description,
         id_categorie,
         session.get("admin_id"),
-    ):
+    )
+    if resultat == "traitee":
         labels = {
             "accepte": "acceptée ✅",
             "refuse": "refusée ❌",
             "modifie": "modifiée et publiée ✏️",
         }
+        _resume_admin.clear()
         flash(f"Proposition {labels.get(statut, statut)}.", "success")
+    elif resultat == "reservee":
+        flash(
+            "Proposition en cours de traitement par un autre administrateur.", "error"
+        )
+    elif resultat == "deja_traitee":
+        flash("Proposition déjà traitée.", "error")
+    elif resultat == "introuvable":
+        flash("Proposition introuvable.", "error")
     else:
         flash("Erreur lors du traitement.", "error")
 
     return redirect(url_for("admin_bp.admin_dashboard") + "#section-propositions")
 
 
+@admin_bp.route("/admin/api/propositions/lot", methods=["POST"])
+@admin_required
+def traiter_propositions_lot_route():
+    """Accepte ou refuse des propositions en masse (JSON), en une transaction.
+
+    Corps : `{"decisions": [{"id_proposition": 3, "statut": "accepte",
+    "commentaire": "..."}, ...]}`. Réponse : un résultat par proposition,
+    leur décompte, la durée et le débit obtenu.
+    """
+    data = request.get_json(silent=True) or {}
+    decisions = data.get("decisions")
+    if not isinstance(decisions, list) or not decisions:
+        return jsonify({"error": "`decisions` doit être une liste non vide"}), 400
+    if len(decisions) > MAX_LOT_MODERATION:
+        return (
+            jsonify({"error": f"{MAX_LOT_MODERATION} décisions maximum par appel"}),
+            400,
+        )
+    try:
+        lot = [
+            (
+                int(d["id_proposition"]),
+                d["statut"],
+                str(d.get("commentaire") or "").strip(),
+            )
+            for d in decisions
+        ]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Décision invalide"}), 400
+    if any(statut not in ("accepte", "refuse") for _, statut, _ in lot):
+        return jsonify({"error": "Statut invalide (accepte ou refuse)"}), 400
+
+    debut = time.perf_counter()
+    resultats = traiter_propositions_lot(lot, session.get("admin_id"))
+    duree = time.perf_counter() - debut
+    if resultats is None:
+        return (
+            jsonify({"error": "Erreur lors du traitement, rien n'a été enregistré"}),
+            500,
+        )
+
+    bilan = {}
+    for r in resultats:
+        bilan[r["resultat"]] = bilan.get(r["resultat"], 0) + 1
+    _resume_admin.clear()
+    print(f"⚖️ {len(resultats)} propositions traitées par lot en {duree * 1000:.0f} ms")
+    return jsonify(
+        {
+            "resultats": resultats,
+            "bilan": bilan,
+            "duree_ms": round(duree * 1000, 1),
+            "par_seconde": round(len(resultats) / duree, 1) if duree else None,
+        }
+    )
+
+
+@admin_bp.route("/admin/api/propositions/reserver", methods=["POST"])
+@admin_required
+def reserver_propositions_route():
+    """File de modération (JSON) : réserve les prochaines propositions en attente.
+
+    Corps optionnel `{"limite": n}`. Les propositions renvoyées (celles
+    déjà tenues par l'admin comprises) sont masquées aux autres admins
+    pendant MODERATION_BAIL secondes, ou jusqu'à leur traitement.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        limite = max(
+            1, min(int(data.get("limite", MODERATION_TAILLE_LOT)), MAX_PAGE_ADMIN)
+        )
+    except (TypeError, ValueError):
+        return jsonify({"error": "Limite invalide"}), 400
+    propositions = _annoter_doublons(
+        reserver_propositions(session.get("admin_id"), limite, MODERATION_BAIL)
+    )
+    return jsonify(
+        {"propositions": _dates_iso(propositions), "bail_secondes": MODERATION_BAIL}
+    )
+
+
+@admin_bp.route("/admin/api/propositions/liberer", methods=["POST"])
+@admin_required
+def liberer_propositions_route():
+    """Rend à la file les propositions réservées par l'admin (`ids`, ou toutes)."""
+    data = request.get_json(silent=True) or {}
+    ids = data.get("ids")
+    if ids is not None:
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            return jsonify({"error": "`ids` doit être une liste d'identifiants"}), 400
+    return jsonify({"liberees": liberer_propositions(session.get("admin_id"), ids)})
+
+
 # --- GESTION DES UTILISATEURS ---
 
 
+def _veut_json() -> bool:
+    """Action envoyée par un panneau (fetch) plutôt que par un formulaire :
+    la réponse est alors du JSON, et la liste affichée (recherche, pages
+    déjà chargées) reste en place."""
+    return request.accept_mimetypes.best == "application/json"
+
+
 @admin_bp.route("/admin/toggle-user/<int:user_id>", methods=["POST"])
 @admin_required
 def toggle_user(user_id):
-    conn = get_db_connection()
-    if not conn:
-        flash("Erreur de connexion à la base de données.", "error")
-        return redirect(url_for("admin_bp.admin_dashboard") + "#section-utilisateurs")
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "UPDATE UTILISATEUR SET est_actif = NOT est_actif WHERE id_utilisateur = %s RETURNING est_actif, pseudo",
-            (user_id,),
-        )
-        row = cur.fetchone()
-        conn.commit()
-        etat = "activé" if row[0] else "désactivé"
-        flash(f"Compte '{row[1]}' {etat}.", "success")
-    except Exception as e:
-        conn.rollback()
-        flash(f"Erreur : {e}", "error")
-    finally:
-        cur.close()
-        conn.close()
+    compte = basculer_utilisateur(user_id)
+    if compte is None:
+        if _veut_json():
+            return jsonify({"error": "Compte introuvable ou base indisponible"}), 404
+        flash("Erreur lors de la modification du compte.", "error")
+    else:
+        _resume_admin.clear()
+        if _veut_json():
+            return jsonify({"est_actif": compte["est_actif"]})
+        etat = "activé" if compte["est_actif"] else "désactivé"
+        flash(f"Compte '{compte['pseudo']}' {etat}.", "success")
     return redirect(url_for("admin_bp.admin_dashboard") + "#section-utilisateurs")
 
 
 @admin_bp.route("/admin/delete-user/<int:user_id>", methods=["POST"])
 @admin_required
 def delete_user(user_id):
-    if delete_utilisateur(user_id):
+    supprime = delete_utilisateur(user_id)
+    if supprime:
+        _resume_admin.clear()
+    if _veut_json():
+        if not supprime:
+            return (
+                jsonify({"error": "Erreur lors de la suppression de l'utilisateur."}),
+                500,
+            )
+        return jsonify({"supprime": True})
+    if supprime:
         flash("Utilisateur supprimé.", "success")
     else:
         flash("Erreur lors de la suppression de l'utilisateur.", "error")
@@ -505,12 +714,46 @@ def delete_user(user_id):
 # --- GESTION DES COMMENTAIRES ---
 
 
+@admin_bp.route("/admin/api/commentaires")
+@admin_required
+def api_commentaires():
+    """Flux de modération paginé (JSON).
+
+    Paramètres : `limite`, `curseur` (renvoyé par la page précédente),
+    `non_lus=1`, `objet_id`, `auteur` (pseudo) et `depuis` (marque de
+    lecture de référence ; par défaut celle de l'admin connecté).
+    """
+    args = request.args
+    if "depuis" in args:
+        depuis = args.get("depuis") or None
+    else:
+        depuis = commentaire_service.get_derniere_lecture(session.get("admin_id"))
+    try:
+        limite = int(args.get("limite", TAILLE_PAGE_MODERATION))
+        objet_id = int(args["objet_id"]) if args.get("objet_id") else None
+        commentaires, curseur_suivant = commentaire_service.get_fil_moderation(
+            limite=limite,
+            curseur=args.get("curseur") or None,
+            depuis=depuis if args.get("non_lus") == "1" else None,
+            objet_id=objet_id,
+            pseudo=args.get("auteur") or None,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    noms_objets = get_noms_objets(list({c["objet_id"] for c in commentaires}))
+    for c in commentaires:
+        c["nom_objet"] = noms_objets.get(c["objet_id"], f"Objet #{c['objet_id']}")
+        c["nouveau"] = depuis is None or c["date"] > depuis
+    return jsonify({"commentaires": commentaires, "curseur_suivant": curseur_suivant})
+
+
 @admin_bp.route(
     "/admin/commentaire/<int:objet_id>/<commentaire_id>/supprimer", methods=["POST"]
 )
 @admin_required
 def delete_comment(objet_id, commentaire_id):
-    if CommentaireService().supprimer_commentaire(objet_id, commentaire_id):
+    if commentaire_service.supprimer_commentaire(objet_id, commentaire_id):
         flash("Commentaire supprimé.", "success")
     else:
         flash("Commentaire introuvable.", "error")
@@ -531,18 +774,63 @@ def ingest_data():
     return redirect(url_for("admin_bp.admin_dashboard"))
 
 
+def _conservables() -> Optional[Callable[[List[str]], Set[str]]]:
+    """Filtre des traductions à enregistrer : la route est publique, un
+    visiteur anonyme ne fait mémoriser que celles des textes du catalogue."""
+    if session.get("user_id") or session.get("is_admin"):
+        return None
+    return get_textes_catalogue
+
+
 @admin_bp.route("/api/translate", methods=["POST"])
 def translate_text():
-    data = request.json
+    data = request.get_json(silent=True) or {}
     text = data.get("text", "")
     target_lang = data.get("lang", "fr")
+    if not isinstance(text, str):
+        return jsonify({"error": "`text` doit être une chaîne"}), 400
+    try:
+        valider_demande([text], target_lang)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     if not text or len(text) < 3:
         return jsonify({"translated_text": text})
     try:
-        source_lang = "auto"
-        translated = GoogleTranslator(source=source_lang, target=target_lang).translate(
-            text
-        )
+        translated = translation_memory.traduire(text, target_lang, _conservables())
         return jsonify({"translated_text": translated})
+    except PoolSaturatedError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@admin_bp.route("/api/translate/batch", methods=["POST"])
+def translate_batch():
+    """Traduit plusieurs textes en un appel ; les doublons ne sont traduits qu'une fois."""
+    data = request.get_json(silent=True) or {}
+    texts = data.get("texts")
+    target_lang = data.get("lang", "fr")
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({"error": "`texts` doit être une liste de chaînes"}), 400
+    if len(texts) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"{MAX_BATCH_SIZE} textes maximum par appel"}), 400
+    try:
+        valider_demande(texts, target_lang)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        translated = translation_memory.traduire_lot(
+            texts, target_lang, _conservables()
+        )
+        return jsonify({"translated_texts": translated})
+    except PoolSaturatedError as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@admin_bp.route("/admin/api/pools")
+@admin_required
+def pools_stats():
+    """Occupation des pools d'appels externes et du pool MongoDB de ce worker."""
+    return jsonify({**get_pools_stats(), "mongo": get_stats_pool()})
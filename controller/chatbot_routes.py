@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional, Tuple, Union
 from flask import Blueprint, request, jsonify, Response
 
 from model.chatbot_service import AstroIAChatbot
+from model.upstream_pool import chatbot_pool, PoolSaturatedError
 
 # Blueprint creation
 chatbot_bp = Blueprint("chatbot_bp", __name__)
@@ -24,10 +25,14 @@ def api_chatbot() -> Union[Response, Tuple[Response, int]]:
 
         chatbot = AstroIAChatbot(history=data.get("history", []))
 
+        # L'appel Gemini tourne dans un pool borné : un afflux de questions
+        # lentes ne peut pas occuper tous les threads du worker.
         try:
-            ai_response_text = chatbot.ask(data.get("message", ""))
+            ai_response_text = chatbot_pool.run(chatbot.ask, data.get("message", ""))
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
+        except PoolSaturatedError as e:
+            return jsonify({"error": str(e)}), 503
         except RuntimeError as e:
             return jsonify({"error": str(e)}), 500
 
@@ -2,9 +2,18 @@
 
 import functools
 from typing import Any, Callable, Optional, Tuple
-from flask import Blueprint, request, redirect, url_for, flash, session, Response
+from flask import (
+    Blueprint,
+    request,
+    redirect,
+    url_for,
+    flash,
+    session,
+    Response,
+    jsonify,
+)
 
-from model.comment_service import CommentaireService
+from model.comment_service import commentaire_service, TAILLE_PAGE_FIL
 
 comment_bp = Blueprint("comment_bp", __name__)
 
@@ -37,6 +46,26 @@ def utilisateur_ou_admin_requis(view_func: Callable) -> Callable:
     return wrapper
 
 
+@comment_bp.route("/objet/<int:objet_id>/commentaires")
+def lister_commentaires(objet_id: int) -> Any:
+    """Page suivante du fil d'un objet (JSON), chargée à la demande par detail.html.
+
+    Paramètres : `parent_id` (réponses directes de ce commentaire ; racines
+    si absent), `curseur` (renvoyé par la page précédente) et `limite`.
+    """
+    args = request.args
+    try:
+        commentaires, curseur_suivant = commentaire_service.get_reponses(
+            objet_id,
+            parent_id=args.get("parent_id") or None,
+            limite=int(args.get("limite", TAILLE_PAGE_FIL)),
+            curseur=args.get("curseur") or None,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"commentaires": commentaires, "curseur_suivant": curseur_suivant})
+
+
 @comment_bp.route("/objet/<int:objet_id>/commentaire", methods=["POST"])
 @utilisateur_ou_admin_requis
 def ajouter_commentaire(objet_id: int) -> Response:
@@ -57,7 +86,7 @@ def _ajouter(objet_id: int, parent_id: Optional[str]) -> Response:
     utilisateur_id, pseudo, est_admin = _identite_auteur()
 
     try:
-        CommentaireService().ajouter_commentaire(
+        commentaire_service.ajouter_commentaire(
             objet_id=objet_id,
             utilisateur_id=utilisateur_id,
             pseudo=pseudo,
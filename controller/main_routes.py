@@ -12,6 +12,7 @@ from flask import (
     Response,
     session,
 )
+from markupsafe import Markup
 
 from model.database import (
     get_all_celestial_objects,
@@ -25,7 +26,8 @@ from model.database import (
     est_favori,
     count_utilisateurs,
 )
-from model.comment_service import CommentaireService
+from model.comment_service import commentaire_service
+from model.fragment_cache import fragments_fils
 
 # Blueprint creation
 main_bp = Blueprint("main_bp", __name__)
@@ -80,8 +82,13 @@ def catalogue() -> str:
         else []
     )
     favoris_counts = get_favoris_counts()  # 1 seule requête pour tous les compteurs
+    # Commentaires : 1 requête MongoDB sur les compteurs des seuls objets affichés
+    nb_commentaires = commentaire_service.get_nb_commentaires(
+        [obj["id_objet"] for obj in objects]
+    )
     for obj in objects:
         obj["nb_favoris"] = favoris_counts.get(obj["id_objet"], 0)
+        obj["nb_commentaires"] = nb_commentaires.get(obj["id_objet"], 0)
 
     return render_template(
         "catalogue.html",
@@ -107,19 +114,40 @@ def object_detail(object_id: int) -> Union[str, Response]:
     est_fav = est_favori(user_id, object_id) if user_id else False
     nb_favoris = count_favoris_objet(object_id)
 
-    commentaires = CommentaireService().get_commentaires(object_id)
+    fil_commentaires = _fil_commentaires(object_id)
 
     return render_template(
         "detail.html",
         obj=obj,
         est_favori=est_fav,
         nb_favoris=nb_favoris,
-        commentaires=commentaires,
+        fil_commentaires=fil_commentaires,
         now=datetime.datetime.now(),
         title=f"Détail : {obj['nom_fr']}",
     )
 
 
+def _fil_commentaires(object_id: int) -> Markup:
+    """Fil de commentaires rendu, servi depuis le cache tant que sa version n'a pas changé.
+
+    Premières racines seulement ; la suite et les réponses se chargent en
+    JSON. Le fragment est le même pour tous les visiteurs (voir
+    fil_commentaires.html).
+    """
+    # Version lue avant les données, jamais après
+    version = commentaire_service.get_version(object_id)
+    html = fragments_fils.get(f"fil-{object_id}", version)
+    if html is None:
+        commentaires, curseur_commentaires = commentaire_service.get_reponses(object_id)
+        html = render_template(
+            "fil_commentaires.html",
+            commentaires=commentaires,
+            curseur_commentaires=curseur_commentaires,
+        )
+        fragments_fils.set(f"fil-{object_id}", version, html)
+    return Markup(html)
+
+
 @main_bp.route("/formulaire")
 def formulaire() -> str:
     """Survey form page (Tally integration)."""
@@ -1,6 +1,11 @@
 import os
 import functools
-from typing import Callable, Any, Union
+import json
+import queue
+import secrets
+import threading
+import time
+from typing import Callable, Any, Dict, Iterator, Optional, Union
 from flask import (
     Blueprint,
     render_template,
@@ -21,19 +26,37 @@ from model.database import (
     update_utilisateur_password,
     get_all_categories,
     create_proposition,
-    get_propositions_by_user,
+    chercher_doublons,
     marquer_notifs_lues,
+    count_notifs_non_lues,
+    get_tableau_de_bord_utilisateur,
     toggle_favori,
-    get_favoris_utilisateur,
-    get_favoris_ids_utilisateur,
 )
+from model.comment_service import commentaire_service
+from model.evenements import RESYNCHRONISER, diffuseur
+from model.pagination import couper_page, decoder_curseur
 from werkzeug.utils import secure_filename
+from config import SSE_DUREE_MAX, SSE_HEARTBEAT, SSE_MAX_FLUX
 
 user_bp = Blueprint("user_bp", __name__)
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
 UPLOAD_FOLDER_PROFILS = os.path.join("static", "uploads", "profils")
 UPLOAD_FOLDER_PROPOSITIONS = os.path.join("static", "uploads", "propositions")
+# Image d'une proposition gardée le temps que l'utilisateur confirme un doublon
+UPLOAD_FOLDER_PROPOSITIONS_ATTENTE = os.path.join(UPLOAD_FOLDER_PROPOSITIONS, "attente")
+# Au-delà (secondes), une image jamais confirmée est supprimée
+DUREE_IMAGE_EN_ATTENTE = 24 * 3600
+
+# Propositions affichées par page dans Mon espace
+TAILLE_PAGE_PROPOSITIONS = 20
+
+# Un flux SSE occupe un thread gunicorn tant qu'il est ouvert : au plus
+# SSE_MAX_FLUX par worker, les suivants sont invités à revenir plus tard.
+_places_flux = threading.BoundedSemaphore(SSE_MAX_FLUX)
+# Délai de reconnexion demandé au navigateur (ms), plus long si le worker est plein
+RETRY_FLUX_MS = 3000
+RETRY_FLUX_SATURE_MS = 30000
 
 
 def allowed_file(filename: str) -> bool:
@@ -117,28 +140,123 @@ def inscription():
 @user_bp.route("/mon-espace")
 @login_required
 def dashboard():
-    user = get_utilisateur_by_id(session["user_id"])
-    propositions = get_propositions_by_user(session["user_id"])
-    favoris = get_favoris_utilisateur(session["user_id"])
-    favoris_ids = get_favoris_ids_utilisateur(session["user_id"])
-    marquer_notifs_lues(session["user_id"])
-
-    stats = {
-        "total": len(propositions),
-        "en_attente": sum(1 for p in propositions if p["statut"] == "en_attente"),
-        "acceptes": sum(
-            1 for p in propositions if p["statut"] in ("accepte", "modifie")
-        ),
-        "refuses": sum(1 for p in propositions if p["statut"] == "refuse"),
-    }
+    # Les propositions archivées ne sont lues que sur demande
+    historique = request.args.get("historique") == "1"
+    try:
+        apres = decoder_curseur(request.args.get("curseur"), 2)
+    except ValueError:
+        apres = None
+    donnees = get_tableau_de_bord_utilisateur(
+        session["user_id"], TAILLE_PAGE_PROPOSITIONS, apres, historique
+    )
+    if donnees is None:
+        flash("Impossible de charger votre espace pour le moment.", "error")
+        return redirect(url_for("main_bp.index"))
+
+    propositions, curseur_suivant = couper_page(
+        donnees["propositions"],
+        TAILLE_PAGE_PROPOSITIONS,
+        lambda p: (p["date_proposition"], p["id_proposition"]),
+    )
+    favoris = donnees["favoris"]
+    nb_commentaires = commentaire_service.get_nb_commentaires(
+        [obj["id_objet"] for obj in favoris]
+    )
+    for obj in favoris:
+        obj["nb_commentaires"] = nb_commentaires.get(obj["id_objet"], 0)
+    # Écriture seulement s'il reste des décisions non vues
+    if donnees["stats"]["nb_notifs_non_lues"]:
+        marquer_notifs_lues(session["user_id"])
 
     return render_template(
         "user_dashboard.html",
-        user=user,
+        user=donnees["user"],
         propositions=propositions,
-        stats=stats,
+        curseur_suivant=curseur_suivant,
+        premiere_page=apres is None,
+        historique=historique,
+        stats=donnees["stats"],
         favoris=favoris,
-        favoris_ids=favoris_ids,
+    )
+
+
+# ----------------------------------------------------
+# NOTIFICATIONS EN DIRECT (SSE)
+# ----------------------------------------------------
+
+
+@user_bp.route("/mon-espace/evenements")
+@login_required
+def evenements() -> Response:
+    """Flux SSE : décisions sur ses propositions et réponses à ses commentaires.
+
+    À la reconnexion, le navigateur renvoie l'en-tête Last-Event-ID : les
+    événements publiés depuis sont rejoués (model/evenements.py).
+    """
+    try:
+        depuis = int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        depuis = None
+    return Response(
+        _flux_evenements(session["user_id"], depuis),
+        mimetype="text/event-stream",
+        # X-Accel-Buffering : nginx transmet chaque événement sans attendre
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _flux_evenements(user_id: int, depuis: Optional[int]) -> Iterator[str]:
+    # La place est prise dans le générateur : son `finally` ne s'exécute
+    # que s'il a démarré.
+    if not _places_flux.acquire(blocking=False):
+        yield f"retry: {RETRY_FLUX_SATURE_MS}\n\n"
+        return
+    file = diffuseur.abonner(user_id, depuis)
+    try:
+        yield f"retry: {RETRY_FLUX_MS}\n\n"
+        yield _message_sse("etat", _etat_notifs(user_id))
+        # Flux fermé au bout de SSE_DUREE_MAX : le thread est rendu au
+        # worker et le navigateur se reconnecte de lui-même.
+        fin = time.monotonic() + SSE_DUREE_MAX
+        while True:
+            reste = fin - time.monotonic()
+            if reste <= 0:
+                return
+            try:
+                evenement = file.get(timeout=min(SSE_HEARTBEAT, reste))
+            except queue.Empty:
+                # Commentaire SSE : garde la connexion ouverte à travers les
+                # proxys et détecte les clients partis.
+                yield ": maintien\n\n"
+                continue
+            if evenement is RESYNCHRONISER:
+                yield _message_sse("etat", _etat_notifs(user_id))
+            elif evenement["type"] == "proposition":
+                # Compte exact plutôt qu'un +1 côté client : un événement
+                # rejoué après reconnexion ne compte pas deux fois.
+                yield _message_sse(
+                    "proposition",
+                    {**evenement, **_etat_notifs(user_id)},
+                    evenement["id"],
+                )
+            else:
+                yield _message_sse(evenement["type"], evenement, evenement["id"])
+    finally:
+        diffuseur.desabonner(user_id, file)
+        _places_flux.release()
+
+
+def _etat_notifs(user_id: int) -> Dict[str, Any]:
+    return {"nb_notifs_non_lues": count_notifs_non_lues(user_id) or 0}
+
+
+def _message_sse(
+    type_evenement: str, donnees: Dict[str, Any], id_evenement: Optional[int] = None
+) -> str:
+    entete = f"id: {id_evenement}\n" if id_evenement is not None else ""
+    return (
+        f"{entete}event: {type_evenement}\n"
+        f"data: {json.dumps(donnees, default=str)}\n\n"
     )
 
 
@@ -163,12 +281,31 @@ def proposer_objet():
             flash("Le nom, la description et la catégorie sont obligatoires.", "error")
             return render_template("proposer_objet.html", categories=categories)
 
+        # Objet probablement déjà au catalogue : on le montre avant d'enregistrer,
+        # l'utilisateur confirme s'il s'agit bien d'un autre objet. L'image
+        # reçue est gardée de côté pour ne pas avoir à la joindre à nouveau.
+        if not request.form.get("confirmer_doublon"):
+            doublons = chercher_doublons(nom_fr, nom_scientifique)
+            if doublons:
+                jeton = _garder_image(file) or request.form.get("image_en_attente")
+                image = _image_en_attente(jeton)
+                return render_template(
+                    "proposer_objet.html",
+                    categories=categories,
+                    doublons=doublons,
+                    saisie=request.form,
+                    image_en_attente=jeton if image else None,
+                    apercu_image=image,
+                )
+
         url_image = None
         if file and file.filename != "" and allowed_file(file.filename):
             os.makedirs(UPLOAD_FOLDER_PROPOSITIONS, exist_ok=True)
             filename = secure_filename(f"prop_{session['user_id']}_{file.filename}")
             file.save(os.path.join(UPLOAD_FOLDER_PROPOSITIONS, filename))
             url_image = f"uploads/propositions/{filename}"
+        else:
+            url_image = _reprendre_image(request.form.get("image_en_attente"))
 
         if create_proposition(
             nom_fr,
@@ -189,6 +326,66 @@ def proposer_objet():
     return render_template("proposer_objet.html", categories=categories)
 
 
+def _garder_image(file) -> Optional[str]:
+    """Met de côté l'image d'une proposition en attente de confirmation.
+
+    Renvoie le jeton à renvoyer avec le formulaire (champ caché), None
+    sans image valide. Le fichier n'est repris que dans la même session.
+    """
+    if not (file and file.filename != "" and allowed_file(file.filename)):
+        return None
+    _purger_images_en_attente()
+    os.makedirs(UPLOAD_FOLDER_PROPOSITIONS_ATTENTE, exist_ok=True)
+    jeton = secrets.token_hex(16)
+    filename = secure_filename(f"{jeton}_{file.filename}")
+    file.save(os.path.join(UPLOAD_FOLDER_PROPOSITIONS_ATTENTE, filename))
+    session["image_en_attente"] = filename
+    return jeton
+
+
+def _image_en_attente(jeton: Optional[str]) -> Optional[str]:
+    """Fichier mis de côté par _garder_image pour ce jeton (None s'il n'existe plus)."""
+    filename = session.get("image_en_attente")
+    if not jeton or not filename or not filename.startswith(f"{jeton}_"):
+        return None
+    if not os.path.isfile(os.path.join(UPLOAD_FOLDER_PROPOSITIONS_ATTENTE, filename)):
+        return None
+    return filename
+
+
+def _reprendre_image(jeton: Optional[str]) -> Optional[str]:
+    """Déplace l'image mise de côté vers les propositions ; renvoie son url_image."""
+    filename = _image_en_attente(jeton)
+    if not filename:
+        return None
+    session.pop("image_en_attente")
+    destination = secure_filename(
+        f"prop_{session['user_id']}_{filename[len(jeton) + 1:]}"
+    )
+    os.makedirs(UPLOAD_FOLDER_PROPOSITIONS, exist_ok=True)
+    os.replace(
+        os.path.join(UPLOAD_FOLDER_PROPOSITIONS_ATTENTE, filename),
+        os.path.join(UPLOAD_FOLDER_PROPOSITIONS, destination),
+    )
+    return f"uploads/propositions/{destination}"
+
+
+def _purger_images_en_attente() -> None:
+    """Supprime les images mises de côté depuis plus de DUREE_IMAGE_EN_ATTENTE."""
+    limite = time.time() - DUREE_IMAGE_EN_ATTENTE
+    try:
+        with os.scandir(UPLOAD_FOLDER_PROPOSITIONS_ATTENTE) as entrees:
+            fichiers = [e.path for e in entrees if e.is_file()]
+    except FileNotFoundError:
+        return
+    for chemin in fichiers:
+        try:
+            if os.path.getmtime(chemin) < limite:
+                os.remove(chemin)
+        except FileNotFoundError:
+            pass  # déjà purgée par un autre worker
+
+
 # ----------------------------------------------------
 # MODIFIER LE PROFIL
 # ----------------------------------------------------
@@ -0,0 +1,242 @@
+# faux_serveur_gemini.py - Faux serveur Gemini local pour les bancs de charge
+#
+# Imite les routes generateContent et streamGenerateContent de l'API Gemini,
+# avec une latence, un taux d'erreur et un comportement de quota (429)
+# configurables. Permet de mesurer /api/chatbot hors ligne, sans consommer
+# de quota ni dépendre du réseau :
+#
+#   python faux_serveur_gemini.py --port 8089 --latence-ms 800 --taux-429 0.05
+#   GEMINI_API_URL=http://127.0.0.1:8089/v1beta/models/gemini-2.5-flash:generateContent \
+#   GEMINI_API_KEY=factice python app.py
+#
+# Uniquement la bibliothèque standard : aucune dépendance à installer.
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class ConfigFauxGemini:
+    """Comportement simulé du faux serveur."""
+
+    latence_ms: float = 500.0
+    gigue_ms: float = 100.0
+    taux_erreur: float = 0.0
+    taux_429: float = 0.0
+    quota_par_minute: int = 0  # 0 = pas de quota glissant
+    morceaux_stream: int = 4
+
+
+class _Quota:
+    """Fenêtre glissante d'une minute, comme le quota RPM de Gemini."""
+
+    def __init__(self, limite: int) -> None:
+        self._limite = limite
+        self._appels: Deque[float] = deque()
+        self._verrou = threading.Lock()
+
+    def autoriser(self) -> bool:
+        if self._limite <= 0:
+            return True
+        maintenant = time.monotonic()
+        with self._verrou:
+            while self._appels and maintenant - self._appels[0] > 60:
+                self._appels.popleft()
+            if len(self._appels) >= self._limite:
+                return False
+            self._appels.append(maintenant)
+            return True
+
+
+def _texte_reponse(payload: Dict[str, Any]) -> str:
+    """Réponse déterministe construite à partir du dernier message utilisateur."""
+    contents = payload.get("contents") or [{}]
+    parts = contents[-1].get("parts") or [{}]
+    question = (parts[0].get("text") or "").strip()
+    return (
+        f"🪐 Réponse simulée à « {question[:80]} » : "
+        "une étoile est une immense boule de gaz qui brille comme une ampoule ✨. "
+        f"(historique : {len(contents) - 1} messages)"
+    )
+
+
+def _corps_generate(texte: str) -> Dict[str, Any]:
+    return {
+        "candidates": [
+            {
+                "content": {"role": "model", "parts": [{"text": texte}]},
+                "finishReason": "STOP",
+            }
+        ],
+        "usageMetadata": {"totalTokenCount": len(texte.split())},
+    }
+
+
+def _decouper(texte: str, nb_morceaux: int) -> List[str]:
+    taille = max(1, -(-len(texte) // max(1, nb_morceaux)))
+    return [texte[i : i + taille] for i in range(0, len(texte), taille)]
+
+
+def creer_handler(config: ConfigFauxGemini) -> type:
+    """Construit la classe de handler HTTP liée à `config`."""
+    quota = _Quota(config.quota_par_minute)
+
+    class FauxGeminiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Silencieux : les logs par requête fausseraient les mesures.
+            pass
+
+        def _envoyer_json(self, statut: int, corps: Any) -> None:
+            donnees = json.dumps(corps).encode("utf-8")
+            self.send_response(statut)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(donnees)))
+            self.end_headers()
+            self.wfile.write(donnees)
+
+        def _erreur(self, statut: int, message: str, code: str) -> None:
+            self._envoyer_json(
+                statut, {"error": {"code": statut, "message": message, "status": code}}
+            )
+
+        def _tirer_incident(self) -> Optional[Tuple[int, str, str]]:
+            if not quota.autoriser() or random.random() < config.taux_429:
+                return (
+                    429,
+                    "Resource has been exhausted (simulé).",
+                    "RESOURCE_EXHAUSTED",
+                )
+            if random.random() < config.taux_erreur:
+                return 500, "Erreur interne simulée.", "INTERNAL"
+            return None
+
+        def _attendre(self) -> None:
+            latence = random.gauss(config.latence_ms, config.gigue_ms)
+            time.sleep(max(0.0, latence) / 1000)
+
+        def do_POST(self) -> None:
+            url = urlparse(self.path)
+            longueur = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(longueur) or b"{}")
+            except ValueError:
+                self._erreur(400, "JSON invalide.", "INVALID_ARGUMENT")
+                return
+
+            if url.path.endswith(":generateContent"):
+                stream = False
+            elif url.path.endswith(":streamGenerateContent"):
+                stream = True
+            else:
+                self._erreur(404, "Route inconnue.", "NOT_FOUND")
+                return
+
+            incident = self._tirer_incident()
+            if incident:
+                self._attendre()
+                self._erreur(*incident)
+                return
+
+            texte = _texte_reponse(payload)
+            if not stream:
+                self._attendre()
+                self._envoyer_json(200, _corps_generate(texte))
+                return
+
+            morceaux = _decouper(texte, config.morceaux_stream)
+            sse = parse_qs(url.query).get("alt") == ["sse"]
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "text/event-stream" if sse else "application/json"
+            )
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            if not sse:
+                self.wfile.write(b"[")
+            for i, morceau in enumerate(morceaux):
+                time.sleep(max(0.0, config.latence_ms) / 1000 / len(morceaux))
+                corps = json.dumps(_corps_generate(morceau))
+                if sse:
+                    self.wfile.write(f"data: {corps}\r\n\r\n".encode("utf-8"))
+                else:
+                    separateur = "," if i else ""
+                    self.wfile.write(f"{separateur}{corps}".encode("utf-8"))
+                self.wfile.flush()
+            if not sse:
+                self.wfile.write(b"]")
+
+    return FauxGeminiHandler
+
+
+def creer_serveur(
+    config: ConfigFauxGemini, hote: str = "127.0.0.1", port: int = 8089
+) -> ThreadingHTTPServer:
+    """Serveur prêt à l'emploi (port 0 = port libre choisi par l'OS, utile en test)."""
+    serveur = ThreadingHTTPServer((hote, port), creer_handler(config))
+    serveur.daemon_threads = True
+    return serveur
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Faux serveur Gemini local.")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latence-ms", type=float, default=500.0)
+    parser.add_argument("--gigue-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--taux-erreur", type=float, default=0.0, help="Proportion de 500 (0..1)"
+    )
+    parser.add_argument(
+        "--taux-429",
+        type=float,
+        default=0.0,
+        help="Proportion de 429 aléatoires (0..1)",
+    )
+    parser.add_argument(
+        "--quota-par-minute",
+        type=int,
+        default=0,
+        help="Quota glissant : 429 au-delà de N requêtes/minute (0 = illimité)",
+    )
+    parser.add_argument("--morceaux-stream", type=int, default=4)
+    args = parser.parse_args()
+
+    config = ConfigFauxGemini(
+        latence_ms=args.latence_ms,
+        gigue_ms=args.gigue_ms,
+        taux_erreur=args.taux_erreur,
+        taux_429=args.taux_429,
+        quota_par_minute=args.quota_par_minute,
+        morceaux_stream=args.morceaux_stream,
+    )
+    serveur = creer_serveur(config, args.hote, args.port)
+    print(
+        f"🛰️ Faux Gemini sur http://{args.hote}:{args.port} "
+        f"(latence {config.latence_ms} ms, erreurs {config.taux_erreur:.0%}, "
+        f"429 {config.taux_429:.0%}, quota {config.quota_par_minute or '∞'}/min)"
+    )
+    print(
+        f"   GEMINI_API_URL=http://{args.hote}:{args.port}"
+        "/v1beta/models/gemini-2.5-flash:generateContent"
+    )
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        print("\nArrêt du faux serveur.")
+    finally:
+        serveur.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# gerer_index_mongo.py - Création des index MongoDB et diagnostic des requêtes
+#
+# Les index sont déclarés dans model/mongo_schema.py ; rien n'est créé au
+# démarrage de l'application. À lancer après chaque déploiement qui modifie
+# le schéma :
+#
+#   python gerer_index_mongo.py                       # crée les index manquants
+#   python gerer_index_mongo.py --supprimer-obsoletes # + supprime les non déclarés
+#   python gerer_index_mongo.py --expliquer           # plans des requêtes courantes
+#   python gerer_index_mongo.py --recalculer-compteurs # compteurs par objet
+#
+# En exploitation, MONGO_SLOW_QUERY_MS=50 (et MONGO_EXPLAIN_SLOW_QUERIES=1)
+# journalise les requêtes lentes sur les commentaires avec leur plan.
+
+import argparse
+from typing import Any, Dict, List, Tuple
+
+from config import MONGO_DB_NAME
+from model.comment_service import CommentaireService
+from model.mongo_schema import expliquer, synchroniser_schema
+from model.mongo_utils import get_mongo_client
+
+# Requêtes émises par CommentaireService, telles que vues par le serveur.
+REQUETES_COURANTES: List[Tuple[str, Dict[str, Any]]] = [
+    (
+        "fil d'un objet",
+        {
+            "find": "commentaires_noeuds",
+            "filter": {"objet_id": 1},
+            "sort": {"date": 1},
+        },
+    ),
+    (
+        "fil paginé (racines d'un objet)",
+        {
+            "find": "commentaires_noeuds",
+            "filter": {"$and": [{"objet_id": 1, "parent_id": None}]},
+            "sort": {"date": 1, "commentaire_id": 1},
+            "limit": 11,
+        },
+    ),
+    (
+        "réponse (parent)",
+        {
+            "find": "commentaires_noeuds",
+            "filter": {"commentaire_id": "x", "objet_id": 1},
+            "limit": 1,
+        },
+    ),
+    (
+        "modération (page filtrée par objet)",
+        {
+            "find": "commentaires_noeuds",
+            "filter": {"objet_id": 1},
+            "sort": {"date": -1, "commentaire_id": -1},
+            "limit": 21,
+        },
+    ),
+    (
+        "non lus",
+        {
+            "count": "commentaires_noeuds",
+            "query": {"date": {"$gt": "2026-01-01T00:00:00+00:00"}},
+            "limit": 100,
+        },
+    ),
+    (
+        "suppression d'un sous-arbre",
+        {
+            "find": "commentaires_noeuds",
+            "filter": {
+                "objet_id": 1,
+                "$or": [{"commentaire_id": "x"}, {"ancetres": "x"}],
+            },
+        },
+    ),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index MongoDB d'AstroLearn.")
+    parser.add_argument(
+        "--supprimer-obsoletes",
+        action="store_true",
+        help="Supprime les index présents mais non déclarés dans mongo_schema.py.",
+    )
+    parser.add_argument(
+        "--expliquer",
+        action="store_true",
+        help="Affiche le plan d'exécution des requêtes courantes sur les commentaires.",
+    )
+    parser.add_argument(
+        "--recalculer-compteurs",
+        action="store_true",
+        help="Reconstruit les compteurs de commentaires par objet (commentaires_objets).",
+    )
+    args = parser.parse_args()
+
+    db = get_mongo_client()[MONGO_DB_NAME]
+    for collection, rapport in synchroniser_schema(
+        db, args.supprimer_obsoletes
+    ).items():
+        print(
+            f"✅ {collection} : créés {rapport['crees'] or '-'}, "
+            f"présents {rapport['presents'] or '-'}, "
+            f"supprimés {rapport['supprimes'] or '-'}"
+        )
+
+    if args.recalculer_compteurs:
+        nb_objets = CommentaireService().recalculer_compteurs()
+        print(f"✅ Compteurs recalculés pour {nb_objets} objets.")
+
+    if args.expliquer:
+        for libelle, commande in REQUETES_COURANTES:
+            plan = expliquer(db, commande)
+            alerte = " ⚠️ parcours complet" if "COLLSCAN" in plan else ""
+            print(f"🔎 {libelle} : {plan}{alerte}")
+
+
+if __name__ == "__main__":
+    main()
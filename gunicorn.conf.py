@@ -0,0 +1,65 @@
+# gunicorn.conf.py - Configuration Gunicorn (production et Docker)
+#
+# Workers "gthread" : chaque worker sert plusieurs requêtes en parallèle
+# (par défaut 3 workers de 16 threads, GUNICORN_WORKERS / GUNICORN_THREADS).
+# Les appels lents vers Gemini / Google Translate sont bornés par leurs
+# pools dédiés (model/upstream_pool.py) : tant que la somme workers + file
+# de ces pools reste sous `threads`, des threads restent toujours libres
+# pour afficher les pages (catalogue, fiches...). Il en va de même des flux
+# SSE de notifications (SSE_MAX_FLUX par worker), qui gardent chacun un
+# thread tant qu'ils sont ouverts.
+#
+# Chaque worker crée son propre client MongoDB après le fork (post_fork), avec
+# un pool réglé par MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE, et l'ouvre dès
+# son démarrage si MONGO_WARMUP=1.
+#
+# Lancement : gunicorn -c gunicorn.conf.py --bind 0.0.0.0:5000 app:app
+
+import os
+
+from config import (
+    CHATBOT_POOL_WORKERS,
+    CHATBOT_POOL_QUEUE,
+    TRANSLATE_POOL_WORKERS,
+    TRANSLATE_POOL_QUEUE,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_WARMUP,
+    SSE_MAX_FLUX,
+)
+from model.mongo_utils import fermer_client, prechauffer, reinitialiser_apres_fork
+
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+
+_threads_amont = (
+    CHATBOT_POOL_WORKERS
+    + CHATBOT_POOL_QUEUE
+    + TRANSLATE_POOL_WORKERS
+    + TRANSLATE_POOL_QUEUE
+    + SSE_MAX_FLUX
+)
+if _threads_amont >= threads:
+    print(
+        f"⚠️ Les pools d'appels externes et les flux SSE peuvent occuper {_threads_amont} threads "
+        f"sur {threads} : plus aucun thread ne serait libre pour les pages."
+    )
+
+if MONGO_MAX_POOL_SIZE < threads:
+    print(
+        f"⚠️ MONGO_MAX_POOL_SIZE={MONGO_MAX_POOL_SIZE} < {threads} threads : "
+        "des requêtes attendront une connexion MongoDB libre."
+    )
+
+
+def post_fork(server, worker):
+    # Un MongoClient créé dans le maître (preload_app) ne doit pas être
+    # réutilisé par les workers : chacun repart d'un client neuf.
+    reinitialiser_apres_fork()
+    if MONGO_WARMUP:
+        prechauffer()
+
+
+def worker_exit(server, worker):
+    fermer_client()
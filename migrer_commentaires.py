@@ -0,0 +1,111 @@
+# migrer_commentaires.py - Migration des commentaires vers un document par commentaire
+#
+# Ancien stockage : collection `commentaires`, un document par objet céleste
+# contenant tout l'arbre (`commentaires` / `reponses` imbriqués).
+# Nouveau stockage : collection `commentaires_noeuds`, un document par
+# commentaire (voir model/comment_service.py).
+#
+#   python migrer_commentaires.py --simulation   # compte sans rien écrire
+#   python migrer_commentaires.py                # migre (idempotent)
+#   python migrer_commentaires.py --supprimer-ancien
+#
+# Rejouable sans risque : chaque commentaire est écrit par upsert sur son
+# commentaire_id, une seconde exécution ne crée aucun doublon.
+
+import argparse
+from typing import Any, Dict, Iterator, List
+
+from pymongo import ReplaceOne
+
+from model.arbre_commentaires import parcourir
+from model.comment_service import CommentaireService
+from model.mongo_schema import synchroniser_schema
+from model.mongo_utils import (
+    get_anciens_commentaires_collection,
+    get_commentaires_collection,
+)
+
+TAILLE_LOT = 1000
+
+
+def aplatir_ancien_document(doc: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Transforme l'arbre d'un ancien document en commentaires à plat.
+
+    Parcours itératif (pile explicite) : pas de limite de récursion Python,
+    quelle que soit la profondeur du fil.
+    """
+    objet_id = doc["objet_id"]
+    chemin: List[str] = []  # identifiants de la racine au nœud courant
+    for noeud, profondeur in parcourir(doc.get("commentaires", [])):
+        del chemin[profondeur:]
+        ancetres = list(chemin)
+        chemin.append(noeud["commentaire_id"])
+        commentaire = {k: v for k, v in noeud.items() if k != "reponses"}
+        commentaire.update(
+            {
+                "objet_id": objet_id,
+                "parent_id": ancetres[-1] if ancetres else None,
+                "ancetres": ancetres,
+                "profondeur": len(ancetres),
+            }
+        )
+        commentaire.pop("vu", None)  # remplacé par les marques de lecture admin
+        commentaire.setdefault("est_admin", False)
+        yield commentaire
+
+
+def migrer(simulation: bool = False, supprimer_ancien: bool = False) -> int:
+    source = get_anciens_commentaires_collection()
+    cible = get_commentaires_collection()
+    if not simulation:
+        synchroniser_schema(cible.database)
+
+    total = 0
+    lot: List[ReplaceOne] = []
+    for doc in source.find({}, {"chemins": 0}):
+        for commentaire in aplatir_ancien_document(doc):
+            total += 1
+            lot.append(
+                ReplaceOne(
+                    {"commentaire_id": commentaire["commentaire_id"]},
+                    commentaire,
+                    upsert=True,
+                )
+            )
+            if len(lot) >= TAILLE_LOT and not simulation:
+                cible.bulk_write(lot, ordered=False)
+                lot = []
+    if lot and not simulation:
+        cible.bulk_write(lot, ordered=False)
+
+    if simulation:
+        print(f"🔎 Simulation : {total} commentaires seraient migrés.")
+        return total
+
+    print(f"✅ {total} commentaires migrés vers {cible.name}.")
+    nb_objets = CommentaireService(cible).recalculer_compteurs()
+    print(f"✅ Compteurs recalculés pour {nb_objets} objets.")
+    if supprimer_ancien:
+        source.drop()
+        print(f"🗑️ Ancienne collection {source.name} supprimée.")
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migre les commentaires vers un document par commentaire."
+    )
+    parser.add_argument(
+        "--simulation", action="store_true", help="Compte sans rien écrire."
+    )
+    parser.add_argument(
+        "--supprimer-ancien",
+        action="store_true",
+        help="Supprime l'ancienne collection une fois la migration terminée.",
+    )
+    args = parser.parse_args()
+    migrer(simulation=args.simulation, supprimer_ancien=args.supprimer_ancien)
+
+
+if __name__ == "__main__":
+    main()
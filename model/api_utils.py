@@ -4,13 +4,9 @@ import time
 import functools
 import requests
 from typing import Callable, Any, Optional, List, Dict
-from config import API_KEY, NASA_IMAGES_URL
+from config import API_KEY, GEMINI_API_URL, NASA_IMAGES_URL
 from model.database import insert_solar_system_body
-
-# Gemini Configuration - 2026 Stable Endpoint
-GEMINI_API_URL: str = (
-    "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
-)
+from model.translation_service import pretraduire_en_arriere_plan
 
 
 def retry_with_backoff(func: Callable) -> Callable:
@@ -131,9 +127,16 @@ def get_paged_nasa_search_data(
         return None
 
 
-def ingest_solar_system_data_paged(search_term: str, max_pages: int) -> int:
-    """Orchestre l'ingestion de données NASA vers PostgreSQL avec détection de type."""
+def ingest_solar_system_data_paged(
+    search_term: str, max_pages: int, pretraduire: bool = True
+) -> int:
+    """Orchestre l'ingestion de données NASA vers PostgreSQL avec détection de type.
+
+    Si `pretraduire` est vrai, les titres et descriptions importés sont
+    ensuite traduits en arrière-plan dans la mémoire de traduction.
+    """
     total_success_count: int = 0
+    textes_importes: List[str] = []
 
     for page in range(1, max_pages + 1):
         data = get_paged_nasa_search_data(search_term, page)
@@ -195,8 +198,12 @@ def ingest_solar_system_data_paged(search_term: str, max_pages: int) -> int:
 
                 if result:
                     total_success_count += 1
+                    textes_importes += [title, item.get("description", "")]
             except Exception as e:
                 print(f"❌ Erreur lors de l'ingestion de {title}: {e}")
                 continue
 
+    if pretraduire and textes_importes:
+        pretraduire_en_arriere_plan(textes_importes)
+
     return total_success_count
@@ -0,0 +1,47 @@
+# model/arbre_commentaires.py
+
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+Noeud = Dict[str, Any]
+
+
+def parcourir(
+    racines: Iterable[Noeud], enfants: str = "reponses"
+) -> Iterator[Tuple[Noeud, int]]:
+    """Parcours en profondeur (préordre) d'un arbre imbriqué, à pile explicite.
+
+    Renvoie chaque nœud avec sa profondeur (0 pour une racine), dans
+    l'ordre d'affichage, en O(n). Aucune récursion : un fil de n'importe
+    quelle profondeur est parcouru sans atteindre la limite de récursion
+    Python.
+    """
+    pile: List[Tuple[Noeud, int]] = [(n, 0) for n in reversed(list(racines))]
+    while pile:
+        noeud, profondeur = pile.pop()
+        yield noeud, profondeur
+        reponses = noeud.get(enfants)
+        if reponses:
+            pile.extend((reponse, profondeur + 1) for reponse in reversed(reponses))
+
+
+def construire_racines(noeuds: Iterable[Noeud]) -> List[Noeud]:
+    """Racines de l'arbre imbriqué (`reponses`) bâti en O(n) à partir de commentaires à plat.
+
+    `noeuds` doit être trié par date : chaque liste `reponses` garde alors
+    l'ordre chronologique. Un commentaire dont le parent est absent est
+    ignoré, avec ses descendants.
+    """
+    racines: List[Noeud] = []
+    par_id: Dict[str, Noeud] = {}
+    noeuds = list(noeuds)
+    for noeud in noeuds:
+        noeud["reponses"] = []
+        par_id[noeud["commentaire_id"]] = noeud
+
+    for noeud in noeuds:
+        parent_id = noeud.get("parent_id")
+        if parent_id is None:
+            racines.append(noeud)
+        elif parent_id in par_id:
+            par_id[parent_id]["reponses"].append(noeud)
+    return racines
@@ -0,0 +1,62 @@
+# model/cache_utils.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """Cache en mémoire, borné en nombre d'entrées, partagé entre les threads d'un worker.
+
+    Chaque worker gunicorn a sa propre instance : c'est un cache local,
+    à placer devant une source de vérité (PostgreSQL, MongoDB...). Avec
+    `ttl` (secondes), une entrée expire aussi après cette durée : pour des
+    valeurs qui peuvent être un peu en retard, jamais durablement.
+    """
+
+    def __init__(self, taille_max: int, ttl: Optional[float] = None) -> None:
+        self.taille_max = taille_max
+        self.ttl = ttl
+        self._donnees: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = (
+            OrderedDict()
+        )
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cle: Hashable) -> Optional[Any]:
+        with self._verrou:
+            entree = self._donnees.get(cle)
+            if (
+                entree is not None
+                and entree[0] is not None
+                and entree[0] <= time.monotonic()
+            ):
+                del self._donnees[cle]
+                entree = None
+            if entree is None:
+                self.misses += 1
+                return None
+            self._donnees.move_to_end(cle)
+            self.hits += 1
+            return entree[1]
+
+    def set(self, cle: Hashable, valeur: Any) -> None:
+        expiration = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._verrou:
+            self._donnees[cle] = (expiration, valeur)
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self.taille_max:
+                self._donnees.popitem(last=False)
+
+    def delete(self, cle: Hashable) -> None:
+        with self._verrou:
+            self._donnees.pop(cle, None)
+
+    def clear(self) -> None:
+        with self._verrou:
+            self._donnees.clear()
+
+    def __len__(self) -> int:
+        return len(self._donnees)
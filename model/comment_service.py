@@ -2,28 +2,115 @@
 
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from model.mongo_utils import get_commentaires_collection
+from pymongo import ASCENDING, DESCENDING, UpdateMany, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from model.arbre_commentaires import construire_racines
+from model.evenements import publieur
+from model.mongo_utils import (
+    get_commentaires_collection,
+    get_compteurs_commentaires_collection,
+    get_lectures_admin_collection,
+)
+from model.pagination import couper_page, decoder_curseur
 
 MAX_COMMENT_LENGTH = 1000
+# Au-delà, le badge admin affiche « 99+ » : inutile de compter plus loin.
+MAX_NON_LUS = 100
+TAILLE_PAGE_MODERATION = 20
+MAX_PAGE_MODERATION = 100
+# Fil public d'un objet : racines (ou réponses d'un commentaire) par page.
+TAILLE_PAGE_FIL = 10
+MAX_PAGE_FIL = 50
+# Écritures groupées (bulk_write) lors des recalculs.
+_TAILLE_LOT = 1000
+
+# Champs internes au stockage, inutiles à l'affichage d'un fil.
+_PROJECTION_ARBRE = {"_id": 0, "ancetres": 0}
+# Fil public : uniquement ce qu'affiche une carte de commentaire.
+_PROJECTION_FIL = {
+    "_id": 0,
+    "commentaire_id": 1,
+    "parent_id": 1,
+    "profondeur": 1,
+    "pseudo": 1,
+    "texte": 1,
+    "date": 1,
+    "est_admin": 1,
+    "nb_reponses": 1,
+}
 
 
 class CommentaireService:
     """Gère les fils de commentaires imbriqués (profondeur illimitée) d'un objet céleste.
 
-    Un document MongoDB par objet céleste, contenant l'arbre complet des
-    commentaires et de leurs réponses. Ce document est de taille modeste
-    (commentaires pédagogiques courts), donc la stratégie "lire l'arbre,
-    le modifier en mémoire, le réécrire" reste simple et sûre.
+    Un document MongoDB par commentaire, avec `objet_id`, `parent_id`,
+    `ancetres` (identifiants de la racine jusqu'au parent, chemin
+    matérialisé) et `profondeur`. Un fil populaire n'approche donc plus la
+    limite de 16 Mo par document, une écriture est un simple insert et un
+    sous-arbre se supprime en une requête sur `ancetres`. L'arbre est
+    reconstruit en O(n) à la lecture, dans la même forme qu'avant
+    (champ `reponses` imbriqué). Index déclarés dans model/mongo_schema.py.
+
+    Chaque commentaire porte aussi `nb_reponses`, le nombre de ses
+    descendants, incrémenté sur tous les ancêtres à chaque réponse : la
+    page détail n'affiche que les premières racines avec ce compteur et
+    charge les sous-arbres à la demande (get_reponses).
+
+    Une seconde collection tient, par objet, `nb_commentaires` et `version`,
+    mis à jour par $inc à chaque écriture : les totaux ne parcourent jamais
+    les commentaires eux-mêmes, et la version sert de clé au cache des fils
+    pré-rendus (model/fragment_cache.py). Le « lu / non lu » de la modération est propre
+    à chaque admin : une marque de lecture (date du dernier commentaire vu)
+    par admin, un commentaire étant non lu s'il est plus récent.
+
+    Une réponse envoie un événement « reponse » à l'auteur du commentaire
+    parent (notifications en direct, model/evenements.py), mis en file et
+    publié hors de la requête.
     """
 
-    def __init__(self) -> None:
-        self._collection = get_commentaires_collection()
+    def __init__(
+        self,
+        collection: Optional[Collection] = None,
+        compteurs: Optional[Collection] = None,
+        lectures: Optional[Collection] = None,
+        publier: Callable[..., Any] = publieur.publier,
+    ) -> None:
+        # Collections injectées (tests, scripts) ; sinon résolues à chaque
+        # appel sur le client du processus courant, ce qui permet une
+        # instance unique au niveau du module sans rien figer avant le fork
+        # des workers gunicorn.
+        self._collection_fixe = collection
+        self._compteurs_fixe = compteurs
+        self._lectures_fixe = lectures
+        self._publier = publier
+
+    @property
+    def _collection(self) -> Collection:
+        if self._collection_fixe is not None:
+            return self._collection_fixe
+        return get_commentaires_collection()
+
+    @property
+    def _compteurs(self) -> Collection:
+        if self._compteurs_fixe is not None:
+            return self._compteurs_fixe
+        return get_compteurs_commentaires_collection()
+
+    @property
+    def _lectures(self) -> Collection:
+        if self._lectures_fixe is not None:
+            return self._lectures_fixe
+        return get_lectures_admin_collection()
 
     def get_commentaires(self, objet_id: int) -> List[Dict[str, Any]]:
-        doc = self._collection.find_one({"objet_id": objet_id})
-        return doc["commentaires"] if doc else []
+        noeuds = self._collection.find({"objet_id": objet_id}, _PROJECTION_ARBRE).sort(
+            "date", ASCENDING
+        )
+        return construire_arbre(noeuds)
 
     def ajouter_commentaire(
         self,
@@ -40,7 +127,7 @@ class CommentaireService:
         administrateur (identifié uniquement par `pseudo` et `est_admin`).
 
         Lève ValueError si le texte est vide, trop long, ou si `parent_id`
-        ne correspond à aucun commentaire existant.
+        ne correspond à aucun commentaire existant de cet objet.
         """
         texte = (texte or "").strip()
         if not texte:
@@ -50,106 +137,331 @@ class CommentaireService:
                 f"Commentaire trop long (max {MAX_COMMENT_LENGTH} caractères)"
             )
 
+        ancetres: List[str] = []
+        parent = None
+        if parent_id is not None:
+            parent = self._collection.find_one(
+                {"commentaire_id": parent_id, "objet_id": objet_id},
+                {"_id": 0, "ancetres": 1, "utilisateur_id": 1},
+            )
+            if parent is None:
+                raise ValueError("Commentaire parent introuvable")
+            ancetres = parent.get("ancetres", []) + [parent_id]
+
         nouveau_commentaire = {
             "commentaire_id": str(uuid.uuid4()),
+            "objet_id": objet_id,
+            "parent_id": parent_id,
+            "ancetres": ancetres,
+            "profondeur": len(ancetres),
             "utilisateur_id": utilisateur_id,
             "pseudo": pseudo,
             "texte": texte,
             "date": datetime.now(timezone.utc).isoformat(),
-            "vu": False,
             "est_admin": est_admin,
-            "reponses": [],
+            "nb_reponses": 0,
         }
+        self._collection.insert_one(nouveau_commentaire)
 
-        commentaires = self.get_commentaires(objet_id)
+        # Le parent a pu être supprimé entre sa lecture et l'insertion :
+        # on retire alors la réponse plutôt que de laisser un orphelin.
+        if parent_id is not None and not self._collection.find_one(
+            {"commentaire_id": parent_id}, {"_id": 1}
+        ):
+            self._collection.delete_one(
+                {"commentaire_id": nouveau_commentaire["commentaire_id"]}
+            )
+            raise ValueError("Commentaire parent introuvable")
 
-        if parent_id is None:
-            commentaires.append(nouveau_commentaire)
-        else:
-            if not self._inserer_reponse(commentaires, parent_id, nouveau_commentaire):
-                raise ValueError("Commentaire parent introuvable")
+        if ancetres:
+            self._collection.update_many(
+                {"commentaire_id": {"$in": ancetres}}, {"$inc": {"nb_reponses": 1}}
+            )
+        self._incrementer(objet_id, nb_commentaires=1, version=1)
 
-        self._collection.update_one(
-            {"objet_id": objet_id},
-            {"$set": {"commentaires": commentaires}},
-            upsert=True,
-        )
+        destinataire = parent.get("utilisateur_id") if parent else None
+        if destinataire is not None and destinataire != utilisateur_id:
+            self._publier(
+                destinataire,
+                "reponse",
+                objet_id=objet_id,
+                commentaire_id=nouveau_commentaire["commentaire_id"],
+                pseudo=pseudo,
+            )
 
         return nouveau_commentaire["commentaire_id"]
 
-    def _inserer_reponse(
+    def get_fil_moderation(
         self,
-        noeuds: List[Dict[str, Any]],
-        parent_id: str,
-        nouveau_commentaire: Dict[str, Any],
-    ) -> bool:
-        """Parcourt récursivement l'arbre pour insérer une réponse sous `parent_id`."""
-        for noeud in noeuds:
-            if noeud["commentaire_id"] == parent_id:
-                noeud["reponses"].append(nouveau_commentaire)
-                return True
-            if self._inserer_reponse(noeud["reponses"], parent_id, nouveau_commentaire):
-                return True
-        return False
-
-    def get_tous_commentaires(self) -> List[Dict[str, Any]]:
-        """Aplatit l'arbre de commentaires de tous les objets, pour la modération admin.
-
-        Chaque entrée conserve `objet_id` mais pas `reponses` (vue à plat),
-        triée du plus récent au plus ancien.
+        limite: int = TAILLE_PAGE_MODERATION,
+        curseur: Optional[str] = None,
+        depuis: Optional[str] = None,
+        objet_id: Optional[int] = None,
+        pseudo: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Une page du flux de modération, du plus récent au plus ancien.
+
+        Pagination par curseur sur (date, commentaire_id) : chaque page
+        reprend juste après le dernier élément de la précédente, sans
+        `skip`, donc à coût constant quelle que soit la profondeur. Filtres
+        optionnels : postés après `depuis` (non lus), objet, auteur.
+        Renvoie la page et le curseur de la suivante (None à la fin).
         """
-        resultats: List[Dict[str, Any]] = []
-        for doc in self._collection.find():
-            self._aplatir(doc.get("commentaires", []), doc["objet_id"], resultats)
-        resultats.sort(key=lambda c: c["date"], reverse=True)
-        return resultats
+        conditions: List[Dict[str, Any]] = []
+        if depuis:
+            conditions.append({"date": {"$gt": depuis}})
+        if objet_id is not None:
+            conditions.append({"objet_id": objet_id})
+        if pseudo:
+            conditions.append({"pseudo": pseudo})
+        return self._paginer(
+            conditions,
+            DESCENDING,
+            max(1, min(limite, MAX_PAGE_MODERATION)),
+            curseur,
+            _PROJECTION_ARBRE,
+        )
 
-    def _aplatir(
+    def get_reponses(
         self,
-        noeuds: List[Dict[str, Any]],
         objet_id: int,
-        resultats: List[Dict[str, Any]],
-    ) -> None:
-        for noeud in noeuds:
-            entree = {k: v for k, v in noeud.items() if k != "reponses"}
-            entree["objet_id"] = objet_id
-            resultats.append(entree)
-            self._aplatir(noeud.get("reponses", []), objet_id, resultats)
-
-    def count_non_lus(self) -> int:
-        return sum(1 for c in self.get_tous_commentaires() if not c.get("vu", False))
-
-    def marquer_tous_lus(self) -> None:
-        for doc in self._collection.find():
-            commentaires = doc.get("commentaires", [])
-            self._marquer_lu(commentaires)
-            self._collection.update_one(
-                {"_id": doc["_id"]}, {"$set": {"commentaires": commentaires}}
+        parent_id: Optional[str] = None,
+        limite: int = TAILLE_PAGE_FIL,
+        curseur: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Une page des réponses directes de `parent_id` (des racines si None).
+
+        Ordre chronologique, pagination par curseur comme la modération.
+        Seuls les champs affichés sont renvoyés (_PROJECTION_FIL), avec
+        `nb_reponses` pour proposer de déplier chaque sous-arbre : le coût
+        d'une page ne dépend pas de la taille du fil.
+        """
+        page, suivant = self._paginer(
+            [{"objet_id": objet_id, "parent_id": parent_id}],
+            ASCENDING,
+            max(1, min(limite, MAX_PAGE_FIL)),
+            curseur,
+            _PROJECTION_FIL,
+        )
+        for commentaire in page:
+            commentaire.setdefault("nb_reponses", 0)
+        return page, suivant
+
+    def _paginer(
+        self,
+        conditions: List[Dict[str, Any]],
+        sens: int,
+        limite: int,
+        curseur: Optional[str],
+        projection: Dict[str, int],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Page triée sur (date, commentaire_id) dans le sens `sens`, reprise après `curseur`."""
+        if curseur:
+            date, commentaire_id = decoder_curseur(curseur, 2)
+            # Valeurs reprises telles quelles dans le filtre Mongo
+            if not isinstance(date, str) or not isinstance(commentaire_id, str):
+                raise ValueError("Curseur invalide")
+            apres = "$gt" if sens == ASCENDING else "$lt"
+            conditions = conditions + [
+                {
+                    "$or": [
+                        {"date": {apres: date}},
+                        {"date": date, "commentaire_id": {apres: commentaire_id}},
+                    ]
+                }
+            ]
+        filtre = {"$and": conditions} if conditions else {}
+
+        page = list(
+            self._collection.find(filtre, projection)
+            .sort([("date", sens), ("commentaire_id", sens)])
+            .limit(limite + 1)
+        )
+        return couper_page(page, limite, lambda c: (c["date"], c["commentaire_id"]))
+
+    def _incrementer(self, objet_id: int, **deltas: int) -> None:
+        self._compteurs.update_one(
+            {"objet_id": objet_id}, {"$inc": deltas}, upsert=True
+        )
+
+    def get_version(self, objet_id: int) -> int:
+        """Version du fil d'un objet, incrémentée à chaque écriture (0 : jamais commenté).
+
+        Sert de clé aux fragments HTML mis en cache : à lire avant les
+        commentaires eux-mêmes, pour qu'un fragment ne soit jamais plus
+        ancien que sa version.
+        """
+        doc = self._compteurs.find_one({"objet_id": objet_id}, {"_id": 0, "version": 1})
+        return doc.get("version", 0) if doc else 0
+
+    def get_nb_commentaires(self, objet_ids: List[int]) -> Dict[int, int]:
+        """Nombre de commentaires de chaque objet de `objet_ids`, en une requête.
+
+        Lu sur les compteurs par objet : le coût dépend du nombre d'objets
+        demandés, jamais de la taille des fils. Un objet sans commentaire
+        est absent du résultat. Renvoie {} si MongoDB est injoignable, pour
+        que les pages qui affichent ces compteurs restent servies.
+        """
+        if not objet_ids:
+            return {}
+        try:
+            docs = self._compteurs.find(
+                {"objet_id": {"$in": list(objet_ids)}},
+                {"_id": 0, "objet_id": 1, "nb_commentaires": 1},
             )
+            return {d["objet_id"]: d.get("nb_commentaires", 0) for d in docs}
+        except PyMongoError as e:
+            print(f"❌ Erreur get_nb_commentaires : {e}")
+            return {}
 
-    def _marquer_lu(self, noeuds: List[Dict[str, Any]]) -> None:
-        for noeud in noeuds:
-            noeud["vu"] = True
-            self._marquer_lu(noeud["reponses"])
+    def get_derniere_lecture(self, admin_id: int) -> Optional[str]:
+        """Date ISO du dernier commentaire vu par cet admin (None : jamais ouvert)."""
+        doc = self._lectures.find_one({"admin_id": admin_id}, {"_id": 0})
+        return doc["derniere_lecture"] if doc else None
+
+    def count_non_lus(self, admin_id: int) -> int:
+        """Commentaires postés après la dernière lecture de l'admin, plafonné à MAX_NON_LUS.
+
+        Le comptage parcourt l'index sur `date` depuis la marque de lecture
+        et s'arrête au plafond : son coût ne dépend pas du volume total.
+        """
+        derniere_lecture = self.get_derniere_lecture(admin_id)
+        filtre = {"date": {"$gt": derniere_lecture}} if derniere_lecture else {}
+        return self._collection.count_documents(filtre, limit=MAX_NON_LUS)
+
+    def marquer_lus_jusqu_a(self, admin_id: int, date: str) -> None:
+        """Avance la marque de lecture de l'admin jusqu'à `date` (jamais en arrière)."""
+        self._lectures.update_one(
+            {"admin_id": admin_id},
+            {"$max": {"derniere_lecture": date}},
+            upsert=True,
+        )
 
     def supprimer_commentaire(self, objet_id: int, commentaire_id: str) -> bool:
         """Supprime un commentaire et l'intégralité de ses réponses imbriquées."""
-        commentaires = self.get_commentaires(objet_id)
-        if not self._supprimer_noeud(commentaires, commentaire_id):
+        cible = self._collection.find_one(
+            {"commentaire_id": commentaire_id, "objet_id": objet_id},
+            {"_id": 0, "ancetres": 1},
+        )
+        if cible is None:
+            return False
+        filtre = {
+            "objet_id": objet_id,
+            "$or": [
+                {"commentaire_id": commentaire_id},
+                {"ancetres": commentaire_id},
+            ],
+        }
+        resultat = self._collection.delete_many(filtre)
+        if resultat.deleted_count == 0:
             return False
+        if cible.get("ancetres"):
+            self._collection.update_many(
+                {"commentaire_id": {"$in": cible["ancetres"]}},
+                {"$inc": {"nb_reponses": -resultat.deleted_count}},
+            )
+        self._incrementer(objet_id, nb_commentaires=-resultat.deleted_count, version=1)
+        return True
+
+    def purger_objets(self, objet_ids: List[int]) -> int:
+        """Supprime les commentaires et les compteurs d'objets supprimés de PostgreSQL.
 
-        self._collection.update_one(
-            {"objet_id": objet_id}, {"$set": {"commentaires": commentaires}}
+        Appelé par le traitement de NETTOYAGE_OUTBOX (model/nettoyage_outbox.py),
+        en deux requêtes quel que soit le nombre d'objets ; idempotent. Les
+        identifiants d'objet (SERIAL) n'étant jamais réattribués, le
+        document de compteurs peut disparaître sans risque de resservir un
+        fragment périmé. Les erreurs MongoDB sont propagées pour que la
+        tâche soit retentée. Renvoie le nombre de commentaires supprimés.
+        """
+        if not objet_ids:
+            return 0
+        filtre = {"objet_id": {"$in": list(objet_ids)}}
+        resultat = self._collection.delete_many(filtre)
+        self._compteurs.delete_many(filtre)
+        return resultat.deleted_count
+
+    def get_objets_commentes(self) -> List[int]:
+        """Identifiants des objets ayant des commentaires ou un document de compteurs."""
+        objets = set(self._collection.distinct("objet_id"))
+        objets.update(self._compteurs.distinct("objet_id"))
+        return sorted(objets)
+
+    def recalculer_compteurs(self) -> int:
+        """Reconstruit tous les compteurs (par objet et `nb_reponses`) à partir des commentaires.
+
+        À lancer après une migration ou une intervention manuelle sur la
+        collection ; renvoie le nombre d'objets commentés.
+        """
+        self._recalculer_nb_reponses()
+        lignes = list(
+            self._collection.aggregate(
+                [
+                    {
+                        "$group": {
+                            "_id": "$objet_id",
+                            "nb_commentaires": {"$sum": 1},
+                        }
+                    }
+                ]
+            )
         )
-        return True
+        # Mise à jour en place plutôt que remplacement : `version` ne doit
+        # jamais revenir en arrière, sous peine de resservir un vieux fragment.
+        self._compteurs.bulk_write(
+            [
+                UpdateOne(
+                    {"objet_id": ligne["_id"]},
+                    {
+                        "$set": {"nb_commentaires": ligne["nb_commentaires"]},
+                        "$inc": {"version": 1},
+                    },
+                    upsert=True,
+                )
+                for ligne in lignes
+            ]
+            + [
+                UpdateMany(
+                    {"objet_id": {"$nin": [ligne["_id"] for ligne in lignes]}},
+                    {"$set": {"nb_commentaires": 0}, "$inc": {"version": 1}},
+                )
+            ],
+            ordered=False,
+        )
+        return len(lignes)
 
-    def _supprimer_noeud(
-        self, noeuds: List[Dict[str, Any]], commentaire_id: str
-    ) -> bool:
-        for i, noeud in enumerate(noeuds):
-            if noeud["commentaire_id"] == commentaire_id:
-                del noeuds[i]
-                return True
-            if self._supprimer_noeud(noeud["reponses"], commentaire_id):
-                return True
-        return False
+    def _recalculer_nb_reponses(self) -> None:
+        descendants = self._collection.aggregate(
+            [
+                {"$unwind": "$ancetres"},
+                {"$group": {"_id": "$ancetres", "nb_reponses": {"$sum": 1}}},
+            ]
+        )
+        self._collection.update_many({}, {"$set": {"nb_reponses": 0}})
+        lot: List[UpdateOne] = []
+        for ligne in descendants:
+            lot.append(
+                UpdateOne(
+                    {"commentaire_id": ligne["_id"]},
+                    {"$set": {"nb_reponses": ligne["nb_reponses"]}},
+                )
+            )
+            if len(lot) >= _TAILLE_LOT:
+                self._collection.bulk_write(lot, ordered=False)
+                lot = []
+        if lot:
+            self._collection.bulk_write(lot, ordered=False)
+
+
+# Instance partagée par les routes ; sans état propre, elle peut servir
+# tous les threads du worker.
+commentaire_service = CommentaireService()
+
+
+def construire_arbre(noeuds: Any) -> List[Dict[str, Any]]:
+    """Reconstruit l'arbre imbriqué (`reponses`) en O(n) à partir de commentaires à plat.
+
+    `noeuds` doit être trié par date : chaque liste de réponses garde
+    alors l'ordre chronologique. Un commentaire dont le parent est absent
+    (supprimé entre-temps) est ignoré.
+    """
+    return construire_racines(noeuds)
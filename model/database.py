@@ -1,8 +1,8 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import bcrypt
-from typing import List, Dict, Any, Optional
-from datetime import date
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import date, datetime
 from config import (
     DATABASE_URL,
     ADMIN_PSEUDO,
@@ -10,7 +10,15 @@ from config import (
     ADMIN_EMAIL,
     ADMIN_NOM,
     ADMIN_PRENOM,
+    DOUBLON_SEUIL,
+    NOTIFS_CACHE_TAILLE,
+    NOTIFS_CACHE_TTL,
 )
+from model.cache_utils import LRUCache
+from model.evenements import CANAL_EVENEMENTS, preparer_evenement
+
+# Photo de profil par défaut, partagée par tous les comptes : jamais supprimée.
+AVATAR_PAR_DEFAUT = "uploads/profils/default_avatar.png"
 
 # ----------------------------------------------------
 # 1. SQL — Modèle Physique de Données
@@ -77,6 +85,8 @@ CREATE TABLE IF NOT EXISTS PROPOSITION (
     date_proposition  TIMESTAMP NOT NULL DEFAULT NOW(),
     date_traitement   TIMESTAMP,
     notif_lue         BOOLEAN DEFAULT FALSE,
+    reserve_par       INTEGER,
+    reserve_jusqu_a   TIMESTAMP,
     FOREIGN KEY (fk_id_categorie)   REFERENCES CATEGORIE(id_categorie),
     FOREIGN KEY (fk_id_utilisateur) REFERENCES UTILISATEUR(id_utilisateur) ON DELETE CASCADE
 );
@@ -99,6 +109,104 @@ CREATE TABLE IF NOT EXISTS FAVORI (
     FOREIGN KEY (fk_id_utilisateur) REFERENCES UTILISATEUR(id_utilisateur) ON DELETE CASCADE,
     FOREIGN KEY (fk_id_objet)       REFERENCES OBJET_CELESTE(id_objet)     ON DELETE CASCADE
 );
+
+CREATE TABLE IF NOT EXISTS TRADUCTION (
+    hash_source      CHAR(64) NOT NULL,
+    langue_cible     TEXT NOT NULL,
+    texte_source     TEXT NOT NULL,
+    texte_traduit    TEXT NOT NULL,
+    date_creation    TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (hash_source, langue_cible)
+);
+
+-- Nettoyages hors PostgreSQL (MongoDB, fichiers) à appliquer après une
+-- suppression : écrits dans la même transaction que le DELETE, appliqués
+-- ensuite par nettoyer_outbox.py (model/nettoyage_outbox.py).
+CREATE TABLE IF NOT EXISTS NETTOYAGE_OUTBOX (
+    id_tache         BIGSERIAL PRIMARY KEY,
+    type_tache       TEXT NOT NULL CHECK (type_tache IN ('commentaires_objet', 'fichier')),
+    cible            TEXT NOT NULL,
+    tentatives       INTEGER NOT NULL DEFAULT 0,
+    derniere_erreur  TEXT,
+    date_creation    TIMESTAMP NOT NULL DEFAULT NOW(),
+    prochain_essai   TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_nettoyage_outbox_prochain_essai
+    ON NETTOYAGE_OUTBOX (prochain_essai);
+
+-- Propositions traitées depuis longtemps, déplacées par lots hors de
+-- PROPOSITION (archiver_propositions.py) : la table chaude ne garde que la
+-- file en attente et l'historique récent. Une partition par année de
+-- traitement, créée à la demande par archiver_propositions().
+CREATE TABLE IF NOT EXISTS PROPOSITION_ARCHIVE (
+    id_proposition    INTEGER NOT NULL,
+    nom_fr            TEXT NOT NULL,
+    nom_scientifique  TEXT,
+    description       TEXT NOT NULL,
+    url_image         TEXT,
+    fk_id_categorie   INTEGER NOT NULL,
+    fk_id_utilisateur INTEGER NOT NULL,
+    statut            TEXT NOT NULL,
+    commentaire_admin TEXT,
+    date_proposition  TIMESTAMP NOT NULL,
+    date_traitement   TIMESTAMP NOT NULL,
+    date_archivage    TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (date_traitement, id_proposition),
+    FOREIGN KEY (fk_id_categorie)   REFERENCES CATEGORIE(id_categorie),
+    FOREIGN KEY (fk_id_utilisateur) REFERENCES UTILISATEUR(id_utilisateur) ON DELETE CASCADE
+) PARTITION BY RANGE (date_traitement);
+CREATE INDEX IF NOT EXISTS idx_proposition_archive_utilisateur
+    ON PROPOSITION_ARCHIVE (fk_id_utilisateur, date_proposition DESC);
+CREATE INDEX IF NOT EXISTS idx_proposition_archive_date
+    ON PROPOSITION_ARCHIVE (date_proposition DESC, id_proposition DESC);
+
+-- Panneaux paginés du tableau de bord admin (pagination par clé, du plus
+-- récent au plus ancien) ; les clés étrangères ne sont pas indexées d'office.
+CREATE INDEX IF NOT EXISTS idx_objet_celeste_publication
+    ON OBJET_CELESTE (date_publication DESC, id_objet DESC);
+CREATE INDEX IF NOT EXISTS idx_proposition_statut_date
+    ON PROPOSITION (statut, date_proposition DESC, id_proposition DESC);
+CREATE INDEX IF NOT EXISTS idx_proposition_date
+    ON PROPOSITION (date_proposition DESC, id_proposition DESC);
+CREATE INDEX IF NOT EXISTS idx_proposition_utilisateur
+    ON PROPOSITION (fk_id_utilisateur);
+CREATE INDEX IF NOT EXISTS idx_proposition_traitement
+    ON PROPOSITION (date_traitement)
+    WHERE statut <> 'en_attente';
+-- Décisions pas encore vues par leur auteur (get_nb_notifs_non_lues)
+CREATE INDEX IF NOT EXISTS idx_proposition_notifs_non_lues
+    ON PROPOSITION (fk_id_utilisateur)
+    WHERE notif_lue = FALSE AND statut <> 'en_attente';
+-- Liste des comptes (get_utilisateurs_page) : les colonnes affichées sont
+-- incluses dans l'index, une page sans recherche se lit par un parcours
+-- d'index seul (remplace l'ancien index sans INCLUDE).
+DROP INDEX IF EXISTS idx_utilisateur_inscription;
+CREATE INDEX IF NOT EXISTS idx_utilisateur_inscription_couvrant
+    ON UTILISATEUR (date_inscription DESC, id_utilisateur DESC)
+    INCLUDE (pseudo, nom, prenom, email, genre, photo_profil, est_actif);
+-- Recherche de comptes par début de pseudo, email, prénom ou nom
+-- (get_utilisateurs_page) : text_pattern_ops sert LIKE 'abc%' quel que soit
+-- le collationnement.
+CREATE INDEX IF NOT EXISTS idx_utilisateur_pseudo_prefixe
+    ON UTILISATEUR (lower(pseudo) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_utilisateur_email_prefixe
+    ON UTILISATEUR (lower(email) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_utilisateur_prenom_prefixe
+    ON UTILISATEUR (lower(prenom) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_utilisateur_nom_prefixe
+    ON UTILISATEUR (lower(nom) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_saisir_objet
+    ON SAISIR (fk_id_objet);
+-- Textes du catalogue reconnus par /api/translate (get_textes_catalogue) :
+-- une description dépasse la taille maximale d'une entrée de B-tree.
+CREATE INDEX IF NOT EXISTS idx_objet_celeste_description_md5
+    ON OBJET_CELESTE (md5(description));
+
+-- Doublons sans pg_trgm (voir SIMILARITE_SQL) : égalité insensible à la casse.
+CREATE INDEX IF NOT EXISTS idx_objet_celeste_nom_lower
+    ON OBJET_CELESTE (lower(nom_fr));
+CREATE INDEX IF NOT EXISTS idx_objet_celeste_nom_scientifique_lower
+    ON OBJET_CELESTE (lower(nom_scientifique));
 """
 
 # Migration pour les BDD existantes
@@ -118,9 +226,54 @@ BEGIN
         WHERE table_name='objet_celeste' AND column_name='fk_id_utilisateur') THEN
         ALTER TABLE OBJET_CELESTE ADD COLUMN fk_id_utilisateur INTEGER
             REFERENCES UTILISATEUR(id_utilisateur) ON DELETE SET NULL; END IF;
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+        WHERE table_name='proposition' AND column_name='reserve_par') THEN
+        ALTER TABLE PROPOSITION ADD COLUMN reserve_par INTEGER,
+            ADD COLUMN reserve_jusqu_a TIMESTAMP; END IF;
 END$$;
+
+-- File de modération (reserver_propositions) : seules les propositions en
+-- attente y figurent, dans l'ordre où elles sont servies.
+CREATE INDEX IF NOT EXISTS idx_proposition_file_attente
+    ON PROPOSITION (date_proposition, id_proposition)
+    WHERE statut = 'en_attente';
+"""
+
+# Détection des doublons de propositions (chercher_doublons) : noms comparés
+# sans accents ni casse, par similarité de trigrammes. Les extensions
+# demandent des droits que la base n'accorde pas toujours : à défaut, la
+# détection se replie sur l'égalité des noms (index *_lower ci-dessus), la
+# recherche de comptes sur les préfixes (index *_prefixe).
+SIMILARITE_SQL: str = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() n'est pas IMMUTABLE (dictionnaire modifiable) : cette enveloppe
+-- fige le dictionnaire pour pouvoir indexer l'expression.
+CREATE OR REPLACE FUNCTION normaliser_nom(texte TEXT) RETURNS TEXT
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, texte)) $$;
+
+-- GiST plutôt que GIN : sert le tri par distance (<->), donc les k plus
+-- proches sans parcourir le catalogue.
+CREATE INDEX IF NOT EXISTS idx_objet_celeste_nom_trgm
+    ON OBJET_CELESTE USING gist (normaliser_nom(nom_fr) gist_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_objet_celeste_nom_scientifique_trgm
+    ON OBJET_CELESTE USING gist (normaliser_nom(nom_scientifique) gist_trgm_ops);
+
+-- Recherche de comptes dans tout le texte (get_utilisateurs_page) : GIN,
+-- fait pour filtrer par LIKE '%...%'. Même expression que _SQL_FICHE_UTILISATEUR.
+CREATE INDEX IF NOT EXISTS idx_utilisateur_fiche_trgm
+    ON UTILISATEUR USING gin (
+        normaliser_nom(pseudo || ' ' || prenom || ' ' || nom || ' ' || email) gin_trgm_ops
+    );
 """
 
+# Texte d'un compte cherché par l'administration, tel qu'indexé ci-dessus
+_SQL_FICHE_UTILISATEUR = (
+    "normaliser_nom(pseudo || ' ' || prenom || ' ' || nom || ' ' || email)"
+)
+
 # ----------------------------------------------------
 # 2. Connexion & Sécurité
 # ----------------------------------------------------
@@ -144,6 +297,16 @@ def create_tables() -> None:
             cur.execute(MIGRATE_SQL)
         conn.commit()
         print("✅ Tables créées avec succès.")
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SIMILARITE_SQL)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(
+                "⚠️ Sans pg_trgm/unaccent : doublons limités aux noms identiques, "
+                f"recherche de comptes par préfixes : {e}"
+            )
     except Exception as e:
         print(f"❌ Erreur création tables: {e}")
         conn.rollback()
@@ -267,6 +430,27 @@ def get_object_by_id(object_id: int) -> Optional[Dict[str, Any]]:
         conn.close()
 
 
+def get_noms_objets(objet_ids: List[int]) -> Dict[int, str]:
+    """Noms français d'une liste d'objets en UNE seule requête : {id_objet: nom_fr}."""
+    if not objet_ids:
+        return {}
+    conn = get_db_connection()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id_objet, nom_fr FROM OBJET_CELESTE WHERE id_objet = ANY(%s)",
+                (objet_ids,),
+            )
+            return {row[0]: row[1] for row in cur.fetchall()}
+    except Exception as e:
+        print(f"Erreur noms objets: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
 def search_celestial_objects(search_term: str) -> List[Dict[str, Any]]:
     conn = get_db_connection()
     if not conn:
@@ -423,6 +607,99 @@ def insert_solar_system_body(
         conn.close()
 
 
+def get_objets_admin_page(
+    limite: int,
+    apres: Optional[List[Any]] = None,
+    recherche: Optional[str] = None,
+    categorie_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Une page du catalogue pour l'administration, du plus récent au plus ancien.
+
+    Pagination par clé sur (date_publication, id_objet) : `apres` est la
+    clé de la dernière ligne de la page précédente. Renvoie jusqu'à
+    `limite + 1` lignes (la dernière signale une page suivante). Les
+    pseudos « saisi par » ne sont agrégés que pour les lignes de la page.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    if apres:
+        conditions.append("(o.date_publication, o.id_objet) < (%s::date, %s)")
+        params.extend(apres)
+    if recherche:
+        conditions.append("(o.nom_fr ILIKE %s OR o.nom_scientifique ILIKE %s)")
+        params.extend([f"%{recherche}%"] * 2)
+    if categorie_id:
+        conditions.append("o.fk_id_categorie = %s")
+        params.append(categorie_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = get_db_connection()
+    if not conn:
+        return []
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                f"""
+                SELECT o.id_objet, o.nom_fr, o.date_publication, c.nom_categorie,
+                       s.saisi_par
+                FROM (
+                    SELECT o.* FROM OBJET_CELESTE o {where}
+                    ORDER BY o.date_publication DESC, o.id_objet DESC
+                    LIMIT %s
+                ) o
+                JOIN CATEGORIE c ON c.id_categorie = o.fk_id_categorie
+                LEFT JOIN LATERAL (
+                    SELECT STRING_AGG(DISTINCT a.pseudo, ', ') AS saisi_par
+                    FROM SAISIR s
+                    JOIN ADMINISTRATEUR a ON a.id_admin = s.fk_id_admin
+                    WHERE s.fk_id_objet = o.id_objet
+                ) s ON TRUE
+                ORDER BY o.date_publication DESC, o.id_objet DESC
+            """,
+                params + [limite + 1],
+            )
+            return cur.fetchall()
+    except Exception as e:
+        print(f"❌ Erreur page catalogue admin : {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def delete_celestial_object(object_id: int) -> bool:
+    """Supprime un objet céleste et planifie, dans la même transaction, le
+    nettoyage de ses commentaires MongoDB et de son image si plus rien ne
+    la référence (voir NETTOYAGE_OUTBOX).
+
+    Renvoie False si l'objet n'existe pas ou en cas d'erreur.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return False
+    try:
+        with conn.cursor() as cur:
+            # SAISIR n'a pas de ON DELETE CASCADE : l'historique de saisie
+            # bloquerait sinon la suppression.
+            cur.execute("DELETE FROM SAISIR WHERE fk_id_objet=%s", (object_id,))
+            cur.execute(
+                "DELETE FROM OBJET_CELESTE WHERE id_objet=%s RETURNING url_image",
+                (object_id,),
+            )
+            row = cur.fetchone()
+            if row is None:
+                conn.rollback()
+                return False
+            _planifier_nettoyage(cur, "commentaires_objet", str(object_id))
+            _planifier_fichier_orphelin(cur, row[0])
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"❌ Erreur suppression objet {object_id} : {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
 # ----------------------------------------------------
 # 4. CRUD Administrateurs
 # ----------------------------------------------------
@@ -448,6 +725,80 @@ def get_admin_by_pseudo(identifiant: str) -> Optional[Dict[str, Any]]:
         conn.close()
 
 
+def get_admins_page(
+    limite: int, apres_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Administrateurs par identifiant croissant, `limite + 1` au plus, après `apres_id`."""
+    conn = get_db_connection()
+    if not conn:
+        return []
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                SELECT id_admin, pseudo, COALESCE(nom, '') AS nom,
+                       COALESCE(prenom, '') AS prenom, COALESCE(email, '') AS email
+                FROM ADMINISTRATEUR
+                WHERE id_admin > %s
+                ORDER BY id_admin
+                LIMIT %s
+            """,
+                (apres_id or 0, limite + 1),
+            )
+            return cur.fetchall()
+    except Exception as e:
+        print(f"❌ Erreur page administrateurs : {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def get_resume_admin() -> Dict[str, Any]:
+    """En-tête du tableau de bord admin, en une seule requête.
+
+    Un agrégat FILTER par table lue (chaque table n'est parcourue qu'une
+    fois) : propositions en attente et décisions pas encore vues par leur
+    auteur, objets, comptes et comptes actifs, administrateurs ; plus la
+    liste des catégories pour le filtre du catalogue. Renvoie {} en cas
+    d'erreur.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                WITH propositions AS (
+                    SELECT COUNT(*) FILTER (WHERE statut = 'en_attente') AS nb_en_attente,
+                           COUNT(*) FILTER (
+                               WHERE statut <> 'en_attente' AND notif_lue = FALSE
+                           ) AS nb_notifs_non_lues
+                    FROM PROPOSITION
+                ),
+                utilisateurs AS (
+                    SELECT COUNT(*) AS nb_utilisateurs,
+                           COUNT(*) FILTER (WHERE est_actif) AS nb_utilisateurs_actifs
+                    FROM UTILISATEUR
+                )
+                SELECT p.nb_en_attente, p.nb_notifs_non_lues,
+                       u.nb_utilisateurs, u.nb_utilisateurs_actifs,
+                       (SELECT COUNT(*) FROM OBJET_CELESTE) AS nb_objets,
+                       (SELECT COUNT(*) FROM ADMINISTRATEUR) AS nb_admins,
+                       (SELECT COALESCE(json_agg(json_build_object(
+                                   'id_categorie', id_categorie,
+                                   'nom_categorie', nom_categorie
+                               ) ORDER BY nom_categorie), '[]')
+                        FROM CATEGORIE) AS categories
+                FROM propositions p, utilisateurs u
+            """)
+            return dict(cur.fetchone())
+    except Exception as e:
+        print(f"❌ Erreur résumé admin : {e}")
+        return {}
+    finally:
+        conn.close()
+
+
 # ----------------------------------------------------
 # 5. CRUD Utilisateurs
 # ----------------------------------------------------
@@ -571,7 +922,27 @@ def delete_utilisateur(user_id: int) -> bool:
         return False
     try:
         with conn.cursor() as cur:
-            cur.execute("DELETE FROM UTILISATEUR WHERE id_utilisateur=%s", (user_id,))
+            # Propositions supprimées explicitement (plutôt que par la
+            # cascade) pour récupérer leurs images dans la même transaction.
+            cur.execute(
+                "DELETE FROM PROPOSITION WHERE fk_id_utilisateur=%s RETURNING url_image",
+                (user_id,),
+            )
+            fichiers = [row[0] for row in cur.fetchall()]
+            cur.execute(
+                "DELETE FROM PROPOSITION_ARCHIVE WHERE fk_id_utilisateur=%s RETURNING url_image",
+                (user_id,),
+            )
+            fichiers += [row[0] for row in cur.fetchall()]
+            cur.execute(
+                "DELETE FROM UTILISATEUR WHERE id_utilisateur=%s RETURNING photo_profil",
+                (user_id,),
+            )
+            row = cur.fetchone()
+            if row:
+                fichiers.append(row[0])
+            for chemin in fichiers:
+                _planifier_fichier_orphelin(cur, chemin)
         conn.commit()
         return True
     except Exception as e:
@@ -602,22 +973,87 @@ def update_utilisateur_password(user_id: int, new_password: str) -> bool:
         conn.close()
 
 
-def get_all_utilisateurs() -> List[Dict[str, Any]]:
-    """Pour le dashboard admin."""
+def get_utilisateurs_page(
+    limite: int,
+    apres: Optional[List[Any]] = None,
+    recherche: Optional[str] = None,
+    ordre: str = "desc",
+) -> List[Dict[str, Any]]:
+    """Une page des comptes pour l'administration, par date d'inscription.
+
+    Pagination par clé sur (date_inscription, id_utilisateur), `limite + 1`
+    lignes au plus, des plus récents aux plus anciens (`ordre` 'desc') ou
+    l'inverse ('asc') ; le nombre de propositions n'est compté que pour les
+    comptes de la page. Les colonnes lues sont celles de l'index couvrant
+    idx_utilisateur_inscription_couvrant.
+
+    `recherche` trouve les comptes dont le pseudo, l'email, le prénom ou le
+    nom commence par le texte saisi ; à partir de 3 caractères, le texte
+    peut figurer n'importe où (« dupont », « @gmail », « jean dup »), sans
+    accents ni casse, grâce à l'index de trigrammes de SIMILARITE_SQL. Sans
+    pg_trgm, la recherche se replie sur les débuts de champ.
+    """
+    sens, comparaison = ("ASC", ">") if ordre == "asc" else ("DESC", "<")
+    conditions: List[str] = []
+    params: Dict[str, Any] = {"limite": limite + 1}
+    if apres:
+        conditions.append(
+            f"(u.date_inscription, u.id_utilisateur) {comparaison} "
+            "(%(apres_date)s::timestamp, %(apres_id)s)"
+        )
+        params.update(apres_date=apres[0], apres_id=apres[1])
+    filtres: List[Optional[str]] = [None]
+    if recherche:
+        # Caractères spéciaux de LIKE saisis par l'admin : pris littéralement
+        texte = recherche.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.update(texte=texte, prefixe=texte.lower() + "%")
+        filtres = [
+            """(lower(u.pseudo) LIKE %(prefixe)s OR lower(u.email) LIKE %(prefixe)s
+                OR lower(u.prenom) LIKE %(prefixe)s OR lower(u.nom) LIKE %(prefixe)s)"""
+        ]
+        # En deçà de 3 caractères, un trigramme ne filtre rien : préfixes seuls
+        if len(recherche) >= 3:
+            filtres.insert(
+                0,
+                f"{_SQL_FICHE_UTILISATEUR} LIKE '%%' || normaliser_nom(%(texte)s) || '%%'",
+            )
+
+    def requete(filtre: Optional[str]) -> str:
+        clauses = conditions + ([filtre] if filtre else [])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"""
+            SELECT u.id_utilisateur, u.pseudo, u.nom, u.prenom, u.email,
+                   u.genre, u.photo_profil, u.date_inscription, u.est_actif,
+                   p.nb_propositions
+            FROM (
+                SELECT u.id_utilisateur, u.pseudo, u.nom, u.prenom, u.email,
+                       u.genre, u.photo_profil, u.date_inscription, u.est_actif
+                FROM UTILISATEUR u {where}
+                ORDER BY u.date_inscription {sens}, u.id_utilisateur {sens}
+                LIMIT %(limite)s
+            ) u
+            CROSS JOIN LATERAL (
+                SELECT (SELECT COUNT(*) FROM PROPOSITION
+                        WHERE fk_id_utilisateur = u.id_utilisateur)
+                     + (SELECT COUNT(*) FROM PROPOSITION_ARCHIVE
+                        WHERE fk_id_utilisateur = u.id_utilisateur)
+                       AS nb_propositions
+            ) p
+            ORDER BY u.date_inscription {sens}, u.id_utilisateur {sens}
+        """
+
     conn = get_db_connection()
     if not conn:
         return []
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                SELECT u.id_utilisateur, u.pseudo, u.nom, u.prenom, u.email,
-                       u.genre, u.photo_profil, u.date_inscription, u.est_actif,
-                       COUNT(p.id_proposition) AS nb_propositions
-                FROM UTILISATEUR u
-                LEFT JOIN PROPOSITION p ON p.fk_id_utilisateur = u.id_utilisateur
-                GROUP BY u.id_utilisateur
-                ORDER BY u.date_inscription DESC
-            """)
+            try:
+                cur.execute(requete(filtres[0]), params)
+            except psycopg2.errors.UndefinedFunction:
+                if len(filtres) == 1:
+                    raise
+                conn.rollback()
+                cur.execute(requete(filtres[1]), params)
             return cur.fetchall()
     except Exception as e:
         print(f"Erreur liste utilisateurs: {e}")
@@ -626,6 +1062,30 @@ def get_all_utilisateurs() -> List[Dict[str, Any]]:
         conn.close()
 
 
+def basculer_utilisateur(user_id: int) -> Optional[Dict[str, Any]]:
+    """Active ou désactive un compte ; renvoie son nouvel état (`est_actif`,
+    `pseudo`), None s'il n'existe pas ou en cas d'erreur."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """UPDATE UTILISATEUR SET est_actif = NOT est_actif
+                   WHERE id_utilisateur = %s RETURNING est_actif, pseudo""",
+                (user_id,),
+            )
+            compte = cur.fetchone()
+        conn.commit()
+        return compte
+    except Exception as e:
+        print(f"❌ Erreur activation du compte : {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
 def count_utilisateurs() -> int:
     """Nombre total d'utilisateurs inscrits (pour affichage public)."""
     conn = get_db_connection()
@@ -682,22 +1142,71 @@ def create_proposition(
         conn.close()
 
 
-def get_all_propositions() -> List[Dict[str, Any]]:
+# Colonnes communes à PROPOSITION et PROPOSITION_ARCHIVE.
+_COLONNES_PROPOSITION = """id_proposition, nom_fr, nom_scientifique, description, url_image,
+           fk_id_categorie, fk_id_utilisateur, statut, commentaire_admin,
+           date_proposition, date_traitement"""
+
+
+def _source_propositions(historique: bool) -> str:
+    """Propositions à lire : la table chaude seule, ou avec l'archive quand
+    l'historique complet est demandé (colonne `archivee` pour les distinguer)."""
+    if not historique:
+        return "PROPOSITION"
+    return f"""(
+        SELECT {_COLONNES_PROPOSITION}, notif_lue, reserve_par, reserve_jusqu_a,
+               FALSE AS archivee
+        FROM PROPOSITION
+        UNION ALL
+        SELECT {_COLONNES_PROPOSITION}, TRUE, NULL::int, NULL::timestamp, TRUE
+        FROM PROPOSITION_ARCHIVE
+    )"""
+
+
+def get_propositions_page(
+    limite: int,
+    apres: Optional[List[Any]] = None,
+    statut: Optional[str] = None,
+    historique: bool = False,
+) -> List[Dict[str, Any]]:
+    """Une page des propositions pour la modération, de la plus récente à la plus ancienne.
+
+    `statut` : 'en_attente', 'traitees' (tous les autres statuts) ou None
+    (toutes). `historique` : inclure PROPOSITION_ARCHIVE (sans effet sur la
+    file en attente, jamais archivée). Pagination par clé sur
+    (date_proposition, id_proposition), `limite + 1` lignes au plus.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    if statut == "en_attente":
+        conditions.append("p.statut = 'en_attente'")
+    elif statut == "traitees":
+        conditions.append("p.statut <> 'en_attente'")
+    if apres:
+        conditions.append(
+            "(p.date_proposition, p.id_proposition) < (%s::timestamp, %s)"
+        )
+        params.extend(apres)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
     conn = get_db_connection()
     if not conn:
         return []
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
+            cur.execute(
+                f"""
                 SELECT p.*, c.nom_categorie,
-                       u.pseudo, u.prenom, u.nom AS nom_user, u.photo_profil
-                FROM PROPOSITION p
+                       u.pseudo, u.prenom, u.nom AS nom_user, u.photo_profil,
+                       COALESCE(p.reserve_jusqu_a > NOW(), FALSE) AS reservation_active
+                FROM {_source_propositions(historique and statut != "en_attente")} p
                 JOIN CATEGORIE c ON p.fk_id_categorie = c.id_categorie
                 JOIN UTILISATEUR u ON p.fk_id_utilisateur = u.id_utilisateur
-                ORDER BY
-                    CASE p.statut WHEN 'en_attente' THEN 0 ELSE 1 END,
-                    p.date_proposition DESC
-            """)
+                {where}
+                ORDER BY p.date_proposition DESC, p.id_proposition DESC
+                LIMIT %s
+            """,
+                params + [limite + 1],
+            )
             return cur.fetchall()
     except Exception as e:
         print(f"Erreur propositions: {e}")
@@ -706,26 +1215,291 @@ def get_all_propositions() -> List[Dict[str, Any]]:
         conn.close()
 
 
-def get_propositions_by_user(user_id: int) -> List[Dict[str, Any]]:
+# Objets du catalogue les plus proches de p.nom_fr / p.nom_scientifique, à
+# utiliser en LATERAL : les k voisins de chaque nom par les index GiST, puis
+# score = meilleure similarité (0 à 1) des deux noms.
+_SQL_PROCHES_TRIGRAMMES = """
+    SELECT o.id_objet, o.nom_fr, o.nom_scientifique,
+           GREATEST(
+               similarity(normaliser_nom(o.nom_fr), normaliser_nom(p.nom_fr)),
+               COALESCE(similarity(normaliser_nom(o.nom_scientifique),
+                                   normaliser_nom(p.nom_scientifique)), 0)
+           ) AS score
+    FROM (
+        (SELECT id_objet FROM OBJET_CELESTE
+         ORDER BY normaliser_nom(nom_fr) <-> normaliser_nom(p.nom_fr)
+         LIMIT %(k)s)
+        UNION
+        (SELECT id_objet FROM OBJET_CELESTE
+         WHERE p.nom_scientifique <> ''
+         ORDER BY normaliser_nom(nom_scientifique) <-> normaliser_nom(p.nom_scientifique)
+         LIMIT %(k)s)
+    ) candidats
+    JOIN OBJET_CELESTE o USING (id_objet)
+    ORDER BY score DESC
+    LIMIT %(k)s
+"""
+
+# Repli sans pg_trgm / unaccent : mêmes colonnes, noms égaux à la casse près.
+_SQL_PROCHES_EXACTS = """
+    SELECT o.id_objet, o.nom_fr, o.nom_scientifique, 1.0::real AS score
+    FROM OBJET_CELESTE o
+    WHERE lower(o.nom_fr) = lower(p.nom_fr)
+       OR lower(o.nom_scientifique) = lower(NULLIF(p.nom_scientifique, ''))
+    LIMIT %(k)s
+"""
+
+
+def _executer_doublons(
+    conn, gabarit: str, params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Exécute `gabarit`, dont {proches} reçoit la sous-requête des objets proches."""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        try:
+            cur.execute(gabarit.format(proches=_SQL_PROCHES_TRIGRAMMES), params)
+        except psycopg2.errors.UndefinedFunction:
+            conn.rollback()
+            cur.execute(gabarit.format(proches=_SQL_PROCHES_EXACTS), params)
+        return cur.fetchall()
+
+
+def chercher_doublons(
+    nom_fr: str,
+    nom_scientifique: Optional[str] = None,
+    limite: int = 3,
+    seuil: float = DOUBLON_SEUIL,
+) -> List[Dict[str, Any]]:
+    """Objets du catalogue qui ressemblent à une proposition, du plus proche au moins proche.
+
+    Chaque objet porte un `score` de 0 à 1 (1 : même nom aux accents et à
+    la casse près) ; seuls ceux à `seuil` ou plus sont renvoyés.
+    """
     conn = get_db_connection()
     if not conn:
         return []
+    try:
+        return _executer_doublons(
+            conn,
+            """
+            SELECT d.*
+            FROM (SELECT %(nom_fr)s::text AS nom_fr,
+                         %(nom_scientifique)s::text AS nom_scientifique) p
+            CROSS JOIN LATERAL ({proches}) d
+            WHERE d.score >= %(seuil)s
+            ORDER BY d.score DESC
+        """,
+            {
+                "nom_fr": nom_fr,
+                "nom_scientifique": nom_scientifique or "",
+                "k": limite,
+                "seuil": seuil,
+            },
+        )
+    except Exception as e:
+        print(f"❌ Erreur recherche de doublons : {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def get_doublons_propositions(
+    ids: List[int], seuil: float = DOUBLON_SEUIL
+) -> Dict[int, Dict[str, Any]]:
+    """Pour la modération : {id_proposition: objet du catalogue le plus proche}.
+
+    Une requête pour toute une page de propositions ; celles sans objet
+    assez proche (score < `seuil`) sont absentes.
+    """
+    if not ids:
+        return {}
+    conn = get_db_connection()
+    if not conn:
+        return {}
+    try:
+        lignes = _executer_doublons(
+            conn,
+            """
+            SELECT p.id_proposition, d.*
+            FROM PROPOSITION p
+            CROSS JOIN LATERAL ({proches}) d
+            WHERE p.id_proposition = ANY(%(ids)s) AND d.score >= %(seuil)s
+        """,
+            {"ids": list(ids), "k": 1, "seuil": seuil},
+        )
+        return {ligne.pop("id_proposition"): ligne for ligne in lignes}
+    except Exception as e:
+        print(f"❌ Erreur doublons des propositions : {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def _dates_json(lignes: List[Dict[str, Any]], *champs: str) -> List[Dict[str, Any]]:
+    """Relit en datetime les dates sérialisées par json_agg (chaînes ISO)."""
+    for ligne in lignes:
+        for champ in champs:
+            if ligne.get(champ):
+                ligne[champ] = datetime.fromisoformat(ligne[champ])
+    return lignes
+
+
+def get_tableau_de_bord_utilisateur(
+    user_id: int,
+    limite: int,
+    apres: Optional[List[Any]] = None,
+    historique: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Tout « Mon espace » en une requête : profil, décompte des propositions
+    par statut (archive comprise), une page de propositions et les favoris.
+
+    Renvoie {"user", "stats", "propositions", "favoris"} ou None (compte
+    absent, erreur). Les propositions sont paginées par clé sur
+    (date_proposition, id_proposition), `limite + 1` au plus ; l'archive
+    n'y figure que si `historique`. `stats["nb_notifs_non_lues"]` dit s'il
+    y a des décisions à marquer comme vues.
+    """
+    condition = ""
+    params: Dict[str, Any] = {"id": user_id, "limite": limite + 1}
+    if apres:
+        condition = "AND (p.date_proposition, p.id_proposition) < (%(date)s::timestamp, %(apres_id)s)"
+        params.update(date=apres[0], apres_id=apres[1])
+    conn = get_db_connection()
+    if not conn:
+        return None
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                f"""
+                SELECT u.id_utilisateur, u.pseudo, u.nom, u.prenom, u.email, u.genre,
+                       u.photo_profil, u.date_inscription, u.est_actif,
+                       s.total, s.en_attente, s.acceptes, s.refuses,
+                       s.nb_notifs_non_lues, s.nb_archivees,
+                       COALESCE((
+                           SELECT json_agg(p ORDER BY p.date_proposition DESC, p.id_proposition DESC)
+                           FROM (
+                               SELECT p.*, c.nom_categorie
+                               FROM {_source_propositions(historique)} p
+                               JOIN CATEGORIE c ON p.fk_id_categorie = c.id_categorie
+                               WHERE p.fk_id_utilisateur = u.id_utilisateur {condition}
+                               ORDER BY p.date_proposition DESC, p.id_proposition DESC
+                               LIMIT %(limite)s
+                           ) p
+                       ), '[]') AS propositions,
+                       COALESCE((
+                           SELECT json_agg(f ORDER BY f.date_ajout DESC)
+                           FROM (
+                               SELECT o.id_objet, o.nom_fr, o.nom_scientifique,
+                                      LEFT(o.description, 150) AS extrait_description,
+                                      o.url_image, o.date_publication, c.nom_categorie,
+                                      f.date_ajout, a.pseudo AS auteur_pseudo
+                               FROM FAVORI f
+                               JOIN OBJET_CELESTE o ON f.fk_id_objet = o.id_objet
+                               JOIN CATEGORIE c ON o.fk_id_categorie = c.id_categorie
+                               LEFT JOIN UTILISATEUR a ON o.fk_id_utilisateur = a.id_utilisateur
+                               WHERE f.fk_id_utilisateur = u.id_utilisateur
+                           ) f
+                       ), '[]') AS favoris
+                FROM UTILISATEUR u
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) AS total,
+                           COUNT(*) FILTER (WHERE statut = 'en_attente') AS en_attente,
+                           COUNT(*) FILTER (WHERE statut IN ('accepte', 'modifie')) AS acceptes,
+                           COUNT(*) FILTER (WHERE statut = 'refuse') AS refuses,
+                           COUNT(*) FILTER (WHERE NOT notif_lue AND statut <> 'en_attente')
+                               AS nb_notifs_non_lues,
+                           COUNT(*) FILTER (WHERE archivee) AS nb_archivees
+                    FROM (
+                        SELECT statut, notif_lue, FALSE AS archivee FROM PROPOSITION
+                        WHERE fk_id_utilisateur = u.id_utilisateur
+                        UNION ALL
+                        SELECT statut, TRUE, TRUE FROM PROPOSITION_ARCHIVE
+                        WHERE fk_id_utilisateur = u.id_utilisateur
+                    ) x
+                ) s
+                WHERE u.id_utilisateur = %(id)s
+            """,
+                params,
+            )
+            ligne = cur.fetchone()
+            if not ligne:
+                return None
+            stats = {
+                champ: ligne.pop(champ)
+                for champ in (
+                    "total",
+                    "en_attente",
+                    "acceptes",
+                    "refuses",
+                    "nb_notifs_non_lues",
+                    "nb_archivees",
+                )
+            }
+            propositions = _dates_json(
+                ligne.pop("propositions"), "date_proposition", "date_traitement"
+            )
+            favoris = _dates_json(ligne.pop("favoris"), "date_ajout")
+            return {
+                "user": ligne,
+                "stats": stats,
+                "propositions": propositions,
+                "favoris": favoris,
+            }
+    except Exception as e:
+        print(f"Erreur tableau de bord utilisateur : {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def archiver_propositions(age_jours: int, taille_lot: int) -> int:
+    """Déplace vers PROPOSITION_ARCHIVE un lot de propositions traitées il y a
+    plus de `age_jours` jours, les plus anciennes d'abord ; renvoie leur nombre.
+
+    Suppression et copie dans la même transaction ; les partitions annuelles
+    manquantes sont créées au passage. SKIP LOCKED : un lot ne bloque ni la
+    modération ni un autre archivage en cours.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return 0
+    try:
+        with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT p.*, c.nom_categorie
-                FROM PROPOSITION p
-                JOIN CATEGORIE c ON p.fk_id_categorie = c.id_categorie
-                WHERE p.fk_id_utilisateur = %s
-                ORDER BY p.date_proposition DESC
+                SELECT id_proposition, date_traitement FROM PROPOSITION
+                WHERE statut <> 'en_attente'
+                  AND date_traitement < NOW() - %s * INTERVAL '1 day'
+                ORDER BY date_traitement
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
             """,
-                (user_id,),
+                (age_jours, taille_lot),
             )
-            return cur.fetchall()
+            lot = cur.fetchall()
+            for annee in sorted({date_traitement.year for _, date_traitement in lot}):
+                cur.execute(f"""
+                    CREATE TABLE IF NOT EXISTS PROPOSITION_ARCHIVE_{annee:d}
+                    PARTITION OF PROPOSITION_ARCHIVE
+                    FOR VALUES FROM ('{annee:d}-01-01') TO ('{annee + 1:d}-01-01')
+                """)
+            cur.execute(
+                f"""
+                WITH deplacees AS (
+                    DELETE FROM PROPOSITION WHERE id_proposition = ANY(%s)
+                    RETURNING {_COLONNES_PROPOSITION}
+                )
+                INSERT INTO PROPOSITION_ARCHIVE ({_COLONNES_PROPOSITION})
+                SELECT {_COLONNES_PROPOSITION} FROM deplacees
+            """,
+                ([id_proposition for id_proposition, _ in lot],),
+            )
+            archivees = cur.rowcount
+        conn.commit()
+        return archivees
     except Exception as e:
-        print(f"Erreur propositions user: {e}")
-        return []
+        print(f"❌ Erreur archivage des propositions : {e}")
+        conn.rollback()
+        return 0
     finally:
         conn.close()
 
@@ -739,22 +1513,59 @@ def traiter_proposition(
     description: str = None,
     id_categorie: int = None,
     admin_id: int = None,
-) -> bool:
+) -> Optional[str]:
+    """Décision unitaire sur une proposition encore en attente.
+
+    Mêmes règles que traiter_propositions_lot : une proposition réservée
+    par un autre admin (bail en cours) n'est pas touchée. Renvoie
+    'traitee', 'reservee', 'deja_traitee' ou 'introuvable' ; None si
+    erreur (rien n'est alors enregistré).
+    """
     conn = get_db_connection()
     if not conn:
-        return False
+        return None
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
                 """
                 UPDATE PROPOSITION SET statut=%s, commentaire_admin=%s,
-                date_traitement=NOW(), notif_lue=FALSE
+                date_traitement=NOW(), notif_lue=FALSE,
+                reserve_par=NULL, reserve_jusqu_a=NULL
                 WHERE id_proposition=%s
+                  AND statut = 'en_attente'
+                  AND (reserve_jusqu_a IS NULL OR reserve_jusqu_a <= NOW()
+                       OR reserve_par IS NOT DISTINCT FROM %s)
                 RETURNING *
             """,
-                (statut, commentaire, id_proposition),
+                (statut, commentaire, id_proposition, admin_id),
             )
             prop = cur.fetchone()
+            if not prop:
+                cur.execute(
+                    "SELECT statut FROM PROPOSITION WHERE id_proposition = %s",
+                    (id_proposition,),
+                )
+                actuelle = cur.fetchone()
+                if not actuelle:
+                    return "introuvable"
+                if actuelle["statut"] == "en_attente":
+                    return "reservee"
+                return "deja_traitee"
+
+            # Délivré par PostgreSQL au commit seulement (flux SSE de l'auteur)
+            cur.execute(
+                "SELECT pg_notify(%s, %s)",
+                (
+                    CANAL_EVENEMENTS,
+                    preparer_evenement(
+                        prop["fk_id_utilisateur"],
+                        "proposition",
+                        id_proposition=id_proposition,
+                        statut=statut,
+                        nom_fr=prop["nom_fr"],
+                    ),
+                ),
+            )
 
             if statut in ("accepte", "modifie"):
                 cur.execute(
@@ -788,11 +1599,222 @@ def traiter_proposition(
                         (admin_id, nouvel_objet["id_objet"]),
                     )
         conn.commit()
-        return True
+        # Nouvelle décision à voir : recompté au prochain affichage
+        _notifs_non_lues.delete(prop["fk_id_utilisateur"])
+        return "traitee"
     except Exception as e:
         print(f"❌ Erreur traitement proposition : {e}")
         conn.rollback()
-        return False
+        return None
+    finally:
+        conn.close()
+
+
+def traiter_propositions_lot(
+    decisions: List[Tuple[int, str, str]], admin_id: int = None
+) -> Optional[List[Dict[str, Any]]]:
+    """Accepte ou refuse plusieurs propositions en une transaction.
+
+    `decisions` : liste de (id_proposition, statut, commentaire), statut
+    'accepte' ou 'refuse' (« modifié » reste une décision unitaire). Une
+    seule requête : mise à jour des propositions encore en attente,
+    publication des acceptées (un objet par nom, ON CONFLICT comme
+    traiter_proposition) et traçage dans SAISIR.
+
+    Renvoie un résultat par proposition, dans l'ordre reçu :
+    'publiee' (avec id_objet), 'doublon' (acceptée, nom déjà au
+    catalogue), 'refusee', 'reservee' (en cours chez un autre admin, voir
+    reserver_propositions), 'deja_traitee' ou 'introuvable'. None si
+    erreur (rien n'est alors enregistré). L'auteur de chaque proposition
+    traitée reçoit un événement « proposition » au commit (NOTIFY).
+    """
+    uniques = {}
+    for id_proposition, statut, commentaire in decisions:
+        uniques.setdefault(id_proposition, (statut, commentaire))
+    if not uniques:
+        return []
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                WITH d AS (
+                    SELECT * FROM unnest(%s::int[], %s::text[], %s::text[])
+                        WITH ORDINALITY AS d(id_proposition, statut, commentaire, rang)
+                ),
+                maj AS (
+                    UPDATE PROPOSITION p
+                    SET statut = d.statut, commentaire_admin = d.commentaire,
+                        date_traitement = NOW(), notif_lue = FALSE,
+                        reserve_par = NULL, reserve_jusqu_a = NULL
+                    FROM d
+                    WHERE p.id_proposition = d.id_proposition
+                      AND p.statut = 'en_attente'
+                      AND (p.reserve_jusqu_a IS NULL OR p.reserve_jusqu_a <= NOW()
+                           OR p.reserve_par IS NOT DISTINCT FROM %s)
+                    RETURNING p.*
+                ),
+                choisies AS (
+                    SELECT DISTINCT ON (nom_fr) *
+                    FROM maj
+                    WHERE statut = 'accepte'
+                    ORDER BY nom_fr, id_proposition
+                ),
+                publies AS (
+                    INSERT INTO OBJET_CELESTE
+                    (nom_fr, nom_scientifique, description, url_image,
+                     date_publication, fk_id_categorie, fk_id_utilisateur)
+                    SELECT nom_fr, nom_scientifique, description, url_image,
+                           CURRENT_DATE, fk_id_categorie, fk_id_utilisateur
+                    FROM choisies
+                    ON CONFLICT (nom_fr) DO NOTHING
+                    RETURNING id_objet, nom_fr
+                ),
+                saisies AS (
+                    INSERT INTO SAISIR (fk_id_admin, fk_id_objet, date_saisie)
+                    SELECT %s, id_objet, NOW() FROM publies
+                    WHERE %s::int IS NOT NULL
+                    ON CONFLICT (fk_id_admin, fk_id_objet)
+                    DO UPDATE SET date_saisie = NOW()
+                )
+                SELECT d.id_proposition,
+                       CASE
+                           WHEN maj.id_proposition IS NULL AND p.id_proposition IS NULL
+                               THEN 'introuvable'
+                           WHEN maj.id_proposition IS NULL AND p.statut = 'en_attente'
+                               THEN 'reservee'
+                           WHEN maj.id_proposition IS NULL THEN 'deja_traitee'
+                           WHEN maj.statut = 'refuse' THEN 'refusee'
+                           WHEN pub.id_objet IS NULL THEN 'doublon'
+                           ELSE 'publiee'
+                       END AS resultat,
+                       pub.id_objet,
+                       maj.fk_id_utilisateur,
+                       maj.nom_fr
+                FROM d
+                LEFT JOIN PROPOSITION p ON p.id_proposition = d.id_proposition
+                LEFT JOIN maj ON maj.id_proposition = d.id_proposition
+                LEFT JOIN choisies c ON c.id_proposition = d.id_proposition
+                LEFT JOIN publies pub ON pub.nom_fr = c.nom_fr
+                ORDER BY d.rang
+            """,
+                (
+                    list(uniques),
+                    [statut for statut, _ in uniques.values()],
+                    [commentaire for _, commentaire in uniques.values()],
+                    admin_id,
+                    admin_id,
+                    admin_id,
+                ),
+            )
+            resultats = cur.fetchall()
+            evenements = [
+                preparer_evenement(
+                    r["fk_id_utilisateur"],
+                    "proposition",
+                    id_proposition=r["id_proposition"],
+                    statut="refuse" if r["resultat"] == "refusee" else "accepte",
+                    nom_fr=r["nom_fr"],
+                )
+                for r in resultats
+                if r["fk_id_utilisateur"] is not None
+            ]
+            if evenements:
+                cur.execute(
+                    "SELECT pg_notify(%s, evenement) FROM unnest(%s::text[]) AS evenement",
+                    (CANAL_EVENEMENTS, evenements),
+                )
+        conn.commit()
+        for resultat in resultats:
+            if resultat["fk_id_utilisateur"] is not None:
+                _notifs_non_lues.delete(resultat["fk_id_utilisateur"])
+        return resultats
+    except Exception as e:
+        print(f"❌ Erreur traitement des propositions par lot : {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+def reserver_propositions(
+    admin_id: int, limite: int, bail_secondes: int
+) -> List[Dict[str, Any]]:
+    """Réserve pour `admin_id` les prochaines propositions en attente, les plus anciennes d'abord.
+
+    Renvoie au plus `limite` propositions, celles que l'admin tient déjà
+    comprises (leur réservation est prolongée) : les autres admins ne les
+    voient plus dans leur file pendant `bail_secondes`. SKIP LOCKED laisse
+    deux admins réserver en même temps sans s'attendre ni prendre les
+    mêmes lignes ; une réservation échue redevient libre d'elle-même.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return []
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                WITH reservees AS (
+                    UPDATE PROPOSITION
+                    SET reserve_par = %s,
+                        reserve_jusqu_a = NOW() + %s * INTERVAL '1 second'
+                    WHERE id_proposition IN (
+                        SELECT id_proposition FROM PROPOSITION
+                        WHERE statut = 'en_attente'
+                          AND (reserve_jusqu_a IS NULL OR reserve_jusqu_a <= NOW()
+                               OR reserve_par = %s)
+                        ORDER BY date_proposition, id_proposition
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING *
+                )
+                SELECT p.*, c.nom_categorie,
+                       u.pseudo, u.prenom, u.nom AS nom_user, u.photo_profil,
+                       TRUE AS reservation_active
+                FROM reservees p
+                JOIN CATEGORIE c ON p.fk_id_categorie = c.id_categorie
+                JOIN UTILISATEUR u ON p.fk_id_utilisateur = u.id_utilisateur
+                ORDER BY p.date_proposition, p.id_proposition
+            """,
+                (admin_id, bail_secondes, admin_id, limite),
+            )
+            propositions = cur.fetchall()
+        conn.commit()
+        return propositions
+    except Exception as e:
+        print(f"❌ Erreur réservation de propositions : {e}")
+        conn.rollback()
+        return []
+    finally:
+        conn.close()
+
+
+def liberer_propositions(admin_id: int, ids: Optional[List[int]] = None) -> int:
+    """Rend à la file les propositions réservées par `admin_id` (toutes si `ids` est None)."""
+    conn = get_db_connection()
+    if not conn:
+        return 0
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE PROPOSITION SET reserve_par = NULL, reserve_jusqu_a = NULL
+                WHERE reserve_par = %s AND statut = 'en_attente'
+                  AND (%s::int[] IS NULL OR id_proposition = ANY(%s::int[]))
+            """,
+                (admin_id, ids, ids),
+            )
+            liberees = cur.rowcount
+        conn.commit()
+        return liberees
+    except Exception as e:
+        print(f"❌ Erreur libération de propositions : {e}")
+        conn.rollback()
+        return 0
     finally:
         conn.close()
 
@@ -825,10 +1847,33 @@ def enregistrer_saisie(admin_id: int, objet_id: int) -> None:
         conn.close()
 
 
-def count_notifs_non_lues(user_id: int) -> int:
+# Décisions non vues par utilisateur (badge de la barre de navigation),
+# gardées par worker : mises à jour par traiter_proposition(s) et
+# marquer_notifs_lues ; le TTL borne le retard sur les décisions prises
+# dans un autre worker.
+_notifs_non_lues = LRUCache(NOTIFS_CACHE_TAILLE, ttl=NOTIFS_CACHE_TTL)
+
+
+def get_nb_notifs_non_lues(user_id: int) -> int:
+    """Nombre de décisions non vues de l'utilisateur, depuis le cache si possible.
+
+    0 si la base ne répond pas ; cette valeur n'est pas mise en cache, le
+    compte est refait à la page suivante.
+    """
+    nb = _notifs_non_lues.get(user_id)
+    if nb is None:
+        nb = count_notifs_non_lues(user_id)
+        if nb is None:
+            return 0
+        _notifs_non_lues.set(user_id, nb)
+    return nb
+
+
+def count_notifs_non_lues(user_id: int) -> Optional[int]:
+    """Décisions non vues de l'utilisateur, None si la base ne répond pas."""
     conn = get_db_connection()
     if not conn:
-        return 0
+        return None
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -837,8 +1882,9 @@ def count_notifs_non_lues(user_id: int) -> int:
                 (user_id,),
             )
             return cur.fetchone()[0]
-    except Exception:
-        return 0
+    except Exception as e:
+        print(f"Erreur comptage notifications: {e}")
+        return None
     finally:
         conn.close()
 
@@ -854,6 +1900,7 @@ def marquer_notifs_lues(user_id: int) -> None:
                 (user_id,),
             )
         conn.commit()
+        _notifs_non_lues.set(user_id, 0)
     except Exception as e:
         print(f"Erreur notifs: {e}")
     finally:
@@ -900,37 +1947,6 @@ def toggle_favori(user_id: int, objet_id: int) -> Dict[str, Any]:
         conn.close()
 
 
-def get_favoris_utilisateur(user_id: int) -> List[Dict[str, Any]]:
-    """Récupère tous les favoris d'un utilisateur avec les détails des objets."""
-    conn = get_db_connection()
-    if not conn:
-        return []
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT o.id_objet, o.nom_fr, o.nom_scientifique,
-                       LEFT(o.description, 150) AS extrait_description,
-                       o.url_image, o.date_publication, c.nom_categorie,
-                       f.date_ajout,
-                       u.pseudo AS auteur_pseudo
-                FROM FAVORI f
-                JOIN OBJET_CELESTE o ON f.fk_id_objet = o.id_objet
-                JOIN CATEGORIE c ON o.fk_id_categorie = c.id_categorie
-                LEFT JOIN UTILISATEUR u ON o.fk_id_utilisateur = u.id_utilisateur
-                WHERE f.fk_id_utilisateur = %s
-                ORDER BY f.date_ajout DESC
-            """,
-                (user_id,),
-            )
-            return cur.fetchall()
-    except Exception as e:
-        print(f"Erreur favoris utilisateur: {e}")
-        return []
-    finally:
-        conn.close()
-
-
 def get_favoris_ids_utilisateur(user_id: int) -> List[int]:
     """Retourne la liste des id_objet mis en favori par un utilisateur."""
     conn = get_db_connection()
@@ -1024,3 +2040,257 @@ def get_favoris_counts() -> Dict[int, int]:
         return {}
     finally:
         conn.close()
+
+
+# ----------------------------------------------------
+# 8. Mémoire de traduction
+# ----------------------------------------------------
+
+
+def get_traductions(hashes: List[str], langue_cible: str) -> Dict[str, str]:
+    """Traductions déjà connues, en UNE requête : {hash_source: texte_traduit}."""
+    if not hashes:
+        return {}
+    conn = get_db_connection()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT hash_source, texte_traduit FROM TRADUCTION
+                   WHERE hash_source = ANY(%s) AND langue_cible = %s""",
+                (hashes, langue_cible),
+            )
+            return {row[0]: row[1] for row in cur.fetchall()}
+    except Exception as e:
+        print(f"Erreur mémoire de traduction: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def get_textes_catalogue(textes: List[str]) -> Set[str]:
+    """Parmi `textes`, ceux qui sont un nom, une description ou une catégorie du catalogue."""
+    if not textes:
+        return set()
+    conn = get_db_connection()
+    if not conn:
+        return set()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT t FROM unnest(%s::text[]) AS t
+                   WHERE EXISTS (SELECT 1 FROM OBJET_CELESTE o WHERE o.nom_fr = t)
+                      OR EXISTS (SELECT 1 FROM OBJET_CELESTE o
+                                 WHERE md5(o.description) = md5(t) AND o.description = t)
+                      OR EXISTS (SELECT 1 FROM CATEGORIE c WHERE c.nom_categorie = t)""",
+                (list(textes),),
+            )
+            return {row[0] for row in cur.fetchall()}
+    except Exception as e:
+        print(f"Erreur recherche textes du catalogue: {e}")
+        return set()
+    finally:
+        conn.close()
+
+
+def save_traductions(lignes: List[tuple]) -> None:
+    """Enregistre des (hash_source, langue_cible, texte_source, texte_traduit)."""
+    if not lignes:
+        return
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                """INSERT INTO TRADUCTION (hash_source, langue_cible, texte_source, texte_traduit)
+                   VALUES %s ON CONFLICT (hash_source, langue_cible) DO NOTHING""",
+                lignes,
+            )
+        conn.commit()
+    except Exception as e:
+        print(f"❌ Erreur enregistrement traductions : {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# ----------------------------------------------------
+# 9. File de nettoyage inter-stockages (outbox)
+# ----------------------------------------------------
+
+
+def _planifier_nettoyage(cur, type_tache: str, cible: str) -> None:
+    """Ajoute une tâche à NETTOYAGE_OUTBOX, dans la transaction de `cur`."""
+    cur.execute(
+        "INSERT INTO NETTOYAGE_OUTBOX (type_tache, cible) VALUES (%s, %s)",
+        (type_tache, cible),
+    )
+
+
+def _planifier_fichier_orphelin(cur, chemin: Optional[str]) -> None:
+    """Planifie la suppression d'un fichier téléversé que plus aucune ligne ne référence.
+
+    Seuls les chemins `uploads/...` sont concernés (pas les URL externes
+    de la NASA), jamais l'avatar par défaut ; une image de proposition
+    acceptée reste tant que l'objet créé à partir d'elle existe.
+    """
+    if not chemin or not chemin.startswith("uploads/") or chemin == AVATAR_PAR_DEFAUT:
+        return
+    cur.execute(
+        """
+        INSERT INTO NETTOYAGE_OUTBOX (type_tache, cible)
+        SELECT 'fichier', %(chemin)s
+        WHERE NOT EXISTS (SELECT 1 FROM OBJET_CELESTE WHERE url_image = %(chemin)s)
+          AND NOT EXISTS (SELECT 1 FROM PROPOSITION WHERE url_image = %(chemin)s)
+          AND NOT EXISTS (SELECT 1 FROM PROPOSITION_ARCHIVE WHERE url_image = %(chemin)s)
+          AND NOT EXISTS (SELECT 1 FROM UTILISATEUR WHERE photo_profil = %(chemin)s)
+    """,
+        {"chemin": chemin},
+    )
+
+
+def planifier_purge_objets_absents(objet_ids: List[int]) -> int:
+    """Planifie la purge des commentaires des objets de `objet_ids` absents d'OBJET_CELESTE.
+
+    Rattrapage des orphelins laissés par les suppressions antérieures à
+    NETTOYAGE_OUTBOX : le test d'existence se fait dans la requête même,
+    si bien qu'une base injoignable ne planifie rien. Renvoie le nombre
+    de tâches ajoutées.
+    """
+    if not objet_ids:
+        return 0
+    conn = get_db_connection()
+    if not conn:
+        return 0
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO NETTOYAGE_OUTBOX (type_tache, cible)
+                SELECT 'commentaires_objet', ids.id::text
+                FROM unnest(%s::int[]) AS ids(id)
+                WHERE NOT EXISTS (SELECT 1 FROM OBJET_CELESTE WHERE id_objet = ids.id)
+            """,
+                (list(objet_ids),),
+            )
+            ajoutees = cur.rowcount
+        conn.commit()
+        return ajoutees
+    except Exception as e:
+        print(f"❌ Erreur rattrapage outbox : {e}")
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
+
+
+def reserver_taches_outbox(
+    limite: int, bail_secondes: int, max_tentatives: int
+) -> List[Dict[str, Any]]:
+    """Réserve jusqu'à `limite` tâches dues, les plus anciennes d'abord.
+
+    Les tâches réservées sont repoussées de `bail_secondes` : un autre
+    processus de nettoyage ne les reprend pas pendant le traitement
+    (SKIP LOCKED évite aussi d'attendre sur des lignes en cours de
+    réservation), mais elles redeviennent dues si celui-ci s'arrête avant
+    de les terminer. Une tâche qui a échoué `max_tentatives` fois n'est
+    plus réservée ; elle reste dans la table avec sa dernière erreur.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return []
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                UPDATE NETTOYAGE_OUTBOX
+                SET prochain_essai = NOW() + %s * INTERVAL '1 second'
+                WHERE id_tache IN (
+                    SELECT id_tache FROM NETTOYAGE_OUTBOX
+                    WHERE prochain_essai <= NOW() AND tentatives < %s
+                    ORDER BY id_tache
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id_tache, type_tache, cible, tentatives
+            """,
+                (bail_secondes, max_tentatives, limite),
+            )
+            taches = cur.fetchall()
+        conn.commit()
+        return sorted(taches, key=lambda t: t["id_tache"])
+    except Exception as e:
+        print(f"❌ Erreur réservation outbox : {e}")
+        conn.rollback()
+        return []
+    finally:
+        conn.close()
+
+
+def terminer_taches_outbox(ids: List[int]) -> None:
+    """Retire de la file les tâches appliquées."""
+    if not ids:
+        return
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM NETTOYAGE_OUTBOX WHERE id_tache = ANY(%s)", (ids,))
+        conn.commit()
+    except Exception as e:
+        print(f"❌ Erreur fin de tâches outbox : {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def echouer_tache_outbox(id_tache: int, erreur: str, delai_secondes: int) -> None:
+    """Enregistre l'échec d'une tâche et la replanifie dans `delai_secondes`."""
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE NETTOYAGE_OUTBOX
+                SET tentatives = tentatives + 1, derniere_erreur = %s,
+                    prochain_essai = NOW() + %s * INTERVAL '1 second'
+                WHERE id_tache = %s
+            """,
+                (erreur[:1000], delai_secondes, id_tache),
+            )
+        conn.commit()
+    except Exception as e:
+        print(f"❌ Erreur replanification outbox : {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def get_stats_outbox(max_tentatives: int) -> Dict[str, int]:
+    """Tâches en attente et abandonnées (`max_tentatives` échecs atteints)."""
+    conn = get_db_connection()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT COUNT(*) FILTER (WHERE tentatives < %(max)s),
+                       COUNT(*) FILTER (WHERE tentatives >= %(max)s)
+                FROM NETTOYAGE_OUTBOX
+            """,
+                {"max": max_tentatives},
+            )
+            en_attente, abandonnees = cur.fetchone()
+            return {"en_attente": en_attente, "abandonnees": abandonnees}
+    except Exception as e:
+        print(f"❌ Erreur statistiques outbox : {e}")
+        return {}
+    finally:
+        conn.close()
@@ -0,0 +1,253 @@
+# model/evenements.py
+
+import json
+import os
+import queue
+import select
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+import psycopg2
+
+from config import DATABASE_URL, SSE_HISTORIQUE
+
+# Canal LISTEN / NOTIFY commun à tous les workers
+CANAL_EVENEMENTS = "astrolearn_evenements"
+# Événements en attente par flux : au-delà, un client trop lent perd les
+# suivants (il se resynchronise à sa reconnexion).
+TAILLE_FILE_FLUX = 100
+# Silence (secondes) au bout duquel la connexion d'écoute est vérifiée
+_VERIFICATION_ECOUTE = 60
+_DELAI_MAX_RECONNEXION = 60
+# Événements en attente d'envoi par worker (PublieurEvenements) : au-delà,
+# PostgreSQL ne suit plus et les suivants sont abandonnés.
+TAILLE_FILE_PUBLICATION = 1000
+
+# Déposé dans tous les flux quand l'écoute a été coupée puis rétablie : des
+# événements ont pu être perdus, le flux renvoie l'état courant au client.
+RESYNCHRONISER: Dict[str, Any] = {"type": "resynchroniser"}
+
+
+def preparer_evenement(user_id: int, type_evenement: str, **donnees: Any) -> str:
+    """Charge utile JSON d'un NOTIFY destiné à `user_id`.
+
+    `id` (microsecondes depuis l'epoch, pris à la préparation) est le même
+    pour tous les workers : c'est l'identifiant SSE renvoyé à la reconnexion
+    (Last-Event-ID). Il identifie l'événement mais ne l'ordonne pas : pris
+    avant le commit, et sur des hôtes dont les horloges peuvent différer,
+    il peut être plus petit que celui d'un événement délivré avant lui.
+    NOTIFY limite la charge à 8000 octets : n'y mettre que des identifiants
+    et des libellés courts.
+    """
+    return json.dumps(
+        {
+            "id": time.time_ns() // 1000,
+            "user_id": user_id,
+            "type": type_evenement,
+            **donnees,
+        },
+        default=str,
+    )
+
+
+class DiffuseurEvenements:
+    """Redistribue aux flux SSE d'un worker les NOTIFY de PostgreSQL.
+
+    Une seule connexion par worker fait LISTEN, dans un thread démon lancé
+    au premier abonné : jamais dans le maître gunicorn, et relancé si le
+    processus a forké depuis. Chaque flux s'abonne avec sa file ; un
+    événement n'est déposé que dans les files de son destinataire. Les
+    derniers événements reçus sont gardés pour rejouer ceux qu'un client
+    a manqués entre deux connexions, même s'il revient sur un autre
+    worker : tous écoutent le même canal, et PostgreSQL délivre les NOTIFY
+    dans l'ordre des commits, le même pour tous.
+    """
+
+    def __init__(
+        self,
+        dsn: str = DATABASE_URL,
+        canal: str = CANAL_EVENEMENTS,
+        historique: int = SSE_HISTORIQUE,
+    ) -> None:
+        self._dsn = dsn
+        self._canal = canal
+        self._verrou = threading.Lock()
+        self._abonnes: Dict[int, Set["queue.Queue[Dict[str, Any]]"]] = {}
+        self._recents: Deque[Dict[str, Any]] = deque(maxlen=historique)
+        self._pid: Optional[int] = None
+
+    def abonner(
+        self, user_id: int, depuis: Optional[int] = None
+    ) -> "queue.Queue[Dict[str, Any]]":
+        """File des événements de `user_id`, préremplie de ceux délivrés après `depuis`.
+
+        « Après » suit l'ordre de réception, pas celui des identifiants (voir
+        preparer_evenement). Si l'événement `depuis` n'est plus (ou pas) dans
+        l'historique, ce qui a été manqué est inconnu : la file commence par
+        RESYNCHRONISER.
+        """
+        self._demarrer()
+        file: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=TAILLE_FILE_FLUX)
+        with self._verrou:
+            if depuis is not None:
+                manques: Optional[List[Dict[str, Any]]] = None
+                for evenement in self._recents:
+                    if evenement["user_id"] != user_id:
+                        continue
+                    if evenement["id"] == depuis:
+                        manques = []
+                    elif manques is not None:
+                        manques.append(evenement)
+                for evenement in manques if manques is not None else [RESYNCHRONISER]:
+                    _deposer(file, evenement)
+            self._abonnes.setdefault(user_id, set()).add(file)
+        return file
+
+    def desabonner(self, user_id: int, file: "queue.Queue[Dict[str, Any]]") -> None:
+        with self._verrou:
+            files = self._abonnes.get(user_id)
+            if files is not None:
+                files.discard(file)
+                if not files:
+                    del self._abonnes[user_id]
+
+    def nb_flux(self) -> int:
+        with self._verrou:
+            return sum(len(files) for files in self._abonnes.values())
+
+    def distribuer(self, charge: str) -> None:
+        """Dépose un NOTIFY reçu dans les files de son destinataire."""
+        try:
+            evenement = json.loads(charge)
+            user_id = int(evenement["user_id"])
+            evenement["id"] = int(evenement["id"])
+        except (ValueError, KeyError, TypeError):
+            print(f"⚠️ Événement ignoré (charge invalide) : {charge[:100]}")
+            return
+        with self._verrou:
+            self._recents.append(evenement)
+            for file in self._abonnes.get(user_id, ()):
+                _deposer(file, evenement)
+
+    def _resynchroniser(self) -> None:
+        with self._verrou:
+            for files in self._abonnes.values():
+                for file in files:
+                    _deposer(file, RESYNCHRONISER)
+
+    def _demarrer(self) -> None:
+        with self._verrou:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(
+            target=self._ecouter, name="evenements-listen", daemon=True
+        ).start()
+
+    def _ecouter(self) -> None:
+        """Boucle du thread d'écoute : LISTEN, attente des NOTIFY, reconnexion espacée."""
+        delai = 1.0
+        coupure = False
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self._dsn)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self._canal}")
+                print(f"📡 Écoute de {self._canal} (worker {os.getpid()})")
+                if coupure:
+                    self._resynchroniser()
+                delai = 1.0
+                while True:
+                    if not select.select([conn], [], [], _VERIFICATION_ECOUTE)[0]:
+                        # Rien reçu : vérifie que la connexion n'est pas morte
+                        # sans bruit (redémarrage du serveur, coupure réseau).
+                        with conn.cursor() as cur:
+                            cur.execute("SELECT 1")
+                    conn.poll()
+                    while conn.notifies:
+                        self.distribuer(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(
+                    f"⚠️ Écoute des événements interrompue : {e} "
+                    f"(nouvel essai dans {delai:.0f} s)"
+                )
+            finally:
+                if conn is not None:
+                    conn.close()
+            coupure = True
+            time.sleep(delai)
+            delai = min(delai * 2, _DELAI_MAX_RECONNEXION)
+
+
+class PublieurEvenements:
+    """Envoie, hors des requêtes HTTP, les NOTIFY des écritures faites hors
+    PostgreSQL (réponses aux commentaires, stockées dans MongoDB).
+
+    publier() dépose l'événement dans une file bornée et rend la main tout
+    de suite : un thread démon par worker (lancé à la première publication,
+    relancé si le processus a forké depuis) les envoie sur une connexion
+    gardée ouverte. Un PostgreSQL lent ou indisponible ne ralentit donc pas
+    l'écriture du commentaire ; un événement qui n'a pas pu partir est
+    perdu, le badge se resynchronisant à la reconnexion du flux.
+    """
+
+    def __init__(self, dsn: str = DATABASE_URL, canal: str = CANAL_EVENEMENTS) -> None:
+        self._dsn = dsn
+        self._canal = canal
+        self._verrou = threading.Lock()
+        self._file: "queue.Queue[str]" = queue.Queue(maxsize=TAILLE_FILE_PUBLICATION)
+        self._pid: Optional[int] = None
+
+    def publier(self, user_id: int, type_evenement: str, **donnees: Any) -> bool:
+        """Met l'événement en file d'envoi ; False si la file est pleine."""
+        self._demarrer()
+        try:
+            self._file.put_nowait(
+                preparer_evenement(user_id, type_evenement, **donnees)
+            )
+            return True
+        except queue.Full:
+            print(f"⚠️ Événement {type_evenement} abandonné : file d'envoi pleine")
+            return False
+
+    def _demarrer(self) -> None:
+        with self._verrou:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(
+            target=self._envoyer, name="evenements-notify", daemon=True
+        ).start()
+
+    def _envoyer(self) -> None:
+        conn = None
+        while True:
+            charge = self._file.get()
+            try:
+                if conn is None or conn.closed:
+                    conn = psycopg2.connect(self._dsn)
+                    conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (self._canal, charge))
+            except Exception as e:
+                print(f"❌ Événement non publié : {e}")
+                if conn is not None:
+                    conn.close()
+                conn = None
+            finally:
+                self._file.task_done()
+
+
+def _deposer(file: "queue.Queue[Dict[str, Any]]", evenement: Dict[str, Any]) -> None:
+    try:
+        file.put_nowait(evenement)
+    except queue.Full:
+        pass
+
+
+diffuseur = DiffuseurEvenements()
+publieur = PublieurEvenements()
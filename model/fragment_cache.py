@@ -0,0 +1,88 @@
+# model/fragment_cache.py
+
+import os
+import re
+import tempfile
+from typing import Optional
+
+from config import COMMENT_FRAGMENT_CACHE_DIR, COMMENT_FRAGMENT_LRU_SIZE
+from model.cache_utils import LRUCache
+
+
+class CacheFragments:
+    """Fragments HTML pré-rendus, clé (nom, version).
+
+    Deux niveaux : un LRU en mémoire (propre au worker) puis, si
+    `repertoire` est fourni, un fichier par fragment partagé entre les
+    workers d'une même machine. La version fait partie de la clé : un
+    fragment n'est jamais invalidé, il cesse simplement d'être demandé
+    quand la version avance (et son fichier est alors remplacé).
+    """
+
+    def __init__(self, taille_lru: int, repertoire: Optional[str] = None) -> None:
+        self._lru = LRUCache(taille_lru)
+        self._repertoire = repertoire
+        if repertoire:
+            os.makedirs(repertoire, exist_ok=True)
+
+    def get(self, nom: str, version: int) -> Optional[str]:
+        html = self._lru.get((nom, version))
+        if html is not None or not self._repertoire:
+            return html
+        try:
+            with open(self._chemin(nom, version), encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            return None
+        self._lru.set((nom, version), html)
+        return html
+
+    def set(self, nom: str, version: int, html: str) -> None:
+        self._lru.set((nom, version), html)
+        if not self._repertoire:
+            return
+        try:
+            # Écriture atomique : un autre worker ne lit jamais un fichier partiel.
+            fd, temporaire = tempfile.mkstemp(dir=self._repertoire, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(temporaire, self._chemin(nom, version))
+            self._supprimer_anciennes_versions(nom, version)
+        except OSError as e:
+            print(f"⚠️ Cache de fragments : écriture impossible ({e})")
+
+    def supprimer(self, nom: str) -> None:
+        """Retire du disque toutes les versions de `nom` (objet supprimé).
+
+        Le LRU n'est pas parcouru : ses entrées, plus jamais demandées,
+        en sortent d'elles-mêmes.
+        """
+        if self._repertoire:
+            self._supprimer_anciennes_versions(nom, None)
+
+    def _chemin(self, nom: str, version: int) -> str:
+        return os.path.join(self._repertoire, f"{_nom_fichier(nom)}.v{version}.html")
+
+    def _supprimer_anciennes_versions(self, nom: str, version: Optional[int]) -> None:
+        prefixe = f"{_nom_fichier(nom)}.v"
+        garde = (
+            os.path.basename(self._chemin(nom, version))
+            if version is not None
+            else None
+        )
+        for fichier in os.listdir(self._repertoire):
+            if fichier.startswith(prefixe) and fichier != garde:
+                try:
+                    os.remove(os.path.join(self._repertoire, fichier))
+                except OSError:
+                    pass  # déjà supprimé par un autre worker
+
+
+def _nom_fichier(nom: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", nom)
+
+
+# Fil de commentaires rendu de chaque objet (voir main_routes.object_detail)
+fragments_fils = CacheFragments(
+    COMMENT_FRAGMENT_LRU_SIZE, COMMENT_FRAGMENT_CACHE_DIR or None
+)
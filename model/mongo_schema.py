@@ -0,0 +1,224 @@
+# model/mongo_schema.py
+
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, monitoring
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+# (clés, options) d'un index ; le nom est obligatoire pour pouvoir comparer
+# l'existant et le déclaré.
+SpecIndex = Tuple[List[Tuple[str, int]], Dict[str, Any]]
+
+INDEX_COMMENTAIRES: List[SpecIndex] = [
+    (
+        [("commentaire_id", ASCENDING)],
+        {"name": "commentaire_id_unique", "unique": True},
+    ),
+    # Lecture d'un fil : tous les commentaires d'un objet, dans l'ordre chronologique.
+    ([("objet_id", ASCENDING), ("date", ASCENDING)], {"name": "objet_date"}),
+    # Fil public paginé : racines (parent_id null) ou réponses directes d'un
+    # commentaire, dans l'ordre chronologique.
+    (
+        [
+            ("objet_id", ASCENDING),
+            ("parent_id", ASCENDING),
+            ("date", ASCENDING),
+            ("commentaire_id", ASCENDING),
+        ],
+        {"name": "objet_parent_date_id"},
+    ),
+    # Suppression d'un sous-arbre : tous les descendants d'un commentaire.
+    ([("ancetres", ASCENDING)], {"name": "ancetres"}),
+    # Flux de modération paginé sur (date, commentaire_id), du plus récent au plus
+    # ancien, et non lus d'un admin (date > marque de lecture).
+    (
+        [("date", DESCENDING), ("commentaire_id", DESCENDING)],
+        {"name": "date_id_desc"},
+    ),
+    # Mêmes pages, filtrées par objet ou par auteur.
+    (
+        [("objet_id", ASCENDING), ("date", DESCENDING), ("commentaire_id", DESCENDING)],
+        {"name": "objet_date_id_desc"},
+    ),
+    (
+        [("pseudo", ASCENDING), ("date", DESCENDING), ("commentaire_id", DESCENDING)],
+        {"name": "pseudo_date_id_desc"},
+    ),
+]
+
+INDEX_COMPTEURS_COMMENTAIRES: List[SpecIndex] = [
+    ([("objet_id", ASCENDING)], {"name": "objet_id_unique", "unique": True}),
+]
+
+INDEX_LECTURES_ADMIN: List[SpecIndex] = [
+    ([("admin_id", ASCENDING)], {"name": "admin_id_unique", "unique": True}),
+]
+
+# Ancien stockage (un document par objet), tant qu'il n'a pas été migré.
+INDEX_ANCIENS_COMMENTAIRES: List[SpecIndex] = [
+    ([("objet_id", ASCENDING)], {"name": "objet_id_unique", "unique": True}),
+]
+
+SCHEMA: Dict[str, List[SpecIndex]] = {
+    "commentaires_noeuds": INDEX_COMMENTAIRES,
+    "commentaires_objets": INDEX_COMPTEURS_COMMENTAIRES,
+    "commentaires_lectures": INDEX_LECTURES_ADMIN,
+    "commentaires": INDEX_ANCIENS_COMMENTAIRES,
+}
+
+# Collections de SCHEMA qu'on ne crée jamais : leurs index ne sont posés que
+# si elles existent encore (migrer_commentaires.py --supprimer-ancien).
+COLLECTIONS_ANCIENNES = {"commentaires"}
+
+
+def synchroniser_index(
+    collection: Collection, specs: List[SpecIndex], supprimer_obsoletes: bool = False
+) -> Dict[str, List[str]]:
+    """Crée les index déclarés absents de `collection`.
+
+    Avec `supprimer_obsoletes`, supprime aussi les index présents mais non
+    déclarés (jamais l'index `_id_`). Renvoie les noms créés, déjà
+    présents et supprimés.
+    """
+    existants = set(collection.index_information())
+    declares = {options["name"] for _, options in specs}
+    rapport: Dict[str, List[str]] = {"crees": [], "presents": [], "supprimes": []}
+
+    for cles, options in specs:
+        if options["name"] in existants:
+            rapport["presents"].append(options["name"])
+        else:
+            collection.create_index(cles, **options)
+            rapport["crees"].append(options["name"])
+
+    if supprimer_obsoletes:
+        for nom in sorted(existants - declares - {"_id_"}):
+            collection.drop_index(nom)
+            rapport["supprimes"].append(nom)
+    return rapport
+
+
+def synchroniser_schema(
+    db: Database, supprimer_obsoletes: bool = False
+) -> Dict[str, Dict[str, List[str]]]:
+    """synchroniser_index sur chaque collection de SCHEMA, sauf les
+    anciennes collections déjà supprimées (create_index les recréerait)."""
+    absentes = COLLECTIONS_ANCIENNES - set(db.list_collection_names())
+    return {
+        nom: synchroniser_index(db[nom], specs, supprimer_obsoletes)
+        for nom, specs in SCHEMA.items()
+        if nom not in absentes
+    }
+
+
+def resumer_plan(plan: Any) -> str:
+    """Résumé lisible d'un plan d'exécution, ex. "LIMIT > FETCH > IXSCAN(objet_date)"."""
+    etapes: List[str] = []
+    while isinstance(plan, dict):
+        etape = plan.get("stage", "?")
+        if plan.get("indexName"):
+            etape += f"({plan['indexName']})"
+        etapes.append(etape)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " > ".join(etapes)
+
+
+def expliquer(db: Database, commande: Dict[str, Any]) -> str:
+    """Plan retenu par MongoDB pour une commande (find, aggregate, count...)."""
+    resultat = db.command({"explain": commande, "verbosity": "queryPlanner"})
+    planificateur = resultat.get("queryPlanner") or {}
+    if "winningPlan" not in planificateur:
+        # aggregate : le plan est dans la première étape du pipeline
+        etapes = resultat.get("stages") or [{}]
+        planificateur = etapes[0].get("$cursor", {}).get("queryPlanner", {})
+    return resumer_plan(planificateur.get("winningPlan"))
+
+
+class RequetesLentesListener(monitoring.CommandListener):
+    """Journalise les requêtes sur les collections suivies plus lentes que `seuil_ms`.
+
+    Les plans (explain) sont calculés dans un thread dédié, jamais dans le
+    callback du driver, et abandonnés si la file déborde : le profilage ne
+    doit pas ralentir les requêtes qu'il observe.
+    """
+
+    COMMANDES = {"find", "aggregate", "count", "distinct", "update", "delete"}
+
+    def __init__(
+        self, seuil_ms: int, expliquer_plans: bool, collections: Tuple[str, ...]
+    ) -> None:
+        self.seuil_ms = seuil_ms
+        self.expliquer_plans = expliquer_plans
+        self.collections = collections
+        self.client: Optional[Any] = None  # renseigné par get_mongo_client()
+        self._en_cours: Dict[Tuple[Any, int], Tuple[str, Dict[str, Any]]] = {}
+        self._verrou = threading.Lock()
+        self._a_expliquer: "queue.Queue[Tuple[str, Dict[str, Any], str]]" = queue.Queue(
+            maxsize=100
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in self.COMMANDES:
+            return
+        if event.command.get(event.command_name) not in self.collections:
+            return
+        commande = {
+            k: v
+            for k, v in event.command.items()
+            if not k.startswith("$") and k not in ("lsid", "txnNumber")
+        }
+        with self._verrou:
+            self._en_cours[(event.connection_id, event.request_id)] = (
+                event.database_name,
+                commande,
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        with self._verrou:
+            suivi = self._en_cours.pop((event.connection_id, event.request_id), None)
+        if suivi is None:
+            return
+        duree_ms = event.duration_micros / 1000
+        if duree_ms < self.seuil_ms:
+            return
+        base, commande = suivi
+        resume = f"{event.command_name} {commande.get(event.command_name)} ({duree_ms:.0f} ms)"
+        print(f"🐢 Requête Mongo lente : {resume} {_filtre(commande)}")
+        if self.expliquer_plans and self.client is not None:
+            self._demarrer_thread()
+            try:
+                self._a_expliquer.put_nowait((base, commande, resume))
+            except queue.Full:
+                pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        with self._verrou:
+            self._en_cours.pop((event.connection_id, event.request_id), None)
+
+    def _demarrer_thread(self) -> None:
+        with self._verrou:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._boucle_explain, name="mongo-explain", daemon=True
+                )
+                self._thread.start()
+
+    def _boucle_explain(self) -> None:
+        while True:
+            base, commande, resume = self._a_expliquer.get()
+            try:
+                plan = expliquer(self.client[base], commande)
+                print(f"🔎 Plan de {resume} : {plan}")
+            except Exception as e:
+                print(f"❌ Explain impossible pour {resume} : {e}")
+
+
+def _filtre(commande: Dict[str, Any]) -> Any:
+    for cle in ("filter", "query", "pipeline", "updates", "deletes"):
+        if cle in commande:
+            return commande[cle]
+    return ""
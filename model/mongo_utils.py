@@ -1,21 +1,215 @@
 # model/mongo_utils.py
 
-from typing import Optional
-from pymongo import MongoClient
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from pymongo import MongoClient, monitoring
 from pymongo.collection import Collection
-from config import MONGO_URI, MONGO_DB_NAME
+from pymongo.errors import PyMongoError
+
+from config import (
+    MONGO_URI,
+    MONGO_DB_NAME,
+    MONGO_SLOW_QUERY_MS,
+    MONGO_EXPLAIN_SLOW_QUERIES,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+)
+from model.mongo_schema import RequetesLentesListener, SCHEMA
+
+
+class StatistiquesPool(monitoring.ConnectionPoolListener):
+    """Compteurs du pool de connexions MongoDB du processus (supervision).
+
+    `en_cours` : connexions empruntées par une requête ; `attentes_echouees` :
+    requêtes qui n'ont pas obtenu de connexion (pool plein au-delà de
+    MONGO_WAIT_QUEUE_TIMEOUT_MS, ou serveur injoignable) ; `vidages` : pools
+    vidés après une erreur réseau.
+    """
+
+    def __init__(self) -> None:
+        self._verrou = threading.Lock()
+        self._compteurs = {
+            "ouvertes": 0,
+            "en_cours": 0,
+            "creees": 0,
+            "fermees": 0,
+            "attentes_echouees": 0,
+            "vidages": 0,
+        }
+
+    def _ajouter(self, **deltas: int) -> None:
+        with self._verrou:
+            for cle, delta in deltas.items():
+                self._compteurs[cle] += delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._verrou:
+            compteurs = dict(self._compteurs)
+        return {
+            "max_pool": MONGO_MAX_POOL_SIZE,
+            "min_pool": MONGO_MIN_POOL_SIZE,
+            **compteurs,
+            "saturation": (
+                round(compteurs["en_cours"] / MONGO_MAX_POOL_SIZE, 2)
+                if MONGO_MAX_POOL_SIZE
+                else 0.0
+            ),
+        }
+
+    def connection_created(self, event: Any) -> None:
+        self._ajouter(ouvertes=1, creees=1)
+
+    def connection_closed(self, event: Any) -> None:
+        self._ajouter(ouvertes=-1, fermees=1)
+
+    def connection_checked_out(self, event: Any) -> None:
+        self._ajouter(en_cours=1)
+
+    def connection_checked_in(self, event: Any) -> None:
+        self._ajouter(en_cours=-1)
+
+    def connection_check_out_failed(self, event: Any) -> None:
+        self._ajouter(attentes_echouees=1)
+
+    def pool_cleared(self, event: Any) -> None:
+        # Les connexions empruntées restent comptées dans `en_cours` : chacune
+        # sera rendue (checked_in, qui la décompte) puis fermée, car périmée.
+        self._ajouter(vidages=1)
+
+    def pool_created(self, event: Any) -> None:
+        pass
+
+    def pool_ready(self, event: Any) -> None:
+        pass
+
+    def pool_closed(self, event: Any) -> None:
+        pass
+
+    def connection_ready(self, event: Any) -> None:
+        pass
+
+    def connection_check_out_started(self, event: Any) -> None:
+        pass
+
 
+# Un client par processus : un MongoClient ne doit pas traverser un fork.
+# get_mongo_client() en recrée un si le PID a changé ; gunicorn.conf.py
+# appelle en plus reinitialiser_apres_fork() dans chaque worker.
 _client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_verrou = threading.Lock()
+_stats_pool = StatistiquesPool()
 
 
 def get_mongo_client() -> MongoClient:
-    """Retourne un client MongoDB réutilisé entre les appels (connexion paresseuse)."""
-    global _client
-    if _client is None:
-        _client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+    """Retourne le client MongoDB du processus courant (connexion paresseuse).
+
+    Pool et délais réglés par les variables MONGO_*_POOL_SIZE et
+    MONGO_*_TIMEOUT_MS. Si MONGO_SLOW_QUERY_MS est défini, les requêtes
+    lentes sur les collections de commentaires sont journalisées (avec
+    leur plan si MONGO_EXPLAIN_SLOW_QUERIES=1).
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _verrou:
+            if _client is None or _client_pid != pid:
+                _client = _creer_client()
+                _client_pid = pid
     return _client
 
 
+def _creer_client() -> MongoClient:
+    global _stats_pool
+    _stats_pool = StatistiquesPool()
+    listeners: list = [_stats_pool]
+    lentes = None
+    if MONGO_SLOW_QUERY_MS > 0:
+        lentes = RequetesLentesListener(
+            MONGO_SLOW_QUERY_MS, MONGO_EXPLAIN_SLOW_QUERIES, tuple(SCHEMA)
+        )
+        listeners.append(lentes)
+    client: MongoClient = MongoClient(
+        MONGO_URI,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        event_listeners=listeners,
+    )
+    if lentes is not None:
+        lentes.client = client
+    return client
+
+
+def reinitialiser_apres_fork() -> None:
+    """À appeler dans un processus fils : oublie le client hérité du parent.
+
+    Le client du parent n'est pas fermé (ses sockets appartiennent au
+    parent) ; le suivant sera créé dans ce processus au premier besoin.
+    """
+    global _client, _client_pid, _verrou
+    _verrou = threading.Lock()  # un verrou hérité pourrait être resté pris
+    _client = None
+    _client_pid = None
+
+
+def prechauffer() -> bool:
+    """Ouvre le pool dès le démarrage du worker (ping) ; False si MongoDB ne répond pas.
+
+    Avec MONGO_MIN_POOL_SIZE > 0, le driver complète ensuite le pool en
+    arrière-plan : les premières requêtes ne paient pas l'ouverture des
+    connexions.
+    """
+    try:
+        get_mongo_client().admin.command("ping")
+        return True
+    except PyMongoError as e:
+        print(f"⚠️ Préchauffage MongoDB impossible : {e}")
+        return False
+
+
+def fermer_client() -> None:
+    """Ferme proprement le client du processus (arrêt d'un worker)."""
+    global _client, _client_pid
+    with _verrou:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def get_stats_pool() -> Dict[str, Any]:
+    """Occupation du pool de connexions MongoDB de ce processus."""
+    return _stats_pool.stats()
+
+
 def get_commentaires_collection() -> Collection:
-    """Collection MongoDB stockant, pour chaque objet céleste, l'arbre de commentaires."""
+    """Collection MongoDB stockant un document par commentaire (voir CommentaireService)."""
+    return get_mongo_client()[MONGO_DB_NAME]["commentaires_noeuds"]
+
+
+def get_compteurs_commentaires_collection() -> Collection:
+    """Compteurs par objet céleste (nb_commentaires), tenus à jour à chaque écriture."""
+    return get_mongo_client()[MONGO_DB_NAME]["commentaires_objets"]
+
+
+def get_lectures_admin_collection() -> Collection:
+    """Marque de lecture des commentaires par admin : {admin_id, derniere_lecture}."""
+    return get_mongo_client()[MONGO_DB_NAME]["commentaires_lectures"]
+
+
+def get_anciens_commentaires_collection() -> Collection:
+    """Ancien stockage : un document par objet céleste contenant tout l'arbre.
+
+    Conservé uniquement comme source de migrer_commentaires.py.
+    """
     return get_mongo_client()[MONGO_DB_NAME]["commentaires"]
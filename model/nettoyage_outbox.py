@@ -0,0 +1,94 @@
+# model/nettoyage_outbox.py
+
+import os
+from typing import Any, Dict, List
+
+from config import (
+    OUTBOX_BAIL,
+    OUTBOX_DELAI_ESSAI,
+    OUTBOX_MAX_TENTATIVES,
+    OUTBOX_TAILLE_LOT,
+)
+from model.comment_service import CommentaireService, commentaire_service
+from model.database import (
+    echouer_tache_outbox,
+    reserver_taches_outbox,
+    terminer_taches_outbox,
+)
+from model.fragment_cache import fragments_fils
+
+# Les chemins enregistrés en base (« uploads/... ») sont relatifs à static/.
+RACINE_STATIC = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static"
+)
+# Plafond du délai entre deux essais d'une même tâche (secondes).
+DELAI_MAX_ESSAI = 6 * 3600
+
+
+def traiter_lot(
+    limite: int = OUTBOX_TAILLE_LOT,
+    service: CommentaireService = commentaire_service,
+    racine: str = RACINE_STATIC,
+) -> Dict[str, int]:
+    """Applique un lot de tâches de NETTOYAGE_OUTBOX ; renvoie {"traitees", "echecs"}.
+
+    Les commentaires de tous les objets du lot sont purgés ensemble (deux
+    requêtes MongoDB), avec leurs fragments HTML en cache ; les fichiers
+    sont retirés un par un, un fichier déjà absent comptant comme
+    nettoyé. Chaque tâche est idempotente : rejouée après une coupure,
+    elle ne fait rien de plus. Une tâche en échec est replanifiée avec un
+    délai doublé à chaque essai.
+    """
+    taches = reserver_taches_outbox(limite, OUTBOX_BAIL, OUTBOX_MAX_TENTATIVES)
+    faites: List[int] = []
+    echecs = 0
+
+    objets = [t for t in taches if t["type_tache"] == "commentaires_objet"]
+    if objets:
+        try:
+            service.purger_objets([int(t["cible"]) for t in objets])
+            for tache in objets:
+                fragments_fils.supprimer(f"fil-{tache['cible']}")
+            faites.extend(t["id_tache"] for t in objets)
+        except Exception as e:
+            for tache in objets:
+                _echouer(tache, e)
+            echecs += len(objets)
+
+    for tache in taches:
+        if tache["type_tache"] != "fichier":
+            continue
+        try:
+            supprimer_fichier(tache["cible"], racine)
+            faites.append(tache["id_tache"])
+        except Exception as e:
+            _echouer(tache, e)
+            echecs += 1
+
+    terminer_taches_outbox(faites)
+    return {"traitees": len(faites), "echecs": echecs}
+
+
+def supprimer_fichier(chemin: str, racine: str = RACINE_STATIC) -> None:
+    """Supprime `racine/chemin`, à condition qu'il soit sous `racine/uploads`.
+
+    Lève ValueError pour tout chemin qui en sortirait (« .. », lien
+    symbolique) ; un fichier déjà absent n'est pas une erreur.
+    """
+    uploads = os.path.realpath(os.path.join(racine, "uploads"))
+    cible = os.path.realpath(os.path.join(racine, chemin))
+    if cible == uploads or os.path.commonpath([cible, uploads]) != uploads:
+        raise ValueError(f"Chemin hors de static/uploads : {chemin}")
+    try:
+        os.remove(cible)
+    except FileNotFoundError:
+        pass
+
+
+def _echouer(tache: Dict[str, Any], erreur: Exception) -> None:
+    delai = min(OUTBOX_DELAI_ESSAI * 2 ** tache["tentatives"], DELAI_MAX_ESSAI)
+    print(
+        f"⚠️ Nettoyage {tache['type_tache']} {tache['cible']} en échec "
+        f"(essai {tache['tentatives'] + 1}/{OUTBOX_MAX_TENTATIVES}) : {erreur}"
+    )
+    echouer_tache_outbox(tache["id_tache"], str(erreur), delai)
@@ -0,0 +1,48 @@
+# model/pagination.py
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Ligne = Dict[str, Any]
+
+
+def encoder_curseur(*valeurs: Any) -> str:
+    """Curseur opaque (base64 URL) désignant une position de tri.
+
+    Les dates sont encodées au format ISO, que PostgreSQL relit avec un
+    simple cast (`%s::timestamp`).
+    """
+    brut = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in valeurs]
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(brut).decode("ascii")
+
+
+def decoder_curseur(curseur: Optional[str], nb_valeurs: int) -> Optional[List[Any]]:
+    """Inverse d'encoder_curseur (None si pas de curseur) ; lève ValueError si invalide."""
+    if not curseur:
+        return None
+    try:
+        valeurs = json.loads(base64.urlsafe_b64decode(curseur))
+    except Exception:
+        raise ValueError("Curseur invalide")
+    if not isinstance(valeurs, list) or len(valeurs) != nb_valeurs:
+        raise ValueError("Curseur invalide")
+    return valeurs
+
+
+def couper_page(
+    lignes: Sequence[Ligne], limite: int, cle: Callable[[Ligne], Tuple[Any, ...]]
+) -> Tuple[List[Ligne], Optional[str]]:
+    """Page de `limite` lignes et curseur de la suivante (None à la fin).
+
+    `lignes` est le résultat d'une requête limitée à `limite + 1` : la
+    ligne en trop indique seulement qu'une page suit. `cle` donne les
+    valeurs de tri de la dernière ligne gardée.
+    """
+    if len(lignes) <= limite:
+        return list(lignes), None
+    page = list(lignes[:limite])
+    return page, encoder_curseur(*cle(page[-1]))
@@ -0,0 +1,175 @@
+# model/translation_service.py
+
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from deep_translator import GoogleTranslator
+
+from config import (
+    TRANSLATION_LRU_SIZE,
+    PRETRADUCTION_LANGUES,
+    TRADUCTION_LANGUES,
+    TRADUCTION_MAX_CARACTERES,
+)
+from model.cache_utils import LRUCache
+from model.database import get_traductions, save_traductions
+from model.upstream_pool import translate_pool
+
+MIN_TEXT_LENGTH = 3
+MAX_BATCH_SIZE = 50
+PRETRADUCTION_LOT = 25
+
+
+def hash_texte(texte: str) -> str:
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()
+
+
+def valider_demande(textes: List[str], langue: str) -> None:
+    """Refuse (ValueError) une langue non proposée ou un texte trop long."""
+    if langue not in TRADUCTION_LANGUES:
+        raise ValueError(
+            f"Langue non prise en charge : {', '.join(TRADUCTION_LANGUES)}"
+        )
+    if any(len(t) > TRADUCTION_MAX_CARACTERES for t in textes):
+        raise ValueError(f"{TRADUCTION_MAX_CARACTERES} caractères maximum par texte")
+
+
+def _google_translate_batch(textes: List[str], langue: str) -> List[str]:
+    return GoogleTranslator(source="auto", target=langue).translate_batch(textes)
+
+
+def _google_translate_batch_borne(textes: List[str], langue: str) -> List[str]:
+    """Appel à Google dans translate_pool (PoolSaturatedError si saturé).
+
+    Seuls les textes absents du LRU et de la table TRADUCTION en arrivent
+    là : les traductions connues ne prennent jamais de place dans le pool.
+    """
+    return translate_pool.run(_google_translate_batch, textes, langue)
+
+
+class TranslationMemory:
+    """Mémoire de traduction : un texte n'est envoyé à Google qu'une seule fois par langue.
+
+    Trois niveaux, du plus rapide au plus lent : un LRU en mémoire (propre au
+    worker), la table TRADUCTION (partagée, clé (hash du texte, langue
+    cible)), puis le traducteur externe pour les seuls textes jamais vus,
+    dont le résultat est ensuite enregistré dans les deux premiers niveaux.
+    """
+
+    def __init__(
+        self,
+        taille_lru: int,
+        traduire_lot_externe: Optional[Callable[[List[str], str], List[str]]] = None,
+    ) -> None:
+        self._lru = LRUCache(taille_lru)
+        self._traduire_lot_externe = (
+            traduire_lot_externe or _google_translate_batch_borne
+        )
+
+    def traduire(
+        self,
+        texte: str,
+        langue: str,
+        conservables: Optional[Callable[[List[str]], Set[str]]] = None,
+    ) -> str:
+        return self.traduire_lot([texte], langue, conservables)[0]
+
+    def traduire_lot(
+        self,
+        textes: List[str],
+        langue: str,
+        conservables: Optional[Callable[[List[str]], Set[str]]] = None,
+    ) -> List[str]:
+        """Traduit `textes` vers `langue` en conservant l'ordre.
+
+        Les doublons ne sont traduits qu'une fois ; les textes trop courts
+        sont renvoyés tels quels (comme le faisait /api/translate).
+        `conservables`, s'il est donné, reçoit les textes qui viennent
+        d'être traduits et renvoie ceux dont la traduction peut être
+        enregistrée ; les autres sont traduits sans être mémorisés.
+        """
+        a_traduire = {
+            hash_texte(t): t for t in textes if t and len(t) >= MIN_TEXT_LENGTH
+        }
+        traductions: Dict[str, str] = {}
+
+        manquants = []
+        for h in a_traduire:
+            connu = self._lru.get((h, langue))
+            if connu is None:
+                manquants.append(h)
+            else:
+                traductions[h] = connu
+
+        if manquants:
+            en_base = get_traductions(manquants, langue)
+            for h, traduit in en_base.items():
+                self._lru.set((h, langue), traduit)
+            traductions.update(en_base)
+            manquants = [h for h in manquants if h not in en_base]
+
+        if manquants:
+            sources = [a_traduire[h] for h in manquants]
+            traduits = self._traduire_lot_externe(sources, langue)
+            a_conserver = (
+                set(sources) if conservables is None else conservables(sources)
+            )
+            nouvelles = []
+            for h, source, traduit in zip(manquants, sources, traduits):
+                if not traduit:
+                    continue
+                traductions[h] = traduit
+                if source not in a_conserver:
+                    continue
+                self._lru.set((h, langue), traduit)
+                nouvelles.append((h, langue, source, traduit))
+            save_traductions(nouvelles)
+
+        return [traductions.get(hash_texte(t), t) if t else t for t in textes]
+
+    def stats(self) -> Dict[str, int]:
+        return {"lru_taille": len(self._lru), "hits": self._lru.hits}
+
+
+translation_memory = TranslationMemory(TRANSLATION_LRU_SIZE)
+
+
+def pretraduire_en_arriere_plan(
+    textes: List[str], langues: Optional[List[str]] = None
+) -> threading.Thread:
+    """Pré-remplit la mémoire de traduction dans un thread, par lots.
+
+    Utilisé après l'ingestion NASA : les fiches sont ensuite affichées en
+    français sans attendre le traducteur. Les textes de plus de
+    TRADUCTION_MAX_CARACTERES sont écartés (/api/translate les refuserait
+    aussi). Un lot en échec est journalisé puis sauté, pas propagé (la
+    traduction à la demande reste possible).
+    """
+    langues = langues or PRETRADUCTION_LANGUES
+    uniques = list(dict.fromkeys(t for t in textes if t))
+    retenus = [t for t in uniques if len(t) <= TRADUCTION_MAX_CARACTERES]
+
+    def travail() -> None:
+        traduits = 0
+        for langue in langues:
+            for debut in range(0, len(retenus), PRETRADUCTION_LOT):
+                fin = debut + PRETRADUCTION_LOT
+                lot = retenus[debut:fin]
+                try:
+                    translation_memory.traduire_lot(lot, langue)
+                except Exception as e:
+                    print(
+                        f"❌ Pré-traduction ({langue}) : lot {debut}-{fin} ignoré : {e}"
+                    )
+                    continue
+                traduits += len(lot)
+        print(
+            f"✅ Pré-traduction terminée : {traduits}/{len(uniques) * len(langues)} "
+            f"traductions, {len(uniques) - len(retenus)} textes trop longs "
+            f"écartés, {langues}"
+        )
+
+    thread = threading.Thread(target=travail, name="pretraduction", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,153 @@
+# model/upstream_pool.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict
+
+from config import (
+    CHATBOT_POOL_WORKERS,
+    CHATBOT_POOL_QUEUE,
+    TRANSLATE_POOL_WORKERS,
+    TRANSLATE_POOL_QUEUE,
+    UPSTREAM_QUEUE_TIMEOUT,
+    UPSTREAM_CALL_TIMEOUT,
+)
+
+
+class PoolSaturatedError(Exception):
+    """Le pool n'a pas pu prendre en charge l'appel (file pleine ou délai dépassé).
+
+    Volontairement distincte de RuntimeError : les routes la traduisent en
+    503 (réessayer plus tard), pas en 500.
+    """
+
+
+class UpstreamPool:
+    """Pool de threads borné dédié aux appels vers un service externe lent.
+
+    Les appels à Gemini ou à Google Translate passent l'essentiel de leur
+    temps à attendre le réseau. Sans limite, quelques appels lents occupent
+    tous les threads du worker gunicorn et plus aucune page ne s'affiche.
+    Ici, au plus `max_workers` appels tournent en parallèle et au plus
+    `max_queue` attendent leur tour : au-delà, l'appel est refusé tout de
+    suite (PoolSaturatedError) au lieu de bloquer un thread de plus. Tant que
+    `max_workers + max_queue` reste inférieur au nombre de threads du worker
+    (voir gunicorn.conf.py), des threads restent disponibles pour les pages.
+    """
+
+    def __init__(
+        self,
+        nom: str,
+        max_workers: int,
+        max_queue: int,
+        queue_timeout: float,
+        call_timeout: float,
+    ) -> None:
+        self.nom = nom
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+        # Les threads de l'executor sont créés à la première soumission, donc
+        # après le fork des workers gunicorn : l'instance peut vivre au niveau module.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"amont-{nom}"
+        )
+        self._admissions = threading.BoundedSemaphore(max_workers + max_queue)
+        self._verrou = threading.Lock()
+        self._compteurs = {
+            "en_cours": 0,
+            "en_attente": 0,
+            "termines": 0,
+            "echecs": 0,
+            "rejetes": 0,
+            "expires": 0,
+        }
+
+    def _incrementer(self, **deltas: int) -> None:
+        with self._verrou:
+            for cle, delta in deltas.items():
+                self._compteurs[cle] += delta
+
+    def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Exécute `fn(*args, **kwargs)` dans le pool et renvoie son résultat.
+
+        Les exceptions levées par `fn` sont propagées telles quelles. Lève
+        PoolSaturatedError si la file est pleine, si l'appel a attendu plus
+        de `queue_timeout` secondes avant de démarrer, ou s'il n'a pas
+        abouti dans le délai total imparti.
+        """
+        if not self._admissions.acquire(blocking=False):
+            self._incrementer(rejetes=1)
+            print(f"⚠️ Pool {self.nom} saturé : appel refusé ({self.stats()})")
+            raise PoolSaturatedError(
+                "Service momentanément surchargé. Réessaye dans un instant."
+            )
+
+        soumis = time.monotonic()
+        self._incrementer(en_attente=1)
+
+        def tache() -> Any:
+            self._incrementer(en_attente=-1)
+            if time.monotonic() - soumis > self.queue_timeout:
+                self._incrementer(expires=1)
+                raise PoolSaturatedError(
+                    "Service momentanément surchargé. Réessaye dans un instant."
+                )
+            self._incrementer(en_cours=1)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._incrementer(en_cours=-1)
+
+        future = self._executor.submit(tache)
+        future.add_done_callback(lambda _: self._admissions.release())
+        try:
+            resultat = future.result(timeout=self.queue_timeout + self.call_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                self._incrementer(en_attente=-1)
+            self._incrementer(expires=1)
+            raise PoolSaturatedError("Le service externe met trop de temps à répondre.")
+        except PoolSaturatedError:
+            raise
+        except Exception:
+            self._incrementer(echecs=1)
+            raise
+        self._incrementer(termines=1)
+        return resultat
+
+    def stats(self) -> Dict[str, Any]:
+        """Instantané de l'occupation du pool (pour la supervision)."""
+        with self._verrou:
+            compteurs = dict(self._compteurs)
+        capacite = self.max_workers + self.max_queue
+        occupation = compteurs["en_cours"] + compteurs["en_attente"]
+        return {
+            "nom": self.nom,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            **compteurs,
+            "saturation": round(occupation / capacite, 2) if capacite else 1.0,
+        }
+
+
+chatbot_pool = UpstreamPool(
+    "chatbot",
+    CHATBOT_POOL_WORKERS,
+    CHATBOT_POOL_QUEUE,
+    UPSTREAM_QUEUE_TIMEOUT,
+    UPSTREAM_CALL_TIMEOUT,
+)
+translate_pool = UpstreamPool(
+    "traduction",
+    TRANSLATE_POOL_WORKERS,
+    TRANSLATE_POOL_QUEUE,
+    UPSTREAM_QUEUE_TIMEOUT,
+    UPSTREAM_CALL_TIMEOUT,
+)
+
+
+def get_pools_stats() -> Dict[str, Dict[str, Any]]:
+    return {pool.nom: pool.stats() for pool in (chatbot_pool, translate_pool)}
@@ -0,0 +1,73 @@
+# nettoyer_outbox.py - Applique les nettoyages planifiés dans NETTOYAGE_OUTBOX
+#
+# Supprimer un objet céleste ou un utilisateur dans PostgreSQL écrit, dans la
+# même transaction, les nettoyages à faire ailleurs : commentaires MongoDB de
+# l'objet, fichiers téléversés devenus orphelins. Ce script les applique par
+# lots, avec nouvel essai espacé en cas d'échec (voir model/nettoyage_outbox.py).
+# Plusieurs instances peuvent tourner en parallèle : les lots sont réservés
+# avec FOR UPDATE SKIP LOCKED.
+#
+#   python nettoyer_outbox.py             # en continu (service à part, hors gunicorn)
+#   python nettoyer_outbox.py --une-fois  # vide la file puis s'arrête (cron)
+#   python nettoyer_outbox.py --rattraper # + planifie les orphelins déjà présents
+#   python nettoyer_outbox.py --stats     # tâches en attente / abandonnées
+
+import argparse
+import time
+
+from config import OUTBOX_INTERVALLE, OUTBOX_MAX_TENTATIVES, OUTBOX_TAILLE_LOT
+from model.comment_service import commentaire_service
+from model.database import get_stats_outbox, planifier_purge_objets_absents
+from model.nettoyage_outbox import traiter_lot
+
+
+def vider_file() -> int:
+    """Traite des lots tant qu'ils reviennent pleins ; renvoie le nombre de tâches appliquées."""
+    total = 0
+    while True:
+        bilan = traiter_lot()
+        total += bilan["traitees"]
+        if bilan["traitees"] + bilan["echecs"] < OUTBOX_TAILLE_LOT:
+            return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nettoyages MongoDB / fichiers.")
+    parser.add_argument(
+        "--une-fois",
+        action="store_true",
+        help="Vide la file une fois puis s'arrête.",
+    )
+    parser.add_argument(
+        "--rattraper",
+        action="store_true",
+        help="Planifie la purge des commentaires d'objets déjà supprimés.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Affiche le nombre de tâches en attente et abandonnées.",
+    )
+    args = parser.parse_args()
+
+    if args.stats:
+        print(f"📊 Outbox : {get_stats_outbox(OUTBOX_MAX_TENTATIVES)}")
+        return
+
+    if args.rattraper:
+        ajoutees = planifier_purge_objets_absents(
+            commentaire_service.get_objets_commentes()
+        )
+        print(f"✅ {ajoutees} objets supprimés à purger de MongoDB.")
+
+    while True:
+        appliquees = vider_file()
+        if appliquees:
+            print(f"🧹 {appliquees} nettoyages appliqués.")
+        if args.une_fois:
+            return
+        time.sleep(OUTBOX_INTERVALLE)
+
+
+if __name__ == "__main__":
+    main()
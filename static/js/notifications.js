@@ -0,0 +1,57 @@
+// static/js/notifications.js - Notifications en direct (flux SSE de Mon espace)
+//
+// Le serveur pousse les décisions sur les propositions et les réponses aux
+// commentaires. EventSource se reconnecte seul (délai fixé par `retry:`) en
+// renvoyant Last-Event-ID : les événements manqués entre-temps sont rejoués.
+
+(() => {
+    const script = document.currentScript;
+    if (!window.EventSource || !script) {
+        return;
+    }
+    const zone = document.getElementById('notifs-direct');
+    const STATUTS = { accepte: 'acceptée', modifie: 'acceptée (modifiée)', refuse: 'refusée' };
+
+    function majBadges(nb) {
+        document.querySelectorAll('[data-badge-notifs]').forEach((badge) => {
+            badge.textContent = nb;
+            badge.title = `${nb} proposition(s) traitée(s) depuis votre dernière visite`;
+            badge.classList.toggle('hidden', !nb);
+        });
+    }
+
+    function afficher(message, lien) {
+        if (!zone) {
+            return;
+        }
+        const carte = document.createElement('a');
+        carte.href = lien;
+        carte.className = 'block p-3 rounded-lg shadow-md bg-blue-800 text-white text-sm hover:bg-blue-700 transition';
+        carte.textContent = message;
+        zone.appendChild(carte);
+        setTimeout(() => carte.remove(), 8000);
+    }
+
+    const source = new EventSource(script.dataset.flux);
+
+    source.addEventListener('etat', (e) => {
+        majBadges(JSON.parse(e.data).nb_notifs_non_lues);
+    });
+
+    source.addEventListener('proposition', (e) => {
+        const evenement = JSON.parse(e.data);
+        majBadges(evenement.nb_notifs_non_lues);
+        afficher(
+            `Votre proposition « ${evenement.nom_fr} » a été ${STATUTS[evenement.statut] || 'traitée'}.`,
+            script.dataset.espace
+        );
+    });
+
+    source.addEventListener('reponse', (e) => {
+        const evenement = JSON.parse(e.data);
+        afficher(
+            `@${evenement.pseudo} a répondu à votre commentaire.`,
+            script.dataset.objet.replace(/\/0$/, `/${evenement.objet_id}`) + '#commentaires'
+        );
+    });
+})();
@@ -0,0 +1,37 @@
+# tests/conftest.py
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client_admin():
+    """Client connecté en admin (id 7), protection CSRF désactivée."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["is_admin"] = True
+        session["admin_id"] = 7
+    with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}):
+        yield client
+
+
+@pytest.fixture
+def connexion_factice():
+    """Fabrique de connexions PostgreSQL factices, renvoie (conn, cur).
+
+    `effets` : un effet (exception ou None) par execute() ; `ligne` et
+    `lignes` : ce que renvoient fetchone() et fetchall().
+    """
+
+    def fabriquer(*effets, ligne=None, lignes=()):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        if effets:
+            cur.execute.side_effect = list(effets)
+        cur.fetchone.return_value = ligne
+        cur.fetchall.return_value = list(lignes)
+        return conn, cur
+
+    return fabriquer
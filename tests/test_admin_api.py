@@ -0,0 +1,255 @@
+# tests/test_admin_api.py
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app import app
+from controller.admin_routes import _resume_admin
+from model.database import traiter_proposition
+from model.pagination import decoder_curseur, encoder_curseur
+
+
+def test_api_commentaires_refuse_sans_session_admin():
+    with app.test_client() as client:
+        response = client.get("/admin/api/commentaires")
+        assert response.status_code == 302
+
+
+@patch("controller.admin_routes.get_noms_objets", return_value={1: "Mars"})
+@patch("controller.admin_routes.commentaire_service")
+def test_api_commentaires_renvoie_une_page_et_son_curseur(mock_service, mock_noms, client_admin):
+    service = mock_service
+    service.get_fil_moderation.return_value = (
+        [{"commentaire_id": "a", "objet_id": 1, "date": "2026-03-01T00:00:00"}],
+        "curseur-suivant",
+    )
+
+    response = client_admin.get(
+        "/admin/api/commentaires?limite=1&non_lus=1&depuis=2026-02-01T00:00:00&auteur=bob"
+    )
+
+    data = response.get_json()
+    assert data["curseur_suivant"] == "curseur-suivant"
+    assert data["commentaires"][0]["nom_objet"] == "Mars"
+    assert data["commentaires"][0]["nouveau"] is True
+    service.get_fil_moderation.assert_called_once_with(
+        limite=1,
+        curseur=None,
+        depuis="2026-02-01T00:00:00",
+        objet_id=None,
+        pseudo="bob",
+    )
+
+
+@patch("controller.admin_routes.commentaire_service")
+def test_api_commentaires_curseur_invalide_renvoie_400(mock_service, client_admin):
+    mock_service.get_fil_moderation.side_effect = ValueError(
+        "Curseur invalide"
+    )
+
+    response = client_admin.get("/admin/api/commentaires?curseur=xxx&depuis=")
+
+    assert response.status_code == 400
+
+
+RESUME = {
+    "nb_objets": 12,
+    "nb_en_attente": 3,
+    "nb_notifs_non_lues": 5,
+    "nb_utilisateurs": 40,
+    "nb_utilisateurs_actifs": 31,
+    "nb_admins": 2,
+    "categories": [],
+}
+
+
+@pytest.fixture
+def resume_vide():
+    """Chaque test part d'un résumé admin non mis en cache."""
+    _resume_admin.clear()
+    yield
+    _resume_admin.clear()
+
+
+@patch("controller.admin_routes.commentaire_service")
+@patch("controller.admin_routes.get_resume_admin", return_value=RESUME)
+def test_dashboard_ne_rend_que_les_compteurs(mock_resume, mock_service, resume_vide, client_admin):
+    mock_service.get_derniere_lecture.return_value = None
+    mock_service.count_non_lus.return_value = 0
+
+    response = client_admin.get("/admin_dashboard")
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "40 <span" in html
+    assert "dont 31 actifs" in html
+    assert "/admin/api/propositions" in html
+
+
+@patch("controller.admin_routes.delete_utilisateur", return_value=True)
+@patch("controller.admin_routes.commentaire_service")
+@patch("controller.admin_routes.get_resume_admin", return_value=RESUME)
+def test_resume_admin_mis_en_cache_puis_invalide(mock_resume, mock_service, mock_delete, resume_vide, client_admin):
+    mock_service.get_derniere_lecture.return_value = None
+    mock_service.count_non_lus.return_value = 0
+    client_admin.get("/admin_dashboard")
+    client_admin.get("/admin_dashboard")
+    assert mock_resume.call_count == 1
+
+    client_admin.post("/admin/delete-user/4")
+    client_admin.get("/admin_dashboard")
+    assert mock_resume.call_count == 2
+
+
+@patch("controller.admin_routes.get_doublons_propositions")
+@patch("controller.admin_routes.get_propositions_page")
+def test_api_propositions_page_et_curseur_iso(mock_page, mock_doublons, client_admin):
+    mock_page.return_value = [
+        {"id_proposition": 9, "statut": "en_attente", "date_proposition": datetime(2026, 3, 2, 10, 0)},
+        {"id_proposition": 8, "statut": "en_attente", "date_proposition": datetime(2026, 3, 1, 10, 0)},
+    ]
+    doublon = {"id_objet": 3, "nom_fr": "Nébuleuse d'Orion", "nom_scientifique": "M42", "score": 0.82}
+    mock_doublons.return_value = {9: doublon}
+
+    data = client_admin.get("/admin/api/propositions?limite=1&statut=en_attente").get_json()
+
+    assert data["propositions"] == [
+        {
+            "id_proposition": 9,
+            "statut": "en_attente",
+            "date_proposition": "2026-03-02T10:00:00",
+            "doublon": doublon,
+        }
+    ]
+    assert decoder_curseur(data["curseur_suivant"], 2) == ["2026-03-02T10:00:00", 9]
+    mock_page.assert_called_once_with(1, None, "en_attente", False)
+
+
+@patch("controller.admin_routes.get_doublons_propositions", return_value={})
+@patch("controller.admin_routes.get_propositions_page")
+def test_api_propositions_ne_cherche_les_doublons_que_des_propositions_en_attente(mock_page, mock_doublons, client_admin):
+    mock_page.return_value = [
+        {"id_proposition": 9, "statut": "refuse", "date_proposition": datetime(2026, 3, 2)},
+        {"id_proposition": 8, "statut": "en_attente", "date_proposition": datetime(2026, 3, 1)},
+    ]
+
+    data = client_admin.get("/admin/api/propositions").get_json()
+
+    mock_doublons.assert_called_once_with([8])
+    mock_page.assert_called_once_with(25, None, None, False)
+    assert [p["doublon"] for p in data["propositions"]] == [None, None]
+
+
+@patch("controller.admin_routes.get_utilisateurs_page", return_value=[])
+def test_api_utilisateurs_derniere_page_sans_curseur(mock_page, client_admin):
+    curseur = encoder_curseur(datetime(2026, 1, 1), 5)
+
+    data = client_admin.get(f"/admin/api/utilisateurs?curseur={curseur}").get_json()
+
+    assert data == {"utilisateurs": [], "curseur_suivant": None}
+    mock_page.assert_called_once_with(25, ["2026-01-01T00:00:00", 5], None, "desc")
+
+
+def test_api_panneaux_rejettent_curseur_ou_statut_invalide(client_admin):
+    assert client_admin.get("/admin/api/objets?curseur=xxx").status_code == 400
+    assert client_admin.get("/admin/api/admins?curseur=xxx").status_code == 400
+    assert client_admin.get(f"/admin/api/admins?curseur={encoder_curseur(None)}").status_code == 400
+    assert client_admin.get(f"/admin/api/admins?curseur={encoder_curseur([3])}").status_code == 400
+    assert client_admin.get("/admin/api/propositions?statut=supprime").status_code == 400
+
+
+@patch("controller.admin_routes.traiter_propositions_lot")
+def test_lot_de_propositions_resultats_et_debit(mock_lot, resume_vide, client_admin):
+    mock_lot.return_value = [
+        {"id_proposition": 3, "resultat": "publiee", "id_objet": 40},
+        {"id_proposition": 5, "resultat": "doublon", "id_objet": None},
+        {"id_proposition": 8, "resultat": "deja_traitee", "id_objet": None},
+    ]
+    decisions = [
+        {"id_proposition": 3, "statut": "accepte", "commentaire": " Bravo "},
+        {"id_proposition": "5", "statut": "accepte"},
+        {"id_proposition": 8, "statut": "accepte"},
+    ]
+
+    response = client_admin.post("/admin/api/propositions/lot", json={"decisions": decisions})
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["bilan"] == {"publiee": 1, "doublon": 1, "deja_traitee": 1}
+    assert data["resultats"][0]["id_objet"] == 40
+    assert "duree_ms" in data and "par_seconde" in data
+    mock_lot.assert_called_once_with(
+        [(3, "accepte", "Bravo"), (5, "accepte", ""), (8, "accepte", "")], 7
+    )
+
+
+@patch("controller.admin_routes.traiter_propositions_lot")
+def test_lot_de_propositions_refuse_les_decisions_invalides(mock_lot, client_admin):
+    for corps in (
+        {},
+        {"decisions": []},
+        {"decisions": [{"id_proposition": 3, "statut": "modifie"}]},
+        {"decisions": [{"statut": "accepte"}]},
+        {"decisions": [{"id_proposition": 1, "statut": "refuse"}] * 501},
+    ):
+        assert client_admin.post("/admin/api/propositions/lot", json=corps).status_code == 400
+    mock_lot.assert_not_called()
+
+
+@patch("controller.admin_routes.get_doublons_propositions", return_value={})
+@patch("controller.admin_routes.reserver_propositions")
+def test_reserver_propositions_pour_l_admin_connecte(mock_reserver, mock_doublons, client_admin):
+    mock_reserver.return_value = [
+        {
+            "id_proposition": 2,
+            "statut": "en_attente",
+            "reserve_par": 7,
+            "reserve_jusqu_a": datetime(2026, 3, 1, 10, 15),
+        }
+    ]
+
+    response = client_admin.post("/admin/api/propositions/reserver", json={"limite": 500})
+
+    data = response.get_json()
+    assert data["propositions"][0]["reserve_jusqu_a"] == "2026-03-01T10:15:00"
+    assert mock_reserver.call_args[0][:2] == (7, 100)
+
+
+@patch("controller.admin_routes.liberer_propositions", return_value=2)
+def test_liberer_propositions(mock_liberer, client_admin):
+    assert client_admin.post("/admin/api/propositions/liberer", json={"ids": ["4", 5]}).get_json() == {"liberees": 2}
+    mock_liberer.assert_called_once_with(7, [4, 5])
+    assert client_admin.post("/admin/api/propositions/liberer", json={"ids": ["x"]}).status_code == 400
+
+
+@patch("controller.admin_routes.traiter_proposition", return_value="reservee")
+def test_decision_unitaire_sur_proposition_reservee_par_un_autre_admin(mock_traiter, client_admin):
+    client_admin.post("/admin/proposition/4/traiter", data={"statut": "refuse"})
+
+    assert mock_traiter.call_args[0][-1] == 7
+    with client_admin.session_transaction() as session:
+        assert session["_flashes"] == [
+            ("error", "Proposition en cours de traitement par un autre administrateur.")
+        ]
+
+
+def test_decision_unitaire_respecte_la_reservation(connexion_factice):
+    conn, cur = connexion_factice()
+    cur.fetchone.side_effect = [None, {"statut": "en_attente"}]
+
+    with patch("model.database.get_db_connection", return_value=conn):
+        assert traiter_proposition(4, "refuse", "", admin_id=7) == "reservee"
+
+    requete, params = cur.execute.call_args_list[0][0]
+    assert "statut = 'en_attente'" in requete and "reserve_par IS NOT DISTINCT FROM" in requete
+    assert params[-1] == 7
+    conn.commit.assert_not_called()
+
+
+@patch("controller.admin_routes.get_doublons_propositions", return_value={})
+@patch("controller.admin_routes.get_propositions_page", return_value=[])
+def test_api_propositions_archives_seulement_sur_demande(mock_page, mock_doublons, client_admin):
+    client_admin.get("/admin/api/propositions?statut=traitees&historique=1")
+
+    mock_page.assert_called_once_with(25, None, "traitees", True)
@@ -0,0 +1,110 @@
+# tests/test_admin_utilisateurs.py
+from unittest.mock import patch
+
+import psycopg2.errors
+
+from model.database import get_utilisateurs_page
+
+
+@patch("controller.admin_routes.get_utilisateurs_page", return_value=[])
+def test_api_utilisateurs_recherche_et_ordre(mock_page, client_admin):
+    reponse = client_admin.get(
+        "/admin/api/utilisateurs?q=%20dupont%20&ordre=asc&limite=10"
+    )
+
+    assert reponse.status_code == 200
+    mock_page.assert_called_once_with(10, None, "dupont", "asc")
+    assert client_admin.get("/admin/api/utilisateurs?ordre=hasard").status_code == 400
+
+
+def test_recherche_par_trigrammes_et_ordre_croissant(connexion_factice):
+    conn, cur = connexion_factice(None, lignes=[{"id_utilisateur": 1}])
+
+    with patch("model.database.get_db_connection", return_value=conn):
+        lignes = get_utilisateurs_page(20, ["2026-01-01T00:00:00", 5], "50%_dup", "asc")
+
+    assert lignes == [{"id_utilisateur": 1}]
+    requete, params = cur.execute.call_args[0]
+    assert "normaliser_nom(pseudo || ' ' || prenom" in requete
+    assert "lower(u.pseudo) LIKE" not in requete
+    assert "ORDER BY u.date_inscription ASC" in requete
+    assert "(u.date_inscription, u.id_utilisateur) >" in requete
+    # Jokers de LIKE saisis par l'admin pris littéralement
+    assert params["texte"] == "50\\%\\_dup"
+    assert params["limite"] == 21
+
+
+def test_recherche_repli_sur_les_prefixes_sans_pg_trgm(connexion_factice):
+    conn, cur = connexion_factice(
+        psycopg2.errors.UndefinedFunction("normaliser_nom"), None, lignes=[{"id_utilisateur": 1}]
+    )
+
+    with patch("model.database.get_db_connection", return_value=conn):
+        lignes = get_utilisateurs_page(20, recherche="Dupont")
+
+    assert lignes == [{"id_utilisateur": 1}]
+    conn.rollback.assert_called_once()
+    requete, params = cur.execute.call_args[0]
+    assert "normaliser_nom" not in requete
+    assert "lower(u.email) LIKE %(prefixe)s" in requete
+    assert "ORDER BY u.date_inscription DESC" in requete
+    assert params["prefixe"] == "dupont%"
+
+
+def test_recherche_courte_par_prefixes_seulement(connexion_factice):
+    conn, cur = connexion_factice(None, lignes=[{"id_utilisateur": 1}])
+
+    with patch("model.database.get_db_connection", return_value=conn):
+        get_utilisateurs_page(20, recherche="du")
+
+    assert cur.execute.call_count == 1
+    assert "normaliser_nom" not in cur.execute.call_args[0][0]
+
+
+def test_page_sans_recherche_ne_lit_que_les_colonnes_de_l_index_couvrant(connexion_factice):
+    conn, cur = connexion_factice(None, lignes=[{"id_utilisateur": 1}])
+
+    with patch("model.database.get_db_connection", return_value=conn):
+        get_utilisateurs_page(20)
+
+    requete = cur.execute.call_args[0][0]
+    assert "u.*" not in requete and "mot_de_passe_hash" not in requete
+    assert "WHERE" not in requete.split("CROSS JOIN")[0]
+
+
+@patch("controller.admin_routes.basculer_utilisateur")
+def test_basculer_depuis_le_panneau_renvoie_du_json(mock_basculer, client_admin):
+    mock_basculer.return_value = {"est_actif": False, "pseudo": "vega"}
+
+    reponse = client_admin.post(
+        "/admin/toggle-user/4", headers={"Accept": "application/json"}
+    )
+
+    assert reponse.get_json() == {"est_actif": False}
+    mock_basculer.assert_called_once_with(4)
+
+    mock_basculer.return_value = None
+    reponse = client_admin.post(
+        "/admin/toggle-user/4", headers={"Accept": "application/json"}
+    )
+    assert reponse.status_code == 404
+
+
+@patch("controller.admin_routes.basculer_utilisateur")
+def test_basculer_par_formulaire_redirige_vers_l_onglet(mock_basculer, client_admin):
+    mock_basculer.return_value = {"est_actif": True, "pseudo": "vega"}
+
+    reponse = client_admin.post("/admin/toggle-user/4", headers={"Accept": "text/html"})
+
+    assert reponse.status_code == 302
+    assert reponse.headers["Location"].endswith("#section-utilisateurs")
+
+
+@patch("controller.admin_routes.delete_utilisateur", return_value=True)
+def test_supprimer_depuis_le_panneau_renvoie_du_json(mock_delete, client_admin):
+    reponse = client_admin.post(
+        "/admin/delete-user/4", headers={"Accept": "application/json"}
+    )
+
+    assert reponse.get_json() == {"supprime": True}
+    mock_delete.assert_called_once_with(4)
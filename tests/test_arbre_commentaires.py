@@ -0,0 +1,44 @@
+# tests/test_arbre_commentaires.py
+import sys
+
+from model.arbre_commentaires import construire_racines, parcourir
+
+
+def _noeud(commentaire_id, parent_id=None):
+    return {"commentaire_id": commentaire_id, "parent_id": parent_id}
+
+
+def _fil():
+    # a ─ b ─ d
+    #   └ c
+    # e
+    return construire_racines(
+        [_noeud("a"), _noeud("b", "a"), _noeud("c", "a"), _noeud("d", "b"), _noeud("e")]
+    )
+
+
+def test_parcourir_suit_l_ordre_d_affichage():
+    assert [(n["commentaire_id"], p) for n, p in parcourir(_fil())] == [
+        ("a", 0),
+        ("b", 1),
+        ("d", 2),
+        ("c", 1),
+        ("e", 0),
+    ]
+
+
+def test_orphelin_et_ses_descendants_sont_ignores():
+    racines = construire_racines([_noeud("a"), _noeud("b", "disparu"), _noeud("c", "b")])
+    assert [n["commentaire_id"] for n, _ in parcourir(racines)] == ["a"]
+
+
+def test_fil_plus_profond_que_la_limite_de_recursion():
+    profondeur = sys.getrecursionlimit() * 2
+    noeuds = [_noeud("c0")] + [
+        _noeud(f"c{i}", f"c{i - 1}") for i in range(1, profondeur)
+    ]
+
+    parcours = list(parcourir(construire_racines(noeuds)))
+
+    assert len(parcours) == profondeur
+    assert parcours[-1] == (noeuds[-1], profondeur - 1)
@@ -0,0 +1,30 @@
+# tests/test_cache_utils.py
+from unittest.mock import patch
+
+from model.cache_utils import LRUCache
+
+
+def test_lru_evince_la_cle_la_moins_recente():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+@patch("model.cache_utils.time.monotonic")
+def test_entree_expiree_comptee_comme_absente(mock_horloge):
+    mock_horloge.return_value = 100.0
+    cache = LRUCache(4, ttl=5)
+    cache.set("resume", {"nb_objets": 3})
+
+    mock_horloge.return_value = 104.0
+    assert cache.get("resume") == {"nb_objets": 3}
+
+    mock_horloge.return_value = 105.5
+    assert cache.get("resume") is None
+    assert len(cache) == 0
+    assert cache.misses == 1
@@ -0,0 +1,33 @@
+# tests/test_comment_routes.py
+from unittest.mock import patch
+
+from app import app
+
+
+@patch("controller.comment_routes.commentaire_service")
+def test_lister_commentaires_renvoie_les_reponses_d_un_commentaire(mock_service):
+    service = mock_service
+    service.get_reponses.return_value = (
+        [{"commentaire_id": "b", "texte": "Réponse", "nb_reponses": 2}],
+        "curseur-suivant",
+    )
+
+    with app.test_client() as client:
+        response = client.get("/objet/1/commentaires?parent_id=a&limite=5")
+
+    data = response.get_json()
+    assert data["curseur_suivant"] == "curseur-suivant"
+    assert data["commentaires"][0]["nb_reponses"] == 2
+    service.get_reponses.assert_called_once_with(
+        1, parent_id="a", limite=5, curseur=None
+    )
+
+
+@patch("controller.comment_routes.commentaire_service")
+def test_lister_commentaires_curseur_invalide_renvoie_400(mock_service):
+    mock_service.get_reponses.side_effect = ValueError("Curseur invalide")
+
+    with app.test_client() as client:
+        response = client.get("/objet/1/commentaires?curseur=xxx")
+
+    assert response.status_code == 400
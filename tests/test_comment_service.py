@@ -1,161 +1,301 @@
 # tests/test_comment_service.py
-from unittest.mock import MagicMock, patch
-import pytest
+import copy
+from unittest.mock import MagicMock
 
-from model.comment_service import CommentaireService, MAX_COMMENT_LENGTH
+import pytest
+from pymongo.errors import PyMongoError
+
+from model.comment_service import (
+    CommentaireService,
+    MAX_COMMENT_LENGTH,
+    TAILLE_PAGE_FIL,
+    MAX_NON_LUS,
+    construire_arbre,
+)
+from model.pagination import encoder_curseur
+
+
+class _Resultat:
+    def __init__(self, deleted_count=0):
+        self.deleted_count = deleted_count
+
+
+def _correspond(doc, query):
+    for cle, attendu in query.items():
+        if cle == "$or":
+            if not any(_correspond(doc, q) for q in attendu):
+                return False
+            continue
+        if cle == "$and":
+            if not all(_correspond(doc, q) for q in attendu):
+                return False
+            continue
+        valeur = doc.get(cle)
+        if isinstance(attendu, dict) and "$in" in attendu:
+            if valeur not in attendu["$in"]:
+                return False
+        elif isinstance(attendu, dict) and "$gt" in attendu:
+            if not valeur > attendu["$gt"]:
+                return False
+        elif isinstance(attendu, dict) and "$lt" in attendu:
+            if not valeur < attendu["$lt"]:
+                return False
+        elif isinstance(valeur, list) and not isinstance(attendu, list):
+            if attendu not in valeur:
+                return False
+        elif valeur != attendu:
+            return False
+    return True
+
+
+def _projeter(doc, projection):
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    if any(projection.get(k) for k in projection if k != "_id"):
+        garder = {k for k, v in projection.items() if v}
+        return {k: v for k, v in doc.items() if k in garder}
+    return {k: v for k, v in doc.items() if projection.get(k, 1)}
+
+
+class _Curseur(list):
+    def sort(self, cle, sens=1):
+        ordre = cle if isinstance(cle, list) else [(cle, sens)]
+        resultat = list(self)
+        for champ, sens_champ in reversed(ordre):
+            resultat.sort(key=lambda d: d.get(champ), reverse=sens_champ < 0)
+        return _Curseur(resultat)
+
+    def limit(self, n):
+        return _Curseur(self[:n])
 
 
 class _FakeCollection:
     """Simule les opérations pymongo utilisées par CommentaireService,
-    sur un ensemble de documents {objet_id: {...}} tenus en mémoire.
+    sur une liste de documents (un par commentaire) tenue en mémoire.
     """
 
     def __init__(self, docs=None):
-        self._docs = {d["objet_id"]: dict(d) for d in (docs or [])}
-        for i, d in enumerate(self._docs.values()):
-            d.setdefault("_id", i)
+        self.docs = [copy.deepcopy(d) for d in (docs or [])]
+
+    def find(self, query=None, projection=None):
+        return _Curseur(
+            _projeter(d, projection) for d in self.docs if _correspond(d, query or {})
+        )
+
+    def find_one(self, query, projection=None):
+        trouves = self.find(query, projection)
+        return trouves[0] if trouves else None
+
+    def insert_one(self, doc):
+        self.docs.append(copy.deepcopy(doc))
+
+    def delete_one(self, query):
+        for i, d in enumerate(self.docs):
+            if _correspond(d, query):
+                del self.docs[i]
+                return _Resultat(1)
+        return _Resultat(0)
+
+    def delete_many(self, query):
+        avant = len(self.docs)
+        self.docs = [d for d in self.docs if not _correspond(d, query)]
+        return _Resultat(avant - len(self.docs))
+
+    def update_many(self, query, update):
+        for d in self.docs:
+            if not _correspond(d, query):
+                continue
+            d.update(update.get("$set", {}))
+            for champ, delta in update.get("$inc", {}).items():
+                d[champ] = d.get(champ, 0) + delta
 
-    def find_one(self, query):
-        return self._docs.get(query.get("objet_id"))
+    def count_documents(self, query, limit=0):
+        total = len(self.find(query))
+        return min(total, limit) if limit else total
 
-    def find(self):
-        return list(self._docs.values())
+
+class _FakeCompteurs:
+    """Compteurs par objet : $inc avec upsert."""
+
+    def __init__(self):
+        self.docs = {}
 
     def update_one(self, filt, update, upsert=False):
-        commentaires = update["$set"]["commentaires"]
-        if "objet_id" in filt:
-            objet_id = filt["objet_id"]
-            if objet_id in self._docs:
-                self._docs[objet_id]["commentaires"] = commentaires
-            elif upsert:
-                self._docs[objet_id] = {
-                    "objet_id": objet_id,
-                    "commentaires": commentaires,
-                    "_id": len(self._docs),
-                }
-        elif "_id" in filt:
-            for d in self._docs.values():
-                if d["_id"] == filt["_id"]:
-                    d["commentaires"] = commentaires
-
-
-def _service_with_mock_collection(existing_commentaires=None):
-    collection = MagicMock()
-    collection.find_one.return_value = (
-        {"objet_id": 1, "commentaires": existing_commentaires}
-        if existing_commentaires is not None
-        else None
-    )
-    with patch(
-        "model.comment_service.get_commentaires_collection", return_value=collection
-    ):
-        service = CommentaireService()
-    return service, collection
+        doc = self.docs.setdefault(filt["objet_id"], {"objet_id": filt["objet_id"]})
+        for champ, delta in update["$inc"].items():
+            doc[champ] = doc.get(champ, 0) + delta
+
+    def find_one(self, filt, projection=None):
+        return self.docs.get(filt["objet_id"])
+
+    def find(self, filt, projection=None):
+        return [d for i, d in self.docs.items() if i in filt["objet_id"]["$in"]]
+
+    def delete_many(self, filt):
+        for objet_id in filt["objet_id"]["$in"]:
+            self.docs.pop(objet_id, None)
+
+
+class _FakeLectures:
+    """Marques de lecture par admin : find_one et $max avec upsert."""
 
+    def __init__(self):
+        self.docs = {}
 
-def _service_with_fake_collection(docs=None):
+    def find_one(self, filt, projection=None):
+        return self.docs.get(filt["admin_id"])
+
+    def update_one(self, filt, update, upsert=False):
+        doc = self.docs.setdefault(filt["admin_id"], {"admin_id": filt["admin_id"]})
+        for champ, valeur in update["$max"].items():
+            doc[champ] = max(doc.get(champ, valeur), valeur)
+
+
+def _service(docs=None):
+    """Service sur des collections simulées, accessibles via `collection.compteurs`
+    et `collection.lectures`."""
     collection = _FakeCollection(docs)
-    with patch(
-        "model.comment_service.get_commentaires_collection", return_value=collection
-    ):
-        service = CommentaireService()
+    collection.compteurs = _FakeCompteurs()
+    collection.lectures = _FakeLectures()
+    for doc in collection.docs:
+        compteur = collection.compteurs.docs.setdefault(
+            doc["objet_id"], {"objet_id": doc["objet_id"], "nb_commentaires": 0}
+        )
+        compteur["nb_commentaires"] += 1
+    service = CommentaireService(
+        collection, collection.compteurs, collection.lectures, publier=MagicMock()
+    )
     return service, collection
 
 
-def test_get_commentaires_renvoie_liste_vide_si_aucun_document():
-    service, _ = _service_with_mock_collection()
+def _commentaire(commentaire_id, texte, objet_id=1, ancetres=(), date=None):
+    ancetres = list(ancetres)
+    return {
+        "commentaire_id": commentaire_id,
+        "objet_id": objet_id,
+        "parent_id": ancetres[-1] if ancetres else None,
+        "ancetres": ancetres,
+        "profondeur": len(ancetres),
+        "utilisateur_id": 1,
+        "pseudo": "alice",
+        "texte": texte,
+        "date": date or "2026-01-01T00:00:00",
+        "est_admin": False,
+    }
+
+
+def test_get_commentaires_renvoie_liste_vide_si_aucun_commentaire():
+    service, _ = _service()
     assert service.get_commentaires(1) == []
 
 
 def test_ajouter_commentaire_rejette_texte_vide():
-    service, _ = _service_with_mock_collection()
+    service, _ = _service()
     with pytest.raises(ValueError):
         service.ajouter_commentaire(1, utilisateur_id=1, pseudo="alice", texte="   ")
 
 
 def test_ajouter_commentaire_rejette_texte_trop_long():
-    service, _ = _service_with_mock_collection()
+    service, _ = _service()
     with pytest.raises(ValueError):
         service.ajouter_commentaire(
             1, utilisateur_id=1, pseudo="alice", texte="a" * (MAX_COMMENT_LENGTH + 1)
         )
 
 
-def test_ajouter_commentaire_racine_est_persiste():
-    service, collection = _service_with_mock_collection()
+def test_ajouter_commentaire_racine_est_un_document_a_part():
+    service, collection = _service()
 
     service.ajouter_commentaire(1, utilisateur_id=1, pseudo="alice", texte="Salut !")
 
-    args, kwargs = collection.update_one.call_args
-    commentaires = args[1]["$set"]["commentaires"]
-    assert len(commentaires) == 1
-    assert commentaires[0]["texte"] == "Salut !"
-    assert commentaires[0]["pseudo"] == "alice"
-    assert commentaires[0]["reponses"] == []
-    assert kwargs["upsert"] is True
+    (doc,) = collection.docs
+    assert doc["texte"] == "Salut !"
+    assert doc["pseudo"] == "alice"
+    assert doc["objet_id"] == 1
+    assert doc["parent_id"] is None
+    assert doc["ancetres"] == []
+    assert "reponses" not in doc
 
 
-def test_ajouter_reponse_est_imbriquee_sous_le_parent():
-    parent_id = "abc-123"
-    existing = [
-        {
-            "commentaire_id": parent_id,
-            "utilisateur_id": 1,
-            "pseudo": "alice",
-            "texte": "Commentaire racine",
-            "date": "2026-01-01T00:00:00",
-            "reponses": [],
-        }
-    ]
-    service, collection = _service_with_mock_collection(existing)
+def test_ajouter_reponse_enregistre_le_chemin_des_ancetres():
+    service, collection = _service([_commentaire("a", "Racine")])
 
     service.ajouter_commentaire(
-        1, utilisateur_id=2, pseudo="bob", texte="Réponse", parent_id=parent_id
+        1, utilisateur_id=2, pseudo="bob", texte="Réponse", parent_id="a"
+    )
+    nouveau_id = service.ajouter_commentaire(
+        1, utilisateur_id=3, pseudo="chris", texte="Niveau 3", parent_id="a"
+    )
+    reponse = collection.find_one({"texte": "Réponse"})
+    niveau_3 = service.ajouter_commentaire(
+        1,
+        utilisateur_id=3,
+        pseudo="chris",
+        texte="Niveau 3 bis",
+        parent_id=reponse["commentaire_id"],
     )
 
-    args, _ = collection.update_one.call_args
-    commentaires = args[1]["$set"]["commentaires"]
-    assert commentaires[0]["reponses"][0]["texte"] == "Réponse"
-    assert commentaires[0]["reponses"][0]["pseudo"] == "bob"
+    assert collection.find_one({"commentaire_id": nouveau_id})["ancetres"] == ["a"]
+    doc = collection.find_one({"commentaire_id": niveau_3})
+    assert doc["ancetres"] == ["a", reponse["commentaire_id"]]
+    assert doc["profondeur"] == 2
 
 
-def test_reponse_a_une_reponse_est_imbriquee_en_profondeur():
-    niveau_1_id = "niveau-1"
-    niveau_2_id = "niveau-2"
-    existing = [
-        {
-            "commentaire_id": niveau_1_id,
-            "utilisateur_id": 1,
-            "pseudo": "alice",
-            "texte": "Niveau 1",
-            "date": "2026-01-01T00:00:00",
-            "reponses": [
-                {
-                    "commentaire_id": niveau_2_id,
-                    "utilisateur_id": 2,
-                    "pseudo": "bob",
-                    "texte": "Niveau 2",
-                    "date": "2026-01-01T00:00:00",
-                    "reponses": [],
-                }
-            ],
-        }
-    ]
-    service, collection = _service_with_mock_collection(existing)
+def test_reponse_notifie_l_auteur_du_parent():
+    service, _ = _service([_commentaire("a", "Racine")])
 
-    service.ajouter_commentaire(
-        1, utilisateur_id=3, pseudo="chris", texte="Niveau 3", parent_id=niveau_2_id
+    nouveau_id = service.ajouter_commentaire(
+        1, utilisateur_id=2, pseudo="bob", texte="Réponse", parent_id="a"
     )
 
-    args, _ = collection.update_one.call_args
-    commentaires = args[1]["$set"]["commentaires"]
-    niveau_3 = commentaires[0]["reponses"][0]["reponses"][0]
-    assert niveau_3["texte"] == "Niveau 3"
-    assert niveau_3["pseudo"] == "chris"
+    service._publier.assert_called_once_with(
+        1, "reponse", objet_id=1, commentaire_id=nouveau_id, pseudo="bob"
+    )
+
+
+def test_pas_de_notification_pour_sa_propre_reponse_ni_un_admin():
+    admin = _commentaire("b", "Racine admin")
+    admin["utilisateur_id"] = None
+    service, _ = _service([_commentaire("a", "Racine"), admin])
+
+    service.ajouter_commentaire(1, utilisateur_id=1, pseudo="a", texte="R", parent_id="a")
+    service.ajouter_commentaire(1, utilisateur_id=2, pseudo="b", texte="R", parent_id="b")
+    service.ajouter_commentaire(1, utilisateur_id=2, pseudo="b", texte="Racine")
+
+    service._publier.assert_not_called()
+
+
+def test_get_commentaires_reconstruit_l_arbre_imbrique():
+    docs = [
+        _commentaire("a", "Racine", date="2026-01-01T00:00:00"),
+        _commentaire("c", "Réponse 2", ancetres=["a"], date="2026-01-03T00:00:00"),
+        _commentaire("b", "Réponse 1", ancetres=["a"], date="2026-01-02T00:00:00"),
+        _commentaire("d", "Niveau 3", ancetres=["a", "b"], date="2026-01-04T00:00:00"),
+        _commentaire("z", "Autre objet", objet_id=2),
+    ]
+    service, _ = _service(docs)
+
+    (racine,) = service.get_commentaires(1)
+
+    assert racine["texte"] == "Racine"
+    assert [r["texte"] for r in racine["reponses"]] == ["Réponse 1", "Réponse 2"]
+    assert racine["reponses"][0]["reponses"][0]["texte"] == "Niveau 3"
+    assert "ancetres" not in racine
+
+
+def test_construire_arbre_ignore_les_orphelins():
+    noeuds = [
+        {"commentaire_id": "a", "parent_id": None},
+        {"commentaire_id": "b", "parent_id": "disparu"},
+    ]
+    arbre = construire_arbre(noeuds)
+    assert [n["commentaire_id"] for n in arbre] == ["a"]
+    assert arbre[0]["reponses"] == []
 
 
 def test_ajouter_reponse_parent_introuvable_leve_erreur():
-    service, _ = _service_with_mock_collection(existing_commentaires=[])
+    service, _ = _service()
     with pytest.raises(ValueError):
         service.ajouter_commentaire(
             1,
@@ -166,8 +306,16 @@ def test_ajouter_reponse_parent_introuvable_leve_erreur():
         )
 
 
+def test_ajouter_reponse_parent_d_un_autre_objet_leve_erreur():
+    service, _ = _service([_commentaire("a", "Sur l'objet 2", objet_id=2)])
+    with pytest.raises(ValueError):
+        service.ajouter_commentaire(
+            1, utilisateur_id=1, pseudo="alice", texte="Réponse", parent_id="a"
+        )
+
+
 def test_commentaire_admin_a_utilisateur_id_none_et_est_admin_vrai():
-    service, collection = _service_with_mock_collection()
+    service, collection = _service()
 
     service.ajouter_commentaire(
         1,
@@ -177,130 +325,279 @@ def test_commentaire_admin_a_utilisateur_id_none_et_est_admin_vrai():
         est_admin=True,
     )
 
-    args, _ = collection.update_one.call_args
-    commentaire = args[1]["$set"]["commentaires"][0]
+    (commentaire,) = collection.docs
     assert commentaire["utilisateur_id"] is None
     assert commentaire["est_admin"] is True
     assert commentaire["pseudo"] == "Administration AstroLearn"
 
 
-def _commentaire(commentaire_id, texte, vu=False, reponses=None):
-    return {
-        "commentaire_id": commentaire_id,
-        "utilisateur_id": 1,
-        "pseudo": "alice",
-        "texte": texte,
-        "date": "2026-01-01T00:00:00",
-        "vu": vu,
-        "reponses": reponses or [],
-    }
-
-
-def test_get_tous_commentaires_aplatit_plusieurs_objets_et_tri_par_date():
+def test_fil_moderation_plusieurs_objets_tri_par_date():
     docs = [
-        {
-            "objet_id": 1,
-            "commentaires": [
-                {**_commentaire("a", "Premier"), "date": "2026-01-01T00:00:00"}
-            ],
-        },
-        {
-            "objet_id": 2,
-            "commentaires": [
-                {**_commentaire("b", "Second"), "date": "2026-02-01T00:00:00"}
-            ],
-        },
+        _commentaire("a", "Premier", objet_id=1, date="2026-01-01T00:00:00"),
+        _commentaire("b", "Second", objet_id=2, date="2026-02-01T00:00:00"),
+        _commentaire("c", "Réponse", ancetres=["a"], date="2026-01-15T00:00:00"),
     ]
-    service, _ = _service_with_fake_collection(docs)
+    service, _ = _service(docs)
 
-    resultats = service.get_tous_commentaires()
+    resultats, curseur = service.get_fil_moderation()
 
-    assert len(resultats) == 2
-    assert resultats[0]["texte"] == "Second"  # plus récent en premier
+    assert [r["texte"] for r in resultats] == ["Second", "Réponse", "Premier"]
     assert "reponses" not in resultats[0]
     assert {r["objet_id"] for r in resultats} == {1, 2}
+    assert curseur is None
 
 
-def test_get_tous_commentaires_aplatit_les_reponses_imbriquees():
-    docs = [
-        {
-            "objet_id": 1,
-            "commentaires": [
-                _commentaire(
-                    "a", "Racine", reponses=[_commentaire("b", "Réponse imbriquée")]
-                )
-            ],
-        }
-    ]
-    service, _ = _service_with_fake_collection(docs)
+def test_fil_moderation_pagine_par_curseur_sans_doublon():
+    # Même date pour tous : le départage se fait sur commentaire_id.
+    docs = [_commentaire(f"id-{i:02d}", f"C{i}") for i in range(7)]
+    service, _ = _service(docs)
 
-    resultats = service.get_tous_commentaires()
+    vus, curseur = [], None
+    while True:
+        page, curseur = service.get_fil_moderation(limite=3, curseur=curseur)
+        vus += [c["commentaire_id"] for c in page]
+        if curseur is None:
+            break
 
-    textes = {r["texte"] for r in resultats}
-    assert textes == {"Racine", "Réponse imbriquée"}
+    assert vus == [f"id-{i:02d}" for i in reversed(range(7))]
 
 
-def test_count_non_lus():
+def test_fil_moderation_filtres():
     docs = [
+        _commentaire("a", "Ancien", objet_id=1, date="2026-01-01T00:00:00"),
+        _commentaire("b", "Récent", objet_id=1, date="2026-03-01T00:00:00"),
         {
-            "objet_id": 1,
-            "commentaires": [
-                _commentaire("a", "Lu", vu=True),
-                _commentaire("b", "Pas lu", vu=False),
-            ],
-        }
+            **_commentaire("c", "Autre", objet_id=2, date="2026-03-02T00:00:00"),
+            "pseudo": "bob",
+        },
     ]
-    service, _ = _service_with_fake_collection(docs)
+    service, _ = _service(docs)
+
+    def textes(**filtres):
+        return [c["texte"] for c in service.get_fil_moderation(**filtres)[0]]
+
+    assert textes(depuis="2026-02-01T00:00:00") == ["Autre", "Récent"]
+    assert textes(objet_id=1) == ["Récent", "Ancien"]
+    assert textes(pseudo="bob") == ["Autre"]
+
+
+def test_fil_moderation_curseur_invalide_leve_erreur():
+    service, _ = _service()
+    with pytest.raises(ValueError):
+        service.get_fil_moderation(curseur="pas-un-curseur")
+    # Curseur bien formé mais dont les valeurs iraient telles quelles dans le filtre
+    with pytest.raises(ValueError):
+        service.get_fil_moderation(curseur=encoder_curseur({"$gt": ""}, "c1"))
+
+
+def test_sans_marque_de_lecture_tout_est_non_lu():
+    docs = [_commentaire("a", "Un"), _commentaire("b", "Deux")]
+    service, _ = _service(docs)
 
-    assert service.count_non_lus() == 1
+    assert service.get_derniere_lecture(7) is None
+    assert service.count_non_lus(7) == 2
 
 
-def test_marquer_tous_lus():
+def test_non_lus_sont_posterieurs_a_la_marque_de_l_admin():
     docs = [
-        {
-            "objet_id": 1,
-            "commentaires": [
-                _commentaire(
-                    "a", "Racine", vu=False, reponses=[_commentaire("b", "Réponse")]
-                )
-            ],
-        }
+        _commentaire("a", "Ancien", date="2026-01-01T00:00:00"),
+        _commentaire("b", "Récent", date="2026-03-01T00:00:00"),
     ]
-    service, _ = _service_with_fake_collection(docs)
+    service, _ = _service(docs)
 
-    service.marquer_tous_lus()
+    service.marquer_lus_jusqu_a(7, "2026-02-01T00:00:00")
 
-    assert service.count_non_lus() == 0
+    assert service.count_non_lus(7) == 1
+    assert service.count_non_lus(8) == 2  # marque propre à chaque admin
 
 
-def test_supprimer_commentaire_racine():
-    docs = [{"objet_id": 1, "commentaires": [_commentaire("a", "À supprimer")]}]
-    service, _ = _service_with_fake_collection(docs)
+def test_la_marque_de_lecture_ne_recule_jamais():
+    service, _ = _service()
 
-    assert service.supprimer_commentaire(1, "a") is True
-    assert service.get_commentaires(1) == []
+    service.marquer_lus_jusqu_a(7, "2026-03-01T00:00:00")
+    service.marquer_lus_jusqu_a(7, "2026-01-01T00:00:00")
+
+    assert service.get_derniere_lecture(7) == "2026-03-01T00:00:00"
+
+
+def test_count_non_lus_est_plafonne():
+    docs = [_commentaire(str(i), "x") for i in range(MAX_NON_LUS + 20)]
+    service, _ = _service(docs)
+
+    assert service.count_non_lus(7) == MAX_NON_LUS
 
 
 def test_supprimer_commentaire_supprime_le_sous_arbre():
     docs = [
-        {
-            "objet_id": 1,
-            "commentaires": [
-                _commentaire(
-                    "a", "Racine", reponses=[_commentaire("b", "Sera supprimée")]
-                )
-            ],
-        }
+        _commentaire("a", "Racine"),
+        _commentaire("b", "Sera supprimée", ancetres=["a"]),
+        _commentaire("c", "Aussi", ancetres=["a", "b"]),
+        _commentaire("d", "Autre racine"),
     ]
-    service, _ = _service_with_fake_collection(docs)
+    service, _ = _service(docs)
 
     assert service.supprimer_commentaire(1, "a") is True
-    assert service.get_commentaires(1) == []
+    assert [c["texte"] for c in service.get_commentaires(1)] == ["Autre racine"]
+
+
+def test_supprimer_une_reponse_imbriquee_conserve_le_reste():
+    docs = [
+        _commentaire("a", "Racine"),
+        _commentaire("b", "Supprimée", ancetres=["a"]),
+        _commentaire("c", "Gardée", ancetres=["a"]),
+    ]
+    service, _ = _service(docs)
+
+    assert service.supprimer_commentaire(1, "b") is True
+    (racine,) = service.get_commentaires(1)
+    assert [r["texte"] for r in racine["reponses"]] == ["Gardée"]
 
 
 def test_supprimer_commentaire_introuvable_renvoie_false():
-    docs = [{"objet_id": 1, "commentaires": [_commentaire("a", "Existe")]}]
-    service, _ = _service_with_fake_collection(docs)
+    service, _ = _service([_commentaire("a", "Existe")])
 
     assert service.supprimer_commentaire(1, "id-inexistant") is False
     assert len(service.get_commentaires(1)) == 1
+
+
+def test_les_compteurs_suivent_ajouts_et_suppressions():
+    service, _ = _service()
+    racine = service.ajouter_commentaire(1, utilisateur_id=1, pseudo="a", texte="R")
+    service.ajouter_commentaire(
+        1, utilisateur_id=2, pseudo="b", texte="R1", parent_id=racine
+    )
+    service.ajouter_commentaire(2, utilisateur_id=2, pseudo="b", texte="Autre")
+
+    assert service.get_nb_commentaires([1, 2]) == {1: 2, 2: 1}
+
+    service.supprimer_commentaire(1, racine)
+    assert service.get_nb_commentaires([1, 2]) == {1: 0, 2: 1}
+
+
+def test_chaque_ecriture_avance_la_version_du_fil():
+    service, _ = _service()
+    assert service.get_version(1) == 0
+
+    racine = service.ajouter_commentaire(1, utilisateur_id=1, pseudo="a", texte="R")
+    assert service.get_version(1) == 1
+    service.ajouter_commentaire(
+        1, utilisateur_id=2, pseudo="b", texte="R1", parent_id=racine
+    )
+    service.supprimer_commentaire(1, racine)
+
+    assert service.get_version(1) == 3
+    assert service.get_version(2) == 0
+
+
+def test_get_nb_commentaires_par_lot_sans_parcourir_les_fils():
+    docs = [
+        _commentaire("a", "Un", objet_id=1),
+        _commentaire("b", "Deux", objet_id=1, ancetres=["a"]),
+        _commentaire("c", "Trois", objet_id=2),
+    ]
+    service, collection = _service(docs)
+    collection.find = MagicMock(side_effect=AssertionError("parcours interdit"))
+
+    assert service.get_nb_commentaires([1, 2, 3]) == {1: 2, 2: 1}
+    assert service.get_nb_commentaires([]) == {}
+
+
+def test_get_nb_commentaires_mongo_injoignable_renvoie_vide():
+    compteurs = MagicMock()
+    compteurs.find.side_effect = PyMongoError("injoignable")
+    service = CommentaireService(MagicMock(), compteurs, MagicMock())
+
+    assert service.get_nb_commentaires([1]) == {}
+
+
+def test_purger_objets_supprime_commentaires_et_compteurs():
+    docs = [
+        _commentaire("a", "Un", objet_id=1),
+        _commentaire("b", "Deux", objet_id=1, ancetres=["a"]),
+        _commentaire("c", "Trois", objet_id=2),
+        _commentaire("d", "Quatre", objet_id=3),
+    ]
+    service, collection = _service(docs)
+
+    assert service.purger_objets([1, 3]) == 3
+
+    assert [d["commentaire_id"] for d in collection.docs] == ["c"]
+    assert list(collection.compteurs.docs) == [2]
+    assert service.purger_objets([1]) == 0
+    assert service.purger_objets([]) == 0
+
+
+def test_recalculer_compteurs_reconstruit_depuis_les_commentaires():
+    collection, compteurs = MagicMock(), MagicMock()
+    collection.aggregate.side_effect = [
+        [{"_id": "a", "nb_reponses": 3}],  # descendants par commentaire
+        [{"_id": 1, "nb_commentaires": 4}],  # commentaires par objet
+    ]
+    service = CommentaireService(collection, compteurs, MagicMock())
+
+    assert service.recalculer_compteurs() == 1
+    ((maj_objets,), _) = compteurs.bulk_write.call_args
+    assert maj_objets[0]._filter == {"objet_id": 1}
+    assert maj_objets[0]._doc == {
+        "$set": {"nb_commentaires": 4},
+        "$inc": {"version": 1},
+    }
+    # Objets sans commentaire : remis à zéro, version avancée quand même.
+    assert maj_objets[1]._filter == {"objet_id": {"$nin": [1]}}
+    compteurs.delete_many.assert_not_called()
+    ((lot,), _) = collection.bulk_write.call_args
+    assert lot[0]._filter == {"commentaire_id": "a"}
+    assert lot[0]._doc == {"$set": {"nb_reponses": 3}}
+
+
+def test_nb_reponses_compte_les_descendants_de_chaque_ancetre():
+    service, collection = _service()
+    racine = service.ajouter_commentaire(1, utilisateur_id=1, pseudo="a", texte="R")
+    reponse = service.ajouter_commentaire(
+        1, utilisateur_id=2, pseudo="b", texte="R1", parent_id=racine
+    )
+    sous_reponse = service.ajouter_commentaire(
+        1, utilisateur_id=2, pseudo="b", texte="R2", parent_id=reponse
+    )
+
+    def nb_reponses(commentaire_id):
+        return collection.find_one({"commentaire_id": commentaire_id})["nb_reponses"]
+
+    assert (nb_reponses(racine), nb_reponses(reponse)) == (2, 1)
+
+    service.supprimer_commentaire(1, sous_reponse)
+    assert (nb_reponses(racine), nb_reponses(reponse)) == (1, 0)
+
+
+def test_get_reponses_pagine_les_racines_avec_leur_nombre_de_reponses():
+    docs = [
+        {**_commentaire(f"r{i:02d}", f"Racine {i}"), "nb_reponses": i % 2}
+        for i in range(TAILLE_PAGE_FIL + 3)
+    ] + [_commentaire("x", "Réponse", ancetres=["r01"])]
+    service, _ = _service(docs)
+
+    page, curseur = service.get_reponses(1)
+    assert len(page) == TAILLE_PAGE_FIL
+    assert page[1]["nb_reponses"] == 1
+    assert "utilisateur_id" not in page[0] and "ancetres" not in page[0]
+
+    suite, fin = service.get_reponses(1, curseur=curseur)
+    assert [c["texte"] for c in suite] == [
+        f"Racine {i}" for i in range(TAILLE_PAGE_FIL, TAILLE_PAGE_FIL + 3)
+    ]
+    assert fin is None
+
+
+def test_get_reponses_d_un_commentaire_renvoie_ses_reponses_directes():
+    docs = [
+        _commentaire("a", "Racine"),
+        _commentaire("b", "Directe", ancetres=["a"], date="2026-01-02T00:00:00"),
+        _commentaire("c", "Petite-fille", ancetres=["a", "b"]),
+    ]
+    service, _ = _service(docs)
+
+    page, curseur = service.get_reponses(1, parent_id="a")
+
+    assert [c["texte"] for c in page] == ["Directe"]
+    assert page[0]["nb_reponses"] == 0  # champ absent des anciens documents
+    assert curseur is None
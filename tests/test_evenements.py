@@ -0,0 +1,192 @@
+# tests/test_evenements.py
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app import app
+from controller import user_bp
+from model.database import traiter_proposition
+from model.evenements import (
+    CANAL_EVENEMENTS,
+    RESYNCHRONISER,
+    TAILLE_FILE_FLUX,
+    DiffuseurEvenements,
+    PublieurEvenements,
+    preparer_evenement,
+)
+
+
+@pytest.fixture
+def diffuseur():
+    """Diffuseur sans thread d'écoute : les NOTIFY sont simulés par distribuer()."""
+    with patch.object(DiffuseurEvenements, "_demarrer"):
+        yield DiffuseurEvenements(dsn="", historique=10)
+
+
+def _evenement(user_id, id_evenement, type_evenement="proposition"):
+    return json.dumps({"id": id_evenement, "user_id": user_id, "type": type_evenement})
+
+
+def test_evenement_depose_uniquement_chez_son_destinataire(diffuseur):
+    file_12 = diffuseur.abonner(12)
+    autre_onglet_12 = diffuseur.abonner(12)
+    file_7 = diffuseur.abonner(7)
+
+    diffuseur.distribuer(_evenement(12, 1))
+
+    assert file_12.get_nowait()["id"] == 1
+    assert autre_onglet_12.get_nowait()["id"] == 1
+    assert file_7.empty()
+
+
+def test_charge_invalide_ignoree(diffuseur):
+    file = diffuseur.abonner(12)
+
+    diffuseur.distribuer("pas du json")
+    diffuseur.distribuer(json.dumps({"type": "proposition"}))
+
+    assert file.empty()
+
+
+def test_reconnexion_rejoue_les_evenements_manques(diffuseur):
+    for id_evenement in (1, 2, 3):
+        diffuseur.distribuer(_evenement(12, id_evenement))
+    diffuseur.distribuer(_evenement(7, 4))
+
+    file = diffuseur.abonner(12, depuis=1)
+
+    assert [file.get_nowait()["id"], file.get_nowait()["id"]] == [2, 3]
+    assert file.empty()
+
+
+def test_rejeu_selon_l_ordre_de_reception_pas_des_identifiants(diffuseur):
+    # 5 préparé avant 3 mais validé après : délivré en dernier
+    for id_evenement in (3, 6, 5):
+        diffuseur.distribuer(_evenement(12, id_evenement))
+
+    file = diffuseur.abonner(12, depuis=6)
+
+    assert file.get_nowait()["id"] == 5
+    assert file.empty()
+
+
+def test_dernier_evenement_inconnu_demande_une_resynchronisation(diffuseur):
+    diffuseur.distribuer(_evenement(12, 8))
+
+    file = diffuseur.abonner(12, depuis=2)
+
+    assert file.get_nowait() is RESYNCHRONISER
+    assert file.empty()
+
+
+def test_desabonner_et_client_lent(diffuseur):
+    file = diffuseur.abonner(12)
+    for id_evenement in range(TAILLE_FILE_FLUX + 5):
+        diffuseur.distribuer(_evenement(12, id_evenement))
+    assert file.qsize() == TAILLE_FILE_FLUX
+
+    diffuseur.desabonner(12, file)
+
+    assert diffuseur.nb_flux() == 0
+
+
+def test_coupure_de_l_ecoute_demande_une_resynchronisation(diffuseur):
+    file = diffuseur.abonner(12)
+
+    diffuseur._resynchroniser()
+
+    assert file.get_nowait() is RESYNCHRONISER
+
+
+def test_decision_notifiee_dans_la_transaction(connexion_factice):
+    conn, cur = connexion_factice(
+        ligne={"id_proposition": 4, "nom_fr": "Véga", "fk_id_utilisateur": 12}
+    )
+
+    with patch("model.database.get_db_connection", return_value=conn):
+        assert traiter_proposition(4, "refuse", "Déjà au catalogue") == "traitee"
+
+    requete, (canal, charge) = cur.execute.call_args_list[1][0]
+    assert "pg_notify" in requete and canal == CANAL_EVENEMENTS
+    assert json.loads(charge) == {
+        "id": json.loads(charge)["id"],
+        "user_id": 12,
+        "type": "proposition",
+        "id_proposition": 4,
+        "statut": "refuse",
+        "nom_fr": "Véga",
+    }
+    conn.commit.assert_called_once()
+
+
+@patch("model.evenements.psycopg2.connect")
+def test_publication_hors_requete_sur_une_connexion_reutilisee(mock_connect):
+    cur = mock_connect.return_value.cursor.return_value.__enter__.return_value
+    cur.execute.side_effect = [Exception("serveur redémarré"), None, None]
+    mock_connect.return_value.closed = False
+    publieur = PublieurEvenements(dsn="")
+
+    for id_objet in (1, 2, 3):
+        assert publieur.publier(12, "reponse", objet_id=id_objet)
+    publieur._file.join()
+
+    # Échec : événement perdu, connexion rouverte pour les suivants
+    assert mock_connect.call_count == 2
+    charges = [json.loads(appel[0][1][1]) for appel in cur.execute.call_args_list]
+    assert [c["objet_id"] for c in charges] == [1, 2, 3]
+    assert cur.execute.call_args[0][1][0] == CANAL_EVENEMENTS
+
+
+def _client_connecte():
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 12
+        session["user_pseudo"] = "vega"
+    return client
+
+
+@patch("controller.user_bp.count_notifs_non_lues", return_value=2)
+def test_flux_sse_etat_puis_evenements_rejoues(mock_count, diffuseur):
+    diffuseur.distribuer(_evenement(12, 4))
+    diffuseur.distribuer(_evenement(12, 5))
+    diffuseur.distribuer(preparer_evenement(12, "reponse", objet_id=3, pseudo="bob"))
+
+    with patch.object(user_bp, "diffuseur", diffuseur), patch.object(
+        user_bp, "SSE_DUREE_MAX", 0.2
+    ), patch.object(user_bp, "SSE_HEARTBEAT", 0.05):
+        reponse = _client_connecte().get(
+            "/mon-espace/evenements", headers={"Last-Event-ID": "4"}
+        )
+        corps = reponse.get_data(as_text=True)
+
+    assert reponse.mimetype == "text/event-stream"
+    assert reponse.headers["Cache-Control"] == "no-cache"
+    assert corps.startswith("retry: 3000\n\n")
+    assert 'event: etat\ndata: {"nb_notifs_non_lues": 2}\n\n' in corps
+    assert "id: 5\nevent: proposition\n" in corps
+    assert '"nb_notifs_non_lues": 2' in corps.split("event: proposition")[1]
+    assert "event: reponse\n" in corps
+    assert ": maintien\n\n" in corps
+    # Flux refermé : plus d'abonné, place rendue
+    assert diffuseur.nb_flux() == 0
+
+
+@patch("controller.user_bp.count_notifs_non_lues")
+def test_flux_sse_worker_plein_renvoie_a_plus_tard(mock_count, diffuseur):
+    with patch.object(user_bp, "diffuseur", diffuseur), patch.object(
+        user_bp, "_places_flux", threading.BoundedSemaphore(1)
+    ) as places:
+        places.acquire()
+        corps = _client_connecte().get("/mon-espace/evenements").get_data(as_text=True)
+
+    assert corps == f"retry: {user_bp.RETRY_FLUX_SATURE_MS}\n\n"
+    assert diffuseur.nb_flux() == 0
+    mock_count.assert_not_called()
+
+
+def test_flux_sse_reserve_aux_connectes():
+    reponse = app.test_client().get("/mon-espace/evenements")
+
+    assert reponse.status_code == 302
@@ -0,0 +1,75 @@
+# tests/test_faux_serveur_gemini.py
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from charge_chatbot import classer_reponse, percentile
+from faux_serveur_gemini import ConfigFauxGemini, creer_serveur
+from model.api_utils import call_gemini_api
+
+
+@pytest.fixture
+def faux_gemini():
+    """Démarre un faux serveur sur un port libre ; renvoie (config, url_base)."""
+    config = ConfigFauxGemini(latence_ms=0, gigue_ms=0)
+    serveur = creer_serveur(config, port=0)
+    thread = threading.Thread(target=serveur.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{serveur.server_address[1]}/v1beta/models/faux"
+    yield config, url
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def test_call_gemini_api_utilise_l_url_configuree(faux_gemini):
+    _, url = faux_gemini
+    with patch("model.api_utils.GEMINI_API_URL", f"{url}:generateContent"), patch(
+        "model.api_utils.API_KEY", "factice"
+    ):
+        reponse = call_gemini_api("C'est quoi Mars ?")
+
+    assert "C'est quoi Mars ?" in reponse
+
+
+def test_faux_serveur_renvoie_429_selon_le_taux_configure(faux_gemini):
+    config, url = faux_gemini
+    config.taux_429 = 1.0
+
+    reponse = requests.post(f"{url}:generateContent", json={}, timeout=5)
+
+    assert reponse.status_code == 429
+
+
+def test_faux_serveur_stream_sse_envoie_plusieurs_morceaux(faux_gemini):
+    _, url = faux_gemini
+    payload = {"contents": [{"role": "user", "parts": [{"text": "Saturne ?"}]}]}
+
+    reponse = requests.post(
+        f"{url}:streamGenerateContent?alt=sse", json=payload, timeout=5
+    )
+
+    morceaux = [
+        json.loads(ligne[len("data: ") :])
+        for ligne in reponse.text.splitlines()
+        if ligne.startswith("data: ")
+    ]
+    assert len(morceaux) > 1
+    texte = "".join(m["candidates"][0]["content"]["parts"][0]["text"] for m in morceaux)
+    assert "Saturne ?" in texte
+
+
+def test_percentile_rang_le_plus_proche():
+    valeurs = [float(i) for i in range(1, 101)]
+
+    assert percentile(valeurs, 50) == 50.0
+    assert percentile(valeurs, 99) == 99.0
+    assert percentile([], 50) is None
+
+
+def test_classer_reponse_detecte_les_quotas_masques_en_200():
+    assert classer_reponse(200, {"response": "Bonjour ✨"}) == "ok"
+    assert classer_reponse(200, {"response": "⚠️ Quota dépassé."}) == "quota_429"
+    assert classer_reponse(500, {}) == "http_500"
@@ -0,0 +1,42 @@
+# tests/test_fragment_cache.py
+from model.fragment_cache import CacheFragments
+
+
+def test_fragment_servi_par_version():
+    cache = CacheFragments(10)
+    cache.set("fil-1", 3, "<p>v3</p>")
+
+    assert cache.get("fil-1", 3) == "<p>v3</p>"
+    assert cache.get("fil-1", 4) is None
+
+
+def test_niveau_disque_partage_entre_instances(tmp_path):
+    CacheFragments(10, str(tmp_path)).set("fil-1", 3, "<p>v3</p>")
+
+    autre_worker = CacheFragments(10, str(tmp_path))
+
+    assert autre_worker.get("fil-1", 3) == "<p>v3</p>"
+    assert autre_worker.get("fil-12", 3) is None
+
+
+def test_nouvelle_version_remplace_l_ancien_fichier(tmp_path):
+    cache = CacheFragments(10, str(tmp_path))
+    cache.set("fil-1", 3, "<p>v3</p>")
+    cache.set("fil-10", 1, "<p>autre objet</p>")
+
+    cache.set("fil-1", 4, "<p>v4</p>")
+
+    assert sorted(f.name for f in tmp_path.iterdir()) == [
+        "fil-1.v4.html",
+        "fil-10.v1.html",
+    ]
+
+
+def test_supprimer_retire_toutes_les_versions_du_disque(tmp_path):
+    cache = CacheFragments(10, str(tmp_path))
+    cache.set("fil-1", 0, "<p>v0</p>")
+    cache.set("fil-10", 1, "<p>autre objet</p>")
+
+    cache.supprimer("fil-1")
+
+    assert [f.name for f in tmp_path.iterdir()] == ["fil-10.v1.html"]
@@ -0,0 +1,88 @@
+# tests/test_mongo_schema.py
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from model.mongo_schema import (
+    INDEX_COMMENTAIRES,
+    RequetesLentesListener,
+    resumer_plan,
+    synchroniser_index,
+    synchroniser_schema,
+)
+
+
+def test_synchroniser_index_cree_seulement_les_index_absents():
+    collection = MagicMock()
+    collection.index_information.return_value = {"_id_": {}, "objet_date": {}}
+
+    rapport = synchroniser_index(collection, INDEX_COMMENTAIRES)
+
+    assert "objet_date" in rapport["presents"]
+    assert "objet_date" not in rapport["crees"]
+    assert "commentaire_id_unique" in rapport["crees"]
+    assert collection.create_index.call_count == len(INDEX_COMMENTAIRES) - 1
+    collection.drop_index.assert_not_called()
+
+
+def test_synchroniser_index_supprime_les_obsoletes_sauf_id():
+    collection = MagicMock()
+    collection.index_information.return_value = {"_id_": {}, "vieil_index": {}}
+
+    rapport = synchroniser_index(collection, [], supprimer_obsoletes=True)
+
+    assert rapport["supprimes"] == ["vieil_index"]
+    collection.drop_index.assert_called_once_with("vieil_index")
+
+
+def test_synchroniser_schema_ne_recree_pas_l_ancienne_collection():
+    db = MagicMock()
+    db.list_collection_names.return_value = ["commentaires_noeuds"]
+
+    rapport = synchroniser_schema(db)
+
+    assert "commentaires" not in rapport
+    assert "commentaires_noeuds" in rapport
+    db.__getitem__.assert_any_call("commentaires_noeuds")
+    assert "commentaires" not in [c[0][0] for c in db.__getitem__.call_args_list]
+
+
+def test_resumer_plan():
+    plan = {
+        "stage": "FETCH",
+        "inputStage": {"stage": "IXSCAN", "indexName": "objet_date"},
+    }
+    assert resumer_plan(plan) == "FETCH > IXSCAN(objet_date)"
+
+
+def _evenement(nom, commande=None, duree_micros=0):
+    return SimpleNamespace(
+        command_name=nom,
+        command=commande or {},
+        connection_id=("localhost", 27017),
+        request_id=1,
+        database_name="astrolearn_nosql",
+        duration_micros=duree_micros,
+    )
+
+
+def test_listener_journalise_seulement_les_requetes_lentes(capsys):
+    listener = RequetesLentesListener(50, False, ("commentaires_noeuds",))
+    commande = {"find": "commentaires_noeuds", "filter": {"objet_id": 1}}
+
+    listener.started(_evenement("find", commande))
+    listener.succeeded(_evenement("find", duree_micros=10_000))
+    assert capsys.readouterr().out == ""
+
+    listener.started(_evenement("find", commande))
+    listener.succeeded(_evenement("find", duree_micros=80_000))
+    sortie = capsys.readouterr().out
+    assert "commentaires_noeuds" in sortie and "80 ms" in sortie
+
+
+def test_listener_ignore_les_autres_collections(capsys):
+    listener = RequetesLentesListener(0, False, ("commentaires_noeuds",))
+
+    listener.started(_evenement("find", {"find": "autre"}))
+    listener.succeeded(_evenement("find", duree_micros=999_000))
+
+    assert capsys.readouterr().out == ""
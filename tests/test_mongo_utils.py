@@ -0,0 +1,65 @@
+# tests/test_mongo_utils.py
+from unittest.mock import patch
+
+from model import mongo_utils
+from model.comment_service import CommentaireService
+
+
+def test_un_client_par_processus():
+    mongo_utils.reinitialiser_apres_fork()
+    with patch("model.mongo_utils.os.getpid", return_value=100):
+        client = mongo_utils.get_mongo_client()
+        assert mongo_utils.get_mongo_client() is client
+    with patch("model.mongo_utils.os.getpid", return_value=101):
+        assert mongo_utils.get_mongo_client() is not client
+    mongo_utils.fermer_client()
+
+
+def test_reinitialiser_apres_fork_oublie_le_client_herite():
+    client = mongo_utils.get_mongo_client()
+
+    mongo_utils.reinitialiser_apres_fork()
+
+    assert mongo_utils.get_mongo_client() is not client
+    assert client.options.pool_options.max_pool_size == mongo_utils.MONGO_MAX_POOL_SIZE
+    mongo_utils.fermer_client()
+
+
+def test_statistiques_pool():
+    stats = mongo_utils.StatistiquesPool()
+    stats.connection_created(None)
+    stats.connection_created(None)
+    stats.connection_checked_out(None)
+    stats.connection_check_out_failed(None)
+    stats.connection_closed(None)
+
+    resultat = stats.stats()
+
+    assert (resultat["ouvertes"], resultat["en_cours"]) == (1, 1)
+    assert resultat["attentes_echouees"] == 1
+    assert resultat["creees"] == 2 and resultat["fermees"] == 1
+
+
+def test_vidage_du_pool_ne_remet_pas_en_cours_a_zero():
+    stats = mongo_utils.StatistiquesPool()
+    stats.connection_checked_out(None)
+
+    stats.pool_cleared(None)
+    stats.connection_checked_in(None)
+
+    resultat = stats.stats()
+    assert (resultat["en_cours"], resultat["vidages"]) == (0, 1)
+
+
+def test_service_resout_ses_collections_a_chaque_appel():
+    # Instance de module créée à l'import : elle ne doit figer aucun client
+    # avant le fork des workers.
+    with patch("model.comment_service.get_compteurs_commentaires_collection") as getter:
+        service = CommentaireService()
+        getter.assert_not_called()
+
+        getter.return_value.find_one.return_value = {"version": 4}
+        assert service.get_version(1) == 4
+        assert service.get_version(1) == 4
+
+    assert getter.call_count == 2
@@ -0,0 +1,79 @@
+# tests/test_nettoyage_outbox.py
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from model import nettoyage_outbox
+from model.nettoyage_outbox import supprimer_fichier, traiter_lot
+
+
+def _tache(id_tache, type_tache, cible, tentatives=0):
+    return {
+        "id_tache": id_tache,
+        "type_tache": type_tache,
+        "cible": cible,
+        "tentatives": tentatives,
+    }
+
+
+@pytest.fixture
+def file_outbox():
+    """Remplace les accès à NETTOYAGE_OUTBOX par des mocks."""
+    with patch.object(
+        nettoyage_outbox, "reserver_taches_outbox"
+    ) as reserver, patch.object(
+        nettoyage_outbox, "terminer_taches_outbox"
+    ) as terminer, patch.object(
+        nettoyage_outbox, "echouer_tache_outbox"
+    ) as echouer:
+        yield reserver, terminer, echouer
+
+
+def test_objets_purges_en_un_appel_et_fichiers_retires(file_outbox, tmp_path):
+    reserver, terminer, echouer = file_outbox
+    (tmp_path / "uploads" / "profils").mkdir(parents=True)
+    (tmp_path / "uploads" / "profils" / "a.png").write_bytes(b"x")
+    reserver.return_value = [
+        _tache(1, "commentaires_objet", "4"),
+        _tache(2, "fichier", "uploads/profils/a.png"),
+        _tache(3, "commentaires_objet", "9"),
+        _tache(4, "fichier", "uploads/profils/deja-supprime.png"),
+    ]
+    service = MagicMock()
+
+    bilan = traiter_lot(10, service, str(tmp_path))
+
+    service.purger_objets.assert_called_once_with([4, 9])
+    assert not (tmp_path / "uploads" / "profils" / "a.png").exists()
+    assert bilan == {"traitees": 4, "echecs": 0}
+    assert sorted(terminer.call_args[0][0]) == [1, 2, 3, 4]
+    echouer.assert_not_called()
+
+
+def test_echec_mongo_replanifie_avec_delai_croissant(file_outbox, tmp_path):
+    reserver, terminer, echouer = file_outbox
+    reserver.return_value = [
+        _tache(1, "commentaires_objet", "4", tentatives=0),
+        _tache(2, "commentaires_objet", "5", tentatives=3),
+    ]
+    service = MagicMock()
+    service.purger_objets.side_effect = RuntimeError("MongoDB injoignable")
+
+    bilan = traiter_lot(10, service, str(tmp_path))
+
+    assert bilan == {"traitees": 0, "echecs": 2}
+    terminer.assert_called_once_with([])
+    delais = {appel[0][0]: appel[0][2] for appel in echouer.call_args_list}
+    assert delais[2] == delais[1] * 8
+
+
+def test_supprimer_fichier_refuse_de_sortir_de_uploads(tmp_path):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "secret.txt").write_text("x")
+
+    with pytest.raises(ValueError):
+        supprimer_fichier("uploads/../secret.txt", str(tmp_path))
+    with pytest.raises(ValueError):
+        supprimer_fichier("uploads", str(tmp_path))
+
+    assert (tmp_path / "secret.txt").exists()
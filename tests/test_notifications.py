@@ -0,0 +1,81 @@
+# tests/test_notifications.py
+from unittest.mock import patch
+
+import pytest
+
+from app import app
+from model import database
+from model.database import (
+    count_notifs_non_lues,
+    get_nb_notifs_non_lues,
+    marquer_notifs_lues,
+    traiter_proposition,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    database._notifs_non_lues.clear()
+    yield
+    database._notifs_non_lues.clear()
+
+
+@patch("model.database.count_notifs_non_lues", return_value=2)
+def test_compteur_lu_une_fois_puis_servi_par_le_cache(mock_count):
+    assert get_nb_notifs_non_lues(12) == 2
+    assert get_nb_notifs_non_lues(12) == 2
+    mock_count.assert_called_once_with(12)
+
+
+@patch("model.database.count_notifs_non_lues", side_effect=[None, 2])
+def test_base_indisponible_badge_a_zero_sans_mise_en_cache(mock_count):
+    assert get_nb_notifs_non_lues(12) == 0
+    assert get_nb_notifs_non_lues(12) == 2
+    assert mock_count.call_count == 2
+
+
+def test_comptage_renvoie_none_si_la_base_est_injoignable():
+    with patch("model.database.get_db_connection", return_value=None):
+        assert count_notifs_non_lues(12) is None
+
+
+@patch("model.database.count_notifs_non_lues", return_value=2)
+def test_marquer_lues_remet_le_compteur_a_zero(mock_count, connexion_factice):
+    get_nb_notifs_non_lues(12)
+
+    conn, _ = connexion_factice()
+    with patch("model.database.get_db_connection", return_value=conn):
+        marquer_notifs_lues(12)
+
+    assert get_nb_notifs_non_lues(12) == 0
+    mock_count.assert_called_once()
+
+
+@patch("model.database.count_notifs_non_lues", side_effect=[0, 1])
+def test_nouvelle_decision_recomptee(mock_count, connexion_factice):
+    assert get_nb_notifs_non_lues(12) == 0
+
+    proposition = {
+        "id_proposition": 4,
+        "nom_fr": "Véga",
+        "statut": "refuse",
+        "fk_id_utilisateur": 12,
+    }
+    conn, _ = connexion_factice(ligne=proposition)
+    with patch("model.database.get_db_connection", return_value=conn):
+        assert traiter_proposition(4, "refuse", "Déjà au catalogue") == "traitee"
+
+    assert get_nb_notifs_non_lues(12) == 1
+
+
+@patch("app.get_nb_notifs_non_lues", return_value=3)
+def test_badge_injecte_dans_la_navbar(mock_nb):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 12
+        session["user_pseudo"] = "vega"
+
+    html = client.get("/legal").get_data(as_text=True)
+
+    assert "3 proposition(s) traitée(s) depuis votre dernière visite" in html
+    mock_nb.assert_called_with(12)
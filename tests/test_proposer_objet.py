@@ -0,0 +1,114 @@
+# tests/test_proposer_objet.py
+import io
+import re
+from unittest.mock import patch
+
+import pytest
+
+from app import app
+
+FORMULAIRE = {
+    "nom_fr": "Nebuleuse d'orion",
+    "nom_scientifique": "M42",
+    "description": "Pouponnière d'étoiles.",
+    "category_id": "4",
+}
+
+
+@pytest.fixture
+def client_connecte():
+    with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = 12
+        yield client
+
+
+@patch("controller.user_bp.get_all_categories", return_value=[{"id_categorie": 4, "nom_categorie": "Nébuleuse"}])
+@patch("controller.user_bp.create_proposition")
+@patch("controller.user_bp.chercher_doublons")
+def test_doublon_probable_signale_avant_enregistrement(mock_doublons, mock_creer, mock_categories, client_connecte):
+    mock_doublons.return_value = [
+        {"id_objet": 3, "nom_fr": "Nébuleuse d'Orion", "nom_scientifique": "M42", "score": 0.82}
+    ]
+
+    response = client_connecte.post("/proposer-objet", data=FORMULAIRE)
+
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "ressemblance 82 %" in html
+    assert 'name="confirmer_doublon"' in html
+    assert "Pouponnière d&#39;étoiles." in html
+    mock_doublons.assert_called_once_with("Nebuleuse d'orion", "M42")
+    mock_creer.assert_not_called()
+
+
+@patch("controller.user_bp.get_all_categories", return_value=[])
+@patch("controller.user_bp.create_proposition", return_value=True)
+@patch("controller.user_bp.chercher_doublons")
+def test_doublon_confirme_par_l_utilisateur_est_enregistre(mock_doublons, mock_creer, mock_categories, client_connecte):
+    response = client_connecte.post("/proposer-objet", data={**FORMULAIRE, "confirmer_doublon": "1"})
+
+    assert response.status_code == 302
+    mock_doublons.assert_not_called()
+    mock_creer.assert_called_once()
+
+
+@pytest.fixture
+def dossiers_images(tmp_path, monkeypatch):
+    propositions = tmp_path / "propositions"
+    monkeypatch.setattr("controller.user_bp.UPLOAD_FOLDER_PROPOSITIONS", str(propositions))
+    monkeypatch.setattr("controller.user_bp.UPLOAD_FOLDER_PROPOSITIONS_ATTENTE", str(propositions / "attente"))
+    return propositions
+
+
+def _jeton(html):
+    return re.search(r'name="image_en_attente" value="([0-9a-f]+)"', html).group(1)
+
+
+@patch("controller.user_bp.get_all_categories", return_value=[])
+@patch("controller.user_bp.create_proposition", return_value=True)
+@patch("controller.user_bp.chercher_doublons")
+def test_image_conservee_pendant_la_confirmation_du_doublon(
+    mock_doublons, mock_creer, mock_categories, client_connecte, dossiers_images
+):
+    mock_doublons.return_value = [{"id_objet": 3, "nom_fr": "Orion", "nom_scientifique": None, "score": 0.9}]
+
+    response = client_connecte.post(
+        "/proposer-objet", data={**FORMULAIRE, "image": (io.BytesIO(b"png"), "orion.png")}
+    )
+    html = response.get_data(as_text=True)
+    jeton = _jeton(html)
+    assert f"uploads/propositions/attente/{jeton}_orion.png" in html
+    assert [f.name for f in (dossiers_images / "attente").iterdir()] == [f"{jeton}_orion.png"]
+    mock_creer.assert_not_called()
+
+    response = client_connecte.post(
+        "/proposer-objet", data={**FORMULAIRE, "confirmer_doublon": "1", "image_en_attente": jeton}
+    )
+
+    assert response.status_code == 302
+    assert mock_creer.call_args[0][3] == "uploads/propositions/prop_12_orion.png"
+    assert (dossiers_images / "prop_12_orion.png").read_bytes() == b"png"
+    assert not any((dossiers_images / "attente").iterdir())
+
+
+@patch("controller.user_bp.get_all_categories", return_value=[])
+@patch("controller.user_bp.create_proposition", return_value=True)
+@patch("controller.user_bp.chercher_doublons")
+def test_image_en_attente_reservee_a_la_session_qui_l_a_envoyee(
+    mock_doublons, mock_creer, mock_categories, client_connecte, dossiers_images
+):
+    mock_doublons.return_value = [{"id_objet": 3, "nom_fr": "Orion", "nom_scientifique": None, "score": 0.9}]
+    response = client_connecte.post(
+        "/proposer-objet", data={**FORMULAIRE, "image": (io.BytesIO(b"png"), "orion.png")}
+    )
+    jeton = _jeton(response.get_data(as_text=True))
+
+    autre = app.test_client()
+    with autre.session_transaction() as session:
+        session["user_id"] = 13
+    autre.post("/proposer-objet", data={**FORMULAIRE, "confirmer_doublon": "1", "image_en_attente": jeton})
+
+    assert mock_creer.call_args[0][3] is None
+    assert (dossiers_images / "attente" / f"{jeton}_orion.png").exists()
@@ -0,0 +1,402 @@
+# tests/test_sql_postgres.py
+"""Requêtes de modération et de tableau de bord exécutées sur un vrai
+PostgreSQL (conteneur de service postgres:16 de la CI).
+
+Sans base joignable, ces tests sont ignorés en local ; dans la CI (variable
+CI posée par GitHub Actions) ils échouent. Chaque test crée ses propres
+comptes et propositions, suffixés pour ne rien heurter, et les supprime
+ensuite.
+"""
+import os
+import threading
+import uuid
+from datetime import datetime
+
+import pytest
+from psycopg2.extras import RealDictCursor
+
+from model.database import (
+    archiver_propositions,
+    get_db_connection,
+    get_resume_admin,
+    get_tableau_de_bord_utilisateur,
+    hash_password,
+    initialize_database,
+    liberer_propositions,
+    reserver_propositions,
+    traiter_proposition,
+    traiter_propositions_lot,
+)
+from model.pagination import couper_page, decoder_curseur
+
+
+def requete(sql, params=()):
+    """Exécute `sql` sur sa propre connexion (validée) ; renvoie les lignes éventuelles."""
+    conn = get_db_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, params)
+            lignes = cur.fetchall() if cur.description else []
+        conn.commit()
+        return lignes
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def base():
+    conn = get_db_connection()
+    if conn is None:
+        if os.environ.get("CI"):
+            pytest.fail("PostgreSQL injoignable dans la CI.")
+        pytest.skip("PostgreSQL injoignable (tests d'intégration SQL ignorés).")
+    conn.close()
+    initialize_database()
+
+
+class JeuDEssai:
+    """Un compte, un admin et des propositions propres à un test."""
+
+    def __init__(self):
+        self.suffixe = uuid.uuid4().hex[:8]
+        self.id_categorie = requete(
+            "SELECT id_categorie FROM CATEGORIE ORDER BY id_categorie LIMIT 1"
+        )[0]["id_categorie"]
+        self.user_id = self.utilisateur("auteur")
+        self.admin_id = requete(
+            """INSERT INTO ADMINISTRATEUR (pseudo, mot_de_passe_hash)
+               VALUES (%s, %s) RETURNING id_admin""",
+            (f"admin_{self.suffixe}", hash_password("secret")),
+        )[0]["id_admin"]
+        self.utilisateurs = [self.user_id]
+        self.noms = set()
+
+    def utilisateur(self, pseudo, est_actif=True):
+        pseudo = f"{pseudo}_{self.suffixe}"
+        return requete(
+            """INSERT INTO UTILISATEUR (pseudo, nom, prenom, email, mot_de_passe_hash, est_actif)
+               VALUES (%s, 'Test', 'Test', %s, 'x', %s) RETURNING id_utilisateur""",
+            (pseudo, f"{pseudo}@test.invalid", est_actif),
+        )[0]["id_utilisateur"]
+
+    def nom(self, nom_fr):
+        nom_fr = f"{nom_fr} {self.suffixe}"
+        self.noms.add(nom_fr)
+        return nom_fr
+
+    def proposition(self, nom_fr, statut="en_attente", **colonnes):
+        """Insère une proposition (colonnes de PROPOSITION en plus au besoin), renvoie son id."""
+        colonnes = {
+            "nom_fr": self.nom(nom_fr),
+            "description": "Proposition de test",
+            "fk_id_categorie": self.id_categorie,
+            "fk_id_utilisateur": self.user_id,
+            "statut": statut,
+            **colonnes,
+        }
+        return requete(
+            f"""INSERT INTO PROPOSITION ({", ".join(colonnes)})
+                VALUES ({", ".join(["%s"] * len(colonnes))}) RETURNING id_proposition""",
+            tuple(colonnes.values()),
+        )[0]["id_proposition"]
+
+    def objet(self, nom_fr):
+        return requete(
+            """INSERT INTO OBJET_CELESTE (nom_fr, description, date_publication, fk_id_categorie)
+               VALUES (%s, 'Objet de test', CURRENT_DATE, %s) RETURNING id_objet""",
+            (self.nom(nom_fr), self.id_categorie),
+        )[0]["id_objet"]
+
+    def statut(self, id_proposition):
+        lignes = requete(
+            "SELECT statut, reserve_par FROM PROPOSITION WHERE id_proposition = %s",
+            (id_proposition,),
+        )
+        return lignes[0] if lignes else None
+
+    def nettoyer(self):
+        requete("DELETE FROM SAISIR WHERE fk_id_admin = %s", (self.admin_id,))
+        requete("DELETE FROM OBJET_CELESTE WHERE nom_fr = ANY(%s)", (list(self.noms),))
+        # Propositions, archive et favoris suivent (ON DELETE CASCADE)
+        requete("DELETE FROM UTILISATEUR WHERE id_utilisateur = ANY(%s)", (self.utilisateurs,))
+        requete("DELETE FROM ADMINISTRATEUR WHERE id_admin = %s", (self.admin_id,))
+
+
+@pytest.fixture
+def jeu(base):
+    jeu = JeuDEssai()
+    yield jeu
+    jeu.nettoyer()
+
+
+# ----------------------------------------------------
+# Décisions par lot (CTE unnest ... WITH ORDINALITY, DISTINCT ON)
+# ----------------------------------------------------
+
+
+def test_lot_un_resultat_par_proposition_dans_l_ordre_recu(jeu):
+    publiee = jeu.proposition("Comète")
+    meme_nom = jeu.proposition("Comète")
+    refusee = jeu.proposition("Nébuleuse")
+    deja_traitee = jeu.proposition("Quasar", statut="refuse")
+    jeu.objet("Pulsar")
+    au_catalogue = jeu.proposition("Pulsar")
+    reservee = jeu.proposition(
+        "Étoile", reserve_par=jeu.admin_id + 1, reserve_jusqu_a="2999-01-01"
+    )
+
+    resultats = traiter_propositions_lot(
+        [
+            (refusee, "refuse", "Hors sujet"),
+            (meme_nom, "accepte", ""),
+            (publiee, "accepte", ""),
+            (deja_traitee, "accepte", ""),
+            (au_catalogue, "accepte", ""),
+            (reservee, "refuse", ""),
+            (-1, "accepte", ""),
+            (refusee, "accepte", "ignorée : seule la première décision compte"),
+        ],
+        admin_id=jeu.admin_id,
+    )
+
+    assert [(r["id_proposition"], r["resultat"]) for r in resultats] == [
+        (refusee, "refusee"),
+        (meme_nom, "doublon"),
+        (publiee, "publiee"),
+        (deja_traitee, "deja_traitee"),
+        (au_catalogue, "doublon"),
+        (reservee, "reservee"),
+        (-1, "introuvable"),
+    ]
+    id_objet = resultats[2]["id_objet"]
+    objet = requete(
+        "SELECT nom_fr, fk_id_utilisateur FROM OBJET_CELESTE WHERE id_objet = %s",
+        (id_objet,),
+    )
+    assert objet == [{"nom_fr": f"Comète {jeu.suffixe}", "fk_id_utilisateur": jeu.user_id}]
+    assert requete(
+        "SELECT fk_id_objet FROM SAISIR WHERE fk_id_admin = %s", (jeu.admin_id,)
+    ) == [{"fk_id_objet": id_objet}]
+    assert jeu.statut(refusee)["statut"] == "refuse"
+    assert jeu.statut(meme_nom)["statut"] == "accepte"
+    assert jeu.statut(reservee)["statut"] == "en_attente"
+
+
+def test_lot_sur_une_reservation_tenue_par_le_meme_admin(jeu):
+    id_proposition = jeu.proposition(
+        "Galaxie", reserve_par=jeu.admin_id, reserve_jusqu_a="2999-01-01"
+    )
+
+    resultats = traiter_propositions_lot(
+        [(id_proposition, "accepte", "")], admin_id=jeu.admin_id
+    )
+
+    assert resultats[0]["resultat"] == "publiee"
+    assert jeu.statut(id_proposition) == {"statut": "accepte", "reserve_par": None}
+
+
+# ----------------------------------------------------
+# File de modération (FOR UPDATE SKIP LOCKED, baux)
+# ----------------------------------------------------
+
+
+@pytest.fixture
+def file_attente(jeu):
+    """Quatre propositions en attente, plus anciennes que toute autre : en tête de file."""
+    return [
+        jeu.proposition(f"File {rang}", date_proposition=f"1990-01-0{rang}")
+        for rang in range(1, 5)
+    ]
+
+
+def reserver_en_parallele(*admins, limite=2):
+    """Lance une réservation par admin dans son propre thread, au même instant."""
+    depart = threading.Barrier(len(admins))
+    resultats = {}
+
+    def reserver(admin_id):
+        depart.wait()
+        resultats[admin_id] = reserver_propositions(admin_id, limite, 60)
+
+    threads = [threading.Thread(target=reserver, args=(a,)) for a in admins]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads), "Réservation bloquée"
+    return [
+        [p["id_proposition"] for p in resultats[admin_id]] for admin_id in admins
+    ]
+
+
+def test_deux_admins_reservent_en_meme_temps_sans_partager_de_ligne(jeu, file_attente):
+    premier, second = reserver_en_parallele(jeu.admin_id, jeu.admin_id + 1)
+
+    assert len(premier) == len(second) == 2
+    assert sorted(premier + second) == file_attente
+
+
+def test_reservation_saute_les_lignes_verrouillees_sans_attendre(jeu, file_attente):
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            # Réservation de l'autre admin en cours : lignes verrouillées, pas encore validées
+            cur.execute(
+                "SELECT id_proposition FROM PROPOSITION WHERE id_proposition = ANY(%s) FOR UPDATE",
+                (file_attente[:2],),
+            )
+            (ids,) = reserver_en_parallele(jeu.admin_id)
+    finally:
+        conn.rollback()
+        conn.close()
+
+    assert ids == file_attente[2:]
+
+
+def test_reservation_prolongee_puis_liberee(jeu, file_attente):
+    premiere = reserver_propositions(jeu.admin_id, 2, 60)
+    assert [p["id_proposition"] for p in premiere] == file_attente[:2]
+    assert premiere[0]["pseudo"] == f"auteur_{jeu.suffixe}"
+
+    # L'admin retrouve sa réservation ; un autre prend la suite de la file
+    assert [p["id_proposition"] for p in reserver_propositions(jeu.admin_id, 2, 60)] == file_attente[:2]
+    assert [p["id_proposition"] for p in reserver_propositions(jeu.admin_id + 1, 2, 60)] == file_attente[2:]
+
+    assert liberer_propositions(jeu.admin_id, [file_attente[0]]) == 1
+    assert liberer_propositions(jeu.admin_id) == 1
+    assert jeu.statut(file_attente[1]) == {"statut": "en_attente", "reserve_par": None}
+
+
+def test_decision_unitaire_respecte_un_bail_en_cours(jeu):
+    tenue = jeu.proposition("Tenue", reserve_par=jeu.admin_id + 1, reserve_jusqu_a="2999-01-01")
+    echue = jeu.proposition("Échue", reserve_par=jeu.admin_id + 1, reserve_jusqu_a="2000-01-01")
+
+    assert traiter_proposition(tenue, "refuse", "", admin_id=jeu.admin_id) == "reservee"
+    assert traiter_proposition(echue, "refuse", "", admin_id=jeu.admin_id) == "traitee"
+    assert traiter_proposition(echue, "refuse", "", admin_id=jeu.admin_id) == "deja_traitee"
+    assert jeu.statut(tenue)["statut"] == "en_attente"
+
+
+# ----------------------------------------------------
+# Archivage (partitions annuelles créées à la demande)
+# ----------------------------------------------------
+
+
+def emplacement(id_proposition):
+    """Table où se trouve la proposition : PROPOSITION ou la partition d'archive."""
+    lignes = requete(
+        """SELECT 'proposition' AS table_ FROM PROPOSITION WHERE id_proposition = %(id)s
+           UNION ALL
+           SELECT tableoid::regclass::text FROM PROPOSITION_ARCHIVE WHERE id_proposition = %(id)s""",
+        {"id": id_proposition},
+    )
+    return [ligne["table_"] for ligne in lignes]
+
+
+def test_archivage_cree_les_partitions_et_deplace_les_plus_anciennes_d_abord(jeu):
+    en_2001 = jeu.proposition("Archive 2001", statut="refuse", date_traitement="2001-03-01")
+    en_2002 = jeu.proposition("Archive 2002", statut="accepte", date_traitement="2002-11-30")
+    recente = jeu.proposition("Récente", statut="refuse", date_traitement="now")
+    en_attente = jeu.proposition("En attente", date_proposition="2001-01-01")
+
+    assert archiver_propositions(30, 1) == 1
+    assert emplacement(en_2001) == ["proposition_archive_2001"]
+    assert emplacement(en_2002) == ["proposition"]
+
+    assert archiver_propositions(30, 1000) >= 1
+    assert emplacement(en_2002) == ["proposition_archive_2002"]
+    assert emplacement(recente) == ["proposition"]
+    assert emplacement(en_attente) == ["proposition"]
+
+    archivee = requete(
+        "SELECT statut, date_traitement FROM PROPOSITION_ARCHIVE WHERE id_proposition = %s",
+        (en_2001,),
+    )[0]
+    assert archivee["statut"] == "refuse" and archivee["date_traitement"].year == 2001
+
+
+# ----------------------------------------------------
+# Tableaux de bord (json_agg, agrégats FILTER)
+# ----------------------------------------------------
+
+
+def page_suivante(donnees, limite):
+    """Clé de la page suivante, comme la calcule « Mon espace »."""
+    _, curseur = couper_page(
+        donnees["propositions"], limite, lambda p: (p["date_proposition"], p["id_proposition"])
+    )
+    return decoder_curseur(curseur, 2)
+
+
+def test_tableau_de_bord_utilisateur_compte_pagine_et_relit_les_dates(jeu):
+    archivee = jeu.proposition(
+        "Ancienne", statut="refuse", date_proposition="2001-01-01", date_traitement="2001-01-02"
+    )
+    archiver_propositions(30, 1000)
+    refusee = jeu.proposition(
+        "Refusée", statut="refuse", date_proposition="2020-01-01", date_traitement="now", notif_lue=True
+    )
+    acceptee = jeu.proposition(
+        "Acceptée", statut="accepte", date_proposition="2020-01-02", date_traitement="now"
+    )
+    en_attente = jeu.proposition("En attente", date_proposition="2020-01-03")
+    id_objet = jeu.objet("Favori")
+    requete(
+        "INSERT INTO FAVORI (fk_id_utilisateur, fk_id_objet) VALUES (%s, %s)",
+        (jeu.user_id, id_objet),
+    )
+
+    donnees = get_tableau_de_bord_utilisateur(jeu.user_id, 2)
+
+    assert donnees["user"]["pseudo"] == f"auteur_{jeu.suffixe}"
+    assert donnees["stats"] == {
+        "total": 4,
+        "en_attente": 1,
+        "acceptes": 1,
+        "refuses": 2,
+        "nb_notifs_non_lues": 1,
+        "nb_archivees": 1,
+    }
+    assert [p["id_proposition"] for p in donnees["propositions"]] == [en_attente, acceptee, refusee]
+    assert isinstance(donnees["propositions"][1]["date_traitement"], datetime)
+    assert donnees["propositions"][0]["date_traitement"] is None
+    assert [(f["id_objet"], type(f["date_ajout"])) for f in donnees["favoris"]] == [
+        (id_objet, datetime)
+    ]
+
+    apres = page_suivante(donnees, 2)
+    suite = get_tableau_de_bord_utilisateur(jeu.user_id, 2, apres)
+    assert [p["id_proposition"] for p in suite["propositions"]] == [refusee]
+
+    historique = get_tableau_de_bord_utilisateur(jeu.user_id, 2, apres, historique=True)
+    assert [(p["id_proposition"], p["archivee"]) for p in historique["propositions"]] == [
+        (refusee, False),
+        (archivee, True),
+    ]
+
+
+def test_tableau_de_bord_d_un_compte_absent(base):
+    assert get_tableau_de_bord_utilisateur(-1, 10) is None
+
+
+def test_resume_admin_en_une_requete(jeu):
+    avant = get_resume_admin()
+
+    jeu.utilisateurs.append(jeu.utilisateur("inactif", est_actif=False))
+    jeu.proposition("En attente")
+    jeu.proposition("Décidée", statut="accepte", date_traitement="now")
+    jeu.objet("Catalogue")
+
+    apres = get_resume_admin()
+    ecarts = {champ: apres[champ] - avant[champ] for champ in avant if champ != "categories"}
+    assert ecarts == {
+        "nb_en_attente": 1,
+        "nb_notifs_non_lues": 1,
+        "nb_utilisateurs": 1,
+        "nb_utilisateurs_actifs": 0,
+        "nb_objets": 1,
+        "nb_admins": 0,
+    }
+    noms = [c["nom_categorie"] for c in apres["categories"]]
+    assert {"Galaxie", "Nébuleuse", "Planète"} <= set(noms)
+    assert all(set(c) == {"id_categorie", "nom_categorie"} for c in apres["categories"])
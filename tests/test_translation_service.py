@@ -0,0 +1,151 @@
+# tests/test_translation_service.py
+from unittest.mock import patch
+
+import pytest
+
+from app import app
+from config import TRADUCTION_MAX_CARACTERES
+from controller.admin_routes import get_textes_catalogue
+from model.translation_service import (
+    TranslationMemory,
+    hash_texte,
+    pretraduire_en_arriere_plan,
+    valider_demande,
+)
+from model.upstream_pool import PoolSaturatedError
+
+
+class _FauxTraducteur:
+    """Traducteur externe factice : préfixe la langue et compte les textes reçus."""
+
+    def __init__(self):
+        self.appels = []
+
+    def __call__(self, textes, langue):
+        self.appels.append(list(textes))
+        return [f"[{langue}] {t}" for t in textes]
+
+
+@patch("model.translation_service.save_traductions")
+@patch("model.translation_service.get_traductions", return_value={})
+def test_traduire_lot_deduplique_et_conserve_l_ordre(mock_get, mock_save):
+    traducteur = _FauxTraducteur()
+    memoire = TranslationMemory(10, traducteur)
+
+    resultat = memoire.traduire_lot(["Mars", "Io", "Mars", ""], "fr")
+
+    assert resultat == ["[fr] Mars", "Io", "[fr] Mars", ""]
+    assert traducteur.appels == [["Mars"]]
+    mock_save.assert_called_once_with([(hash_texte("Mars"), "fr", "Mars", "[fr] Mars")])
+
+
+@patch("model.translation_service.save_traductions")
+@patch("model.translation_service.get_traductions", return_value={})
+def test_le_lru_evite_un_second_appel(mock_get, mock_save):
+    traducteur = _FauxTraducteur()
+    memoire = TranslationMemory(10, traducteur)
+
+    memoire.traduire("Jupiter", "fr")
+    assert memoire.traduire("Jupiter", "fr") == "[fr] Jupiter"
+
+    assert len(traducteur.appels) == 1
+    assert mock_get.call_count == 1
+
+
+@patch("model.translation_service.save_traductions")
+@patch("model.translation_service.get_traductions")
+def test_la_base_evite_l_appel_externe(mock_get, mock_save):
+    mock_get.return_value = {hash_texte("Saturn"): "Saturne"}
+    traducteur = _FauxTraducteur()
+    memoire = TranslationMemory(10, traducteur)
+
+    assert memoire.traduire_lot(["Saturn", "Venus"], "fr") == [
+        "Saturne",
+        "[fr] Venus",
+    ]
+    assert traducteur.appels == [["Venus"]]
+
+
+@patch("model.translation_service.save_traductions")
+@patch("model.translation_service.get_traductions", return_value={})
+def test_seuls_les_textes_conservables_sont_memorises(mock_get, mock_save):
+    traducteur = _FauxTraducteur()
+    memoire = TranslationMemory(10, traducteur)
+
+    resultat = memoire.traduire_lot(["Mars", "Bonjour"], "en", lambda textes: {"Mars"})
+
+    assert resultat == ["[en] Mars", "[en] Bonjour"]
+    mock_save.assert_called_once_with([(hash_texte("Mars"), "en", "Mars", "[en] Mars")])
+    memoire.traduire("Bonjour", "en")
+    assert traducteur.appels[-1] == ["Bonjour"]
+
+
+def test_valider_demande():
+    valider_demande(["Mars"], "en")
+    with pytest.raises(ValueError):
+        valider_demande(["Mars"], "xx")
+    with pytest.raises(ValueError):
+        valider_demande(["a" * (TRADUCTION_MAX_CARACTERES + 1)], "fr")
+
+
+@patch.dict(app.config, {"WTF_CSRF_ENABLED": False})
+@patch("controller.admin_routes.translation_memory")
+def test_api_translate_refuse_langue_inconnue_et_texte_trop_long(mock_memoire):
+    client = app.test_client()
+
+    inconnue = client.post("/api/translate/batch", json={"texts": ["Mars"], "lang": "xx"})
+    trop_long = client.post(
+        "/api/translate", json={"text": "a" * (TRADUCTION_MAX_CARACTERES + 1), "lang": "fr"}
+    )
+
+    assert inconnue.status_code == 400
+    assert trop_long.status_code == 400
+    mock_memoire.traduire_lot.assert_not_called()
+    mock_memoire.traduire.assert_not_called()
+
+
+@patch.dict(app.config, {"WTF_CSRF_ENABLED": False})
+@patch("controller.admin_routes.translation_memory")
+def test_api_translate_anonyme_ne_memorise_que_le_catalogue(mock_memoire):
+    mock_memoire.traduire_lot.return_value = ["Mars"]
+    client = app.test_client()
+
+    client.post("/api/translate/batch", json={"texts": ["Mars"], "lang": "fr"})
+    with client.session_transaction() as session:
+        session["user_id"] = 12
+    client.post("/api/translate/batch", json={"texts": ["Mars"], "lang": "fr"})
+
+    anonyme, connecte = mock_memoire.traduire_lot.call_args_list
+    assert anonyme[0] == (["Mars"], "fr", get_textes_catalogue)
+    assert connecte[0] == (["Mars"], "fr", None)
+
+
+@patch("model.translation_service.save_traductions")
+@patch("model.translation_service.get_traductions")
+@patch("model.translation_service.translate_pool")
+def test_seul_l_appel_externe_passe_par_le_pool(mock_pool, mock_get, mock_save):
+    mock_pool.run.side_effect = PoolSaturatedError("saturé")
+    mock_get.return_value = {hash_texte("Saturn"): "Saturne"}
+    memoire = TranslationMemory(10)
+
+    # Traduction connue : servie même quand le pool est saturé
+    assert memoire.traduire("Saturn", "fr") == "Saturne"
+    mock_pool.run.assert_not_called()
+
+    with pytest.raises(PoolSaturatedError):
+        memoire.traduire("Venus", "fr")
+    assert mock_pool.run.call_args[0][1:] == (["Venus"], "fr")
+
+
+@patch("model.translation_service.PRETRADUCTION_LOT", 2)
+@patch("model.translation_service.translation_memory")
+def test_pretraduction_ecarte_les_textes_trop_longs_et_saute_les_lots_en_echec(mock_memoire, capsys):
+    trop_long = "a" * (TRADUCTION_MAX_CARACTERES + 1)
+    mock_memoire.traduire_lot.side_effect = [RuntimeError("Google"), ["x"]]
+
+    pretraduire_en_arriere_plan(["Mars", trop_long, "Io", "Vega"], ["fr"]).join()
+
+    lots = [appel[0][0] for appel in mock_memoire.traduire_lot.call_args_list]
+    assert lots == [["Mars", "Io"], ["Vega"]]
+    sortie = capsys.readouterr().out
+    assert "1/4 traductions" in sortie and "1 textes trop longs" in sortie
@@ -0,0 +1,69 @@
+# tests/test_upstream_pool.py
+import threading
+
+import pytest
+
+from model.upstream_pool import UpstreamPool, PoolSaturatedError
+
+
+def _pool(max_workers=1, max_queue=0, queue_timeout=5, call_timeout=5):
+    return UpstreamPool("test", max_workers, max_queue, queue_timeout, call_timeout)
+
+
+def _occuper(pool):
+    """Lance un appel bloquant dans le pool ; renvoie l'événement qui le libère."""
+    demarre, liberer = threading.Event(), threading.Event()
+
+    def bloquer():
+        demarre.set()
+        liberer.wait(5)
+
+    thread = threading.Thread(target=pool.run, args=(bloquer,), daemon=True)
+    thread.start()
+    assert demarre.wait(5)
+    return liberer, thread
+
+
+def test_run_renvoie_le_resultat_et_compte_les_appels():
+    pool = _pool()
+
+    assert pool.run(lambda a, b=0: a + b, 2, b=3) == 5
+    assert pool.stats()["termines"] == 1
+
+
+def test_run_propage_les_exceptions_de_l_appel():
+    pool = _pool()
+
+    def echouer():
+        raise ValueError("Message vide")
+
+    with pytest.raises(ValueError):
+        pool.run(echouer)
+    assert pool.stats()["echecs"] == 1
+
+
+def test_run_refuse_immediatement_quand_la_file_est_pleine():
+    pool = _pool(max_workers=1, max_queue=0)
+    liberer, thread = _occuper(pool)
+
+    with pytest.raises(PoolSaturatedError):
+        pool.run(lambda: "jamais exécuté")
+
+    stats = pool.stats()
+    assert stats["rejetes"] == 1
+    assert stats["en_cours"] == 1
+    assert stats["saturation"] == 1.0
+    liberer.set()
+    thread.join(5)
+
+
+def test_run_abandonne_un_appel_reste_trop_longtemps_en_file():
+    pool = _pool(max_workers=1, max_queue=1, queue_timeout=0.05, call_timeout=5)
+    liberer, thread = _occuper(pool)
+    threading.Timer(0.2, liberer.set).start()
+
+    with pytest.raises(PoolSaturatedError):
+        pool.run(lambda: "trop tard")
+
+    assert pool.stats()["expires"] == 1
+    thread.join(5)
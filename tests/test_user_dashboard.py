@@ -0,0 +1,98 @@
+# tests/test_user_dashboard.py
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app import app
+from model.pagination import decoder_curseur, encoder_curseur
+
+UTILISATEUR = {
+    "id_utilisateur": 12,
+    "pseudo": "vega",
+    "prenom": "Léa",
+    "nom": "Martin",
+    "email": "lea@example.org",
+    "photo_profil": "uploads/profils/default_avatar.png",
+    "date_inscription": datetime(2025, 9, 1),
+}
+
+
+def _proposition(id_proposition, jour):
+    return {
+        "id_proposition": id_proposition,
+        "nom_fr": f"Objet {id_proposition}",
+        "statut": "accepte",
+        "nom_categorie": "Comète",
+        "date_proposition": datetime(2026, 3, jour),
+        "date_traitement": datetime(2026, 3, jour + 1),
+        "url_image": None,
+        "commentaire_admin": None,
+    }
+
+
+def _donnees(propositions, nb_notifs_non_lues=0, nb_archivees=0):
+    return {
+        "user": dict(UTILISATEUR),
+        "stats": {
+            "total": 9,
+            "en_attente": 1,
+            "acceptes": 6,
+            "refuses": 2,
+            "nb_notifs_non_lues": nb_notifs_non_lues,
+            "nb_archivees": nb_archivees,
+        },
+        "propositions": propositions,
+        "favoris": [],
+    }
+
+
+@pytest.fixture
+def espace():
+    """Mon espace d'un utilisateur connecté, base remplacée par des mocks."""
+    with patch("controller.user_bp.get_tableau_de_bord_utilisateur") as donnees, patch(
+        "controller.user_bp.marquer_notifs_lues"
+    ) as marquer, patch("controller.user_bp.commentaire_service"):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = 12
+        yield client, donnees, marquer
+
+
+def test_une_requete_et_pas_d_ecriture_sans_notification(espace):
+    client, donnees, marquer = espace
+    donnees.return_value = _donnees([_proposition(4, 1)])
+
+    response = client.get("/mon-espace")
+
+    assert response.status_code == 200
+    donnees.assert_called_once_with(12, 20, None, False)
+    marquer.assert_not_called()
+
+
+def test_notifications_marquees_lues_s_il_y_en_a(espace):
+    client, donnees, marquer = espace
+    donnees.return_value = _donnees([_proposition(4, 1)], nb_notifs_non_lues=2)
+
+    client.get("/mon-espace")
+
+    marquer.assert_called_once_with(12)
+
+
+def test_page_suivante_et_historique(espace):
+    client, donnees, marquer = espace
+    donnees.return_value = _donnees([_proposition(i, 25 - i) for i in range(21)], nb_archivees=8)
+
+    html = client.get("/mon-espace").get_data(as_text=True)
+
+    assert "Tout l'historique (8 propositions archivées)" in html
+    assert html.count("Objet ") == 20
+    curseur = html.split("curseur=")[1].split("#")[0].split("&")[0]
+    assert decoder_curseur(curseur, 2) == ["2026-03-06T00:00:00", 19]
+
+    curseur = encoder_curseur(datetime(2026, 3, 6), 19)
+    html = client.get(f"/mon-espace?historique=1&curseur={curseur}").get_data(as_text=True)
+
+    assert donnees.call_args[0] == (12, 20, ["2026-03-06T00:00:00", 19], True)
+    assert "Les plus récentes" in html
+    assert "Masquer les propositions archivées" in html